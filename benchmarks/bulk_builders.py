@@ -0,0 +1,41 @@
+"""Compare `table()[...]` against the bulk builders on a numeric table.
+
+Run with `python benchmarks/bulk_builders.py [rows]`.
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import xpyxl as x
+
+COLUMNS = 10
+
+
+def _timed(label: str, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"{label:<28}{time.perf_counter() - start:>8.3f}s")
+    return result
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    data = [[r * COLUMNS + c for c in range(COLUMNS)] for r in range(rows)]
+    dicts = [{f"c{c}": value for c, value in enumerate(row)} for row in data]
+    header = [f"c{c}" for c in range(COLUMNS)]
+    print(f"{rows:,} rows x {COLUMNS} columns")
+
+    indexed = _timed("table()[...]", lambda: x.table(header=header)[data])
+    bulk = _timed("table().from_rows", lambda: x.table(header=header).from_rows(data))
+    _timed("table().from_dicts", lambda: x.table().from_dicts(dicts))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, node in (("save table()[...]", indexed), ("save from_rows", bulk)):
+            book = x.workbook()[x.sheet("Data")[node]]
+            _timed(label, lambda: book.save(Path(tmp) / "bench.xlsx"))
+
+
+if __name__ == "__main__":
+    main()
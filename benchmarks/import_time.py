@@ -0,0 +1,50 @@
+"""Check that `import xpyxl` stays within its startup budget.
+
+Runs `python -X importtime -c "import xpyxl"` several times in fresh
+interpreters, reports the best cumulative time, and exits non-zero when it is
+over budget or when openpyxl was imported.
+
+Run with `python benchmarks/import_time.py [budget_ms]`.
+"""
+
+import subprocess
+import sys
+
+DEFAULT_BUDGET_MS = 150.0
+RUNS = 5
+
+_PROBE = "import sys, xpyxl; print('openpyxl' in sys.modules)"
+
+
+def _measure() -> tuple[float, bool]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative_us = 0
+    for line in result.stderr.splitlines():
+        fields = line.split("|")
+        if len(fields) == 3 and fields[2].strip() == "xpyxl":
+            cumulative_us = int(fields[1])
+    return cumulative_us / 1000, result.stdout.strip() == "True"
+
+
+def main() -> int:
+    budget_ms = float(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_BUDGET_MS
+    samples = [_measure() for _ in range(RUNS)]
+    best_ms = min(elapsed for elapsed, _ in samples)
+    loaded_openpyxl = any(loaded for _, loaded in samples)
+    print(f"import xpyxl: {best_ms:.1f}ms (budget {budget_ms:.0f}ms)")
+    if loaded_openpyxl:
+        print("FAIL: openpyxl was imported eagerly")
+        return 1
+    if best_ms > budget_ms:
+        print("FAIL: over budget")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+"""Time workbook assembly as the sheet count grows.
+
+Run with `python benchmarks/many_sheets.py [sheets]`. Each sheet is a small
+entity report; the per-sheet cost should stay flat from 500 sheets up to
+the full count for both `save` and `to_openpyxl`.
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import xpyxl as x
+
+
+def _entity_sheet(index: int) -> x.SheetNode:
+    return x.sheet(f"Entity {index % 100}")[
+        x.row(style=[x.text_xl, x.bold])[f"Entity {index}"],
+        x.space(),
+        x.table(header=["Metric", "Value"], style=[x.table_compact])[
+            ["Assets", index * 10.5],
+            ["Liabilities", index * 4.25],
+            ["Ratio", 0.42],
+        ],
+    ]
+
+
+def _timed(label: str, sheets: int, func) -> float:
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    per_sheet = elapsed / sheets * 1e6
+    print(f"{label:<28}{elapsed:>8.3f}s {per_sheet:>8.0f}us/sheet")
+    return per_sheet
+
+
+def main() -> None:
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    # Titles repeat every 100 sheets, so unique-title suffixes are exercised.
+    with tempfile.TemporaryDirectory() as tmp:
+        for sheets in (total // 10, total):
+            book = x.workbook()[[_entity_sheet(i) for i in range(sheets)]]
+            print(f"{sheets:,} sheets")
+            _timed("save", sheets, lambda: book.save(Path(tmp) / "many.xlsx"))
+            _timed("to_openpyxl", sheets, book.to_openpyxl)
+
+
+if __name__ == "__main__":
+    main()
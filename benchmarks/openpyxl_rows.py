@@ -0,0 +1,67 @@
+"""Time `to_openpyxl` on a wide table against a per-cell `ws.cell()` loop.
+
+Run with `python benchmarks/openpyxl_rows.py [rows] [columns]`. The reference
+loop writes the same values and copies one prebuilt style per cell through
+`ws.cell(row=..., column=..., value=...)`, as the openpyxl backend did before
+rows were inserted in batches; it skips layout and sizing, so it is a floor
+for that approach.
+"""
+
+import sys
+import time
+from copy import copy
+from datetime import date, timedelta
+
+from openpyxl import Workbook
+from openpyxl.styles import Font
+
+import xpyxl as x
+
+
+def _timed(label: str, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"{label:<28}{time.perf_counter() - start:>8.3f}s")
+    return result
+
+
+def _per_cell(data: list[tuple]) -> Workbook:
+    workbook = Workbook()
+    ws = workbook.active
+    ws.cell(row=1, column=1).font = Font(bold=True)
+    style = copy(ws.cell(row=1, column=1)._style)
+    for row_index, record in enumerate(data, start=1):
+        for column_index, value in enumerate(record, start=1):
+            ws.cell(row=row_index, column=column_index, value=value)._style = copy(
+                style
+            )
+    return workbook
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    columns = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    start = date(2024, 1, 1)
+    kinds = (
+        lambda i: i,
+        lambda i: i * 1.25,
+        lambda i: f"item {i % 500}",
+        lambda i: start + timedelta(days=i % 365),
+    )
+    data = [
+        tuple(kinds[column % 4](i) for column in range(columns)) for i in range(rows)
+    ]
+    header = [f"c{column}" for column in range(columns)]
+    book = x.workbook()[
+        x.sheet("Data")[
+            x.table(header=header, style=[x.table_banded]).from_records(data)
+        ]
+    ]
+    print(f"{rows:,} rows x {columns} columns")
+
+    _timed("ws.cell() per cell", lambda: _per_cell(data))
+    _timed("to_openpyxl", book.to_openpyxl)
+
+
+if __name__ == "__main__":
+    main()
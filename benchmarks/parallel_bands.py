@@ -0,0 +1,78 @@
+"""Compare serial and banded parallel saves of one large sheet.
+
+Run with `python benchmarks/parallel_bands.py [rows] [workers]`. Also reports
+peak RSS of this process and of the worker processes, and fails if a
+shared-memory segment outlives the save. tests/test_bands.py checks the same
+leak and RSS bounds on smaller sheets.
+"""
+
+import os
+import resource
+import sys
+import tempfile
+import time
+import zipfile
+from datetime import date, timedelta
+from pathlib import Path
+
+import xpyxl as x
+
+
+def _timed(label: str, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"{label:<28}{time.perf_counter() - start:>8.3f}s")
+    return result
+
+
+def _peak_rss_mb(who: int) -> float:
+    # ru_maxrss is in KiB on Linux.
+    return resource.getrusage(who).ru_maxrss / 1024
+
+
+def _segments() -> set[str]:
+    try:
+        return set(os.listdir("/dev/shm"))
+    except FileNotFoundError:
+        return set()
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    start = date(2024, 1, 1)
+    data = [
+        (i, f"region {i % 12}", i * 1.25, start + timedelta(days=i % 365), f"id-{i}")
+        for i in range(rows)
+    ]
+    table = x.table(
+        header=["id", "region", "amount", "day", "key"], style=[x.table_banded]
+    ).from_records(data)
+    book = x.workbook()[x.sheet("Data")[table]]
+    print(f"{rows:,} rows, {workers} workers")
+
+    before = _segments()
+    with tempfile.TemporaryDirectory() as tmp:
+        serial = Path(tmp) / "serial.xlsx"
+        parallel = Path(tmp) / "parallel.xlsx"
+        _timed("save workers=1", lambda: book.save(serial))
+        _timed(f"save workers={workers}", lambda: book.save(parallel, workers=workers))
+        with zipfile.ZipFile(serial) as a, zipfile.ZipFile(parallel) as b:
+            same = a.read("xl/worksheets/sheet1.xml") == b.read(
+                "xl/worksheets/sheet1.xml"
+            )
+        print(f"sheet XML identical: {same}")
+
+    print(f"peak RSS parent             {_peak_rss_mb(resource.RUSAGE_SELF):>8.1f}MB")
+    print(
+        f"peak RSS largest worker     {_peak_rss_mb(resource.RUSAGE_CHILDREN):>8.1f}MB"
+    )
+    leaked = _segments() - before
+    if leaked:
+        print(f"leaked segments: {sorted(leaked)}")
+    if leaked or not same:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
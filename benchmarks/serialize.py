@@ -0,0 +1,58 @@
+"""Compare `xpyxl.dumps`/`loads` with pickle on a 1M-cell report tree.
+
+Run with `python benchmarks/serialize.py [rows]` (10 cells per row).
+"""
+
+import pickle
+import sys
+import time
+
+import xpyxl as x
+
+REGIONS = ("EMEA", "APAC", "AMER", "LATAM")
+
+
+def _timed(label: str, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"{label:<16}{time.perf_counter() - start:>8.3f}s")
+    return result
+
+
+def build(rows: int) -> x.Workbook:
+    body = [
+        [
+            REGIONS[r % 4],
+            x.cell(style=[x.text_right])[r],
+            r * 1.25,
+            x.cell(style=[x.currency_usd])[r * 0.5],
+            f"id-{r}",
+            r % 7,
+            r % 3 == 0,
+            "Open",
+            x.cell(style=[x.percent])[r / (rows or 1)],
+            None,
+        ]
+        for r in range(rows)
+    ]
+    table = x.table(header=[f"c{c}" for c in range(10)], style=[x.table_banded])
+    return x.workbook()[x.sheet("Data")[table[body]]]
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    book = build(rows)
+    node = book._node
+    print(f"{rows * 10:,} cells")
+
+    pickled = _timed("pickle.dumps", lambda: pickle.dumps(node, protocol=5))
+    _timed("pickle.loads", lambda: pickle.loads(pickled))
+    compact = _timed("xpyxl.dumps", lambda: x.dumps(node))
+    restored = _timed("xpyxl.loads", lambda: x.loads(compact))
+    print(f"pickle size     {len(pickled):>12,} bytes")
+    print(f"compact size    {len(compact):>12,} bytes")
+    assert restored == node
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Compare thread- and process-pool saves of the demo workbook scaled up 100x.
+
+Run with `python benchmarks/threads_vs_processes.py [copies] [workers]`. The
+demo's four sheets are repeated `copies` times, giving many medium sheets.
+Threads only pay off on a free-threaded build (`python3.13t`); with the GIL
+they mostly overlap compression and file writes.
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "examples"))
+
+from multi_sheet_sales_demo import (
+    glossary_sheet,
+    pipeline_sheet,
+    raw_data_sheet,
+    summary_section,
+)
+
+import xpyxl as x
+
+
+def _timed(label: str, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"{label:<32}{time.perf_counter() - start:>8.3f}s")
+    return result
+
+
+def main() -> None:
+    copies = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    # Repeated titles get numbered suffixes on save.
+    sheets = [
+        sheet
+        for _ in range(copies)
+        for sheet in (
+            x.sheet("Summary")[summary_section()],
+            raw_data_sheet(),
+            pipeline_sheet(),
+            glossary_sheet(),
+        )
+    ]
+    book = x.workbook()[sheets]
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"{len(sheets):,} sheets, {workers} workers, GIL {'on' if gil else 'off'}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        target = Path(tmp) / "bench.xlsx"
+        _timed("save serial", lambda: book.save(target))
+        _timed(
+            f"save processes={workers}",
+            lambda: book.save(target, workers=workers, pool="process"),
+        )
+        _timed(
+            f"save threads={workers}",
+            lambda: book.save(target, workers=workers, pool="thread"),
+        )
+    _timed("to_openpyxl serial", book.to_openpyxl)
+    _timed(f"to_openpyxl threads={workers}", lambda: book.to_openpyxl(workers=workers))
+
+    same = book.digest() == book.digest(workers=workers, pool="thread")
+    print(f"thread save identical: {same}")
+    if not same:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,22 @@
 from __future__ import annotations
 
-from xpyxl.nodes import SheetNode
+from xpyxl.nodes import Aggregate, SheetFactoryNode, SheetNode
 
+from ._append import append_rows
+from ._convert import Converter, register_converter
+from ._csv import CsvDialect
+from ._plan import SheetPlan, WorkbookPlan
+from ._progress import CancelToken, Progress, RenderCancelled
+from ._records import ColumnHint, column_hint
+from ._serialize import dumps, loads
 from ._workbook import Workbook
+from ._xlsx import PoolKind, RenderStats, SheetStats, StringsStrategy
 from .builders import (
     Node,
     cell,
     col,
     hstack,
+    interning,
     row,
     sheet,
     space,
@@ -71,8 +80,27 @@ from .styles import (
 
 __all__ = [
     "Workbook",
+    "RenderStats",
+    "SheetStats",
+    "StringsStrategy",
+    "PoolKind",
+    "CsvDialect",
+    "Aggregate",
+    "SheetPlan",
+    "WorkbookPlan",
+    "Progress",
+    "CancelToken",
+    "RenderCancelled",
     "SheetNode",
+    "SheetFactoryNode",
     "Node",
+    "ColumnHint",
+    "column_hint",
+    "dumps",
+    "loads",
+    "append_rows",
+    "Converter",
+    "register_converter",
     "Style",
     "BorderStyleName",
     "BorderStyleLiteral",
@@ -85,6 +113,7 @@ __all__ = [
     "space",
     "vstack",
     "hstack",
+    "interning",
     "combine_styles",
     "normalize_hex",
     "to_argb",
@@ -0,0 +1,388 @@
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable, Iterator, Sequence
+from typing import TYPE_CHECKING, Any
+
+from ._convert import _non_finite_error, convert_value
+from ._layout import DEFAULT_ROW_HEIGHT, _column_ranges, _TableMarks
+from ._xlsx import (
+    _BODY_NAME,
+    _FLUSH_ROWS,
+    _FOOTER_NAME,
+    SheetStats,
+    _atomic_output,
+    _column_letter,
+    _format_rows,
+    _number,
+    _ResolvedRow,
+    _temporal_format,
+)
+
+if TYPE_CHECKING:
+    import zipfile
+    from pathlib import Path
+
+__all__ = ["append_rows"]
+
+_CHUNK_SIZE = 1 << 20
+_LOCAL_HEADER = b"PK\x03\x04"
+_LOCAL_HEADER_SIZE = 30
+_DATA_DESCRIPTOR_FLAG = 0x08
+
+_SHEET_ENTRY = re.compile(rb'<sheet name="([^"]*)" sheetId="\d+" r:id="([^"]+)"/>')
+_RELATIONSHIP = re.compile(
+    rb'<Relationship Id="([^"]+)" Type="[^"]*" Target="([^"]+)"/>'
+)
+_DEFINED_ROWS = re.compile(
+    rb'<definedName name="('
+    + _BODY_NAME.encode()
+    + rb"|"
+    + _FOOTER_NAME.encode()
+    + rb')" localSheetId="(\d+)" hidden="1">([^<]*)</definedName>'
+)
+_ROW_SPAN = re.compile(rb"!\$(\d+):\$(\d+)(?=,|<|$)")
+_ROW = re.compile(rb'<row r="(\d+)"([^>]*)>(.*?)</row>', re.DOTALL)
+_ROW_HEIGHT = re.compile(rb'ht="([^"]+)"')
+_CELL_STYLE = re.compile(rb'<c r="([A-Z]+)\d+" s="(\d+)"')
+_DIMENSION = re.compile(rb'<dimension ref="A1(?::([A-Z]+)(\d+))?"/>')
+_COLS = re.compile(rb"<cols>.*?</cols>", re.DOTALL)
+_COL = re.compile(rb'<col min="(\d+)" max="(\d+)" width="([^"]+)"')
+_ENTITIES = (("&quot;", '"'), ("&lt;", "<"), ("&gt;", ">"), ("&amp;", "&"))
+
+
+def _unescape(text: str) -> str:
+    for entity, char in _ENTITIES:
+        text = text.replace(entity, char)
+    return text
+
+
+def _column_index(letters: bytes) -> int:
+    index = 0
+    for letter in letters:
+        index = index * 26 + letter - 64
+    return index
+
+
+def _sheet_part(archive: zipfile.ZipFile, sheet: str) -> tuple[str, int, _TableMarks]:
+    """Return the sheet's part name, index and recorded table rows."""
+    workbook = archive.read("xl/workbook.xml")
+    rels = dict(_RELATIONSHIP.findall(archive.read("xl/_rels/workbook.xml.rels")))
+    for index, (name, rel_id) in enumerate(_SHEET_ENTRY.findall(workbook)):
+        if _unescape(name.decode("utf-8")) == sheet and rel_id in rels:
+            spans: dict[bytes, list[tuple[int, int]]] = {}
+            for defined, sheet_index, ref in _DEFINED_ROWS.findall(workbook):
+                if int(sheet_index) == index:
+                    spans.setdefault(defined, []).extend(
+                        (int(first), int(last))
+                        for first, last in _ROW_SPAN.findall(ref)
+                    )
+            marks = _TableMarks(
+                bodies=tuple(spans.get(_BODY_NAME.encode(), ())),
+                footers=tuple(row for row, _ in spans.get(_FOOTER_NAME.encode(), ())),
+            )
+            return "xl/" + rels[rel_id].decode("utf-8"), index, marks
+    msg = f"Workbook has no sheet named '{sheet}'"
+    raise ValueError(msg)
+
+
+def _extend_body(
+    workbook: bytes, index: int, body: tuple[int, int], last_row: int
+) -> bytes:
+    """Stretch the sheet's recorded `body` span down to `last_row`."""
+    first, end = body
+    span = re.compile(rb"\$%d:\$%d(?=,|<)" % (first, end))
+    replacement = b"$%d:$%d" % (first, last_row)
+
+    def stretch(match: re.Match[bytes]) -> bytes:
+        if match.group(1) != _BODY_NAME.encode() or int(match.group(2)) != index:
+            return match.group(0)
+        return span.sub(replacement, match.group(0), count=1)
+
+    return _DEFINED_ROWS.sub(stretch, workbook)
+
+
+def _copy_compressed(
+    source: zipfile.ZipFile, archive: zipfile.ZipFile, info: zipfile.ZipInfo
+) -> None:
+    """Copy a member's compressed bytes into `archive` without re-deflating.
+
+    zipfile has no public API for this, so the local header is written here
+    and the entry registered the way `ZipFile.writestr` does it.
+    """
+    import struct
+    import zipfile
+
+    fp = source.fp
+    assert fp is not None and archive.fp is not None
+    fp.seek(info.header_offset)
+    header = fp.read(_LOCAL_HEADER_SIZE)
+    if header[:4] != _LOCAL_HEADER:
+        msg = f"Bad local header for '{info.filename}'"
+        raise zipfile.BadZipFile(msg)
+    name_length, extra_length = struct.unpack("<HH", header[26:30])
+    fp.seek(name_length + extra_length, 1)
+
+    # A fresh ZipInfo drops the old extra fields; FileHeader() adds a zip64
+    # one again if the sizes need it. CRC and sizes go in the header, so no
+    # data descriptor follows.
+    entry = zipfile.ZipInfo(info.filename, info.date_time)
+    entry.compress_type = info.compress_type
+    entry.external_attr = info.external_attr
+    entry.flag_bits = info.flag_bits & ~_DATA_DESCRIPTOR_FLAG
+    entry.CRC = info.CRC
+    entry.compress_size = info.compress_size
+    entry.file_size = info.file_size
+    entry.header_offset = archive.fp.tell()
+    archive.fp.write(entry.FileHeader())
+    remaining = info.compress_size
+    while remaining:
+        chunk = fp.read(min(remaining, _CHUNK_SIZE))
+        if not chunk:
+            msg = f"Truncated data for '{info.filename}'"
+            raise zipfile.BadZipFile(msg)
+        archive.fp.write(chunk)
+        remaining -= len(chunk)
+    archive.filelist.append(entry)
+    archive.NameToInfo[entry.filename] = entry
+    archive.start_dir = archive.fp.tell()
+    archive._didModify = True
+
+
+class _SheetScan:
+    """Head, template rows and splice offset of a sheet part, found in one pass."""
+
+    def __init__(self, source: Any) -> None:
+        head = b""
+        while b"<sheetData>" not in head:
+            chunk = source.read(_CHUNK_SIZE)
+            if not chunk:
+                msg = "Sheet was not written by xpyxl (no <sheetData>)"
+                raise ValueError(msg)
+            head += chunk
+        split = head.index(b"<sheetData>") + len(b"<sheetData>")
+        self.head = head[:split]
+        # Keep only the bytes from the second-to-last <row> onwards, so memory
+        # stays bounded by two rows whatever the sheet size.
+        window = head[split:]
+        window_start = split
+        while True:
+            last = window.rfind(b"<row ")
+            previous = window.rfind(b"<row ", 0, last) if last > 0 else -1
+            if previous > 0:
+                window = window[previous:]
+                window_start += previous
+            chunk = source.read(_CHUNK_SIZE)
+            if not chunk:
+                break
+            window += chunk
+        end = window.rfind(b"</sheetData>")
+        if end < 0:
+            msg = "Sheet was not written by xpyxl (no </sheetData>)"
+            raise ValueError(msg)
+        self.splice_at = window_start + end
+        self.templates = _ROW.findall(window[:end])[-2:]
+        if not self.templates:
+            msg = "Cannot append to an empty sheet"
+            raise ValueError(msg)
+
+
+def _template(row: tuple[bytes, bytes, bytes]) -> tuple[float, dict[int, int]]:
+    _, attrs, cells = row
+    height = DEFAULT_ROW_HEIGHT
+    match = _ROW_HEIGHT.search(attrs)
+    if match:
+        height = float(match.group(1))
+    xfs = {
+        _column_index(letters): int(xf) for letters, xf in _CELL_STYLE.findall(cells)
+    }
+    if not xfs:
+        msg = "Cannot append below a row without cells"
+        raise ValueError(msg)
+    return height, xfs
+
+
+def _resolve_appended(
+    rows: Iterable[Sequence[Any]],
+    templates: dict[int, tuple[float, dict[int, int]]],
+    first_row: int,
+    body_start: int,
+) -> Iterator[_ResolvedRow]:
+    """Resolve `rows` from `first_row` on, each styled like the template of its
+    parity, counted from the table's first body row `body_start`. A table with
+    a single body row has one template, which every new row takes.
+    """
+    from decimal import Decimal
+    from math import isfinite
+
+    for offset, values in enumerate(rows):
+        parity = (first_row + offset - body_start) % 2
+        height, xfs = templates.get(parity) or templates[1 - parity]
+        first_col = min(xfs)
+        if len(values) > len(xfs):
+            msg = (
+                f"Appended row {offset + 1} has {len(values)} values but the "
+                f"table has {len(xfs)} columns"
+            )
+            raise ValueError(msg)
+        cells = []
+        for column_index, value in enumerate(values, start=first_col):
+            # Cells keep the template styles, so converter formats do not apply.
+            value, _ = convert_value(value)
+            if not (
+                value is None
+                or isinstance(value, (str, int, float, Decimal))
+                or _temporal_format(value) is not None
+            ):
+                msg = f"Cannot convert {value!r} to Excel"
+                raise ValueError(msg)
+            if isinstance(value, (float, Decimal)) and not isfinite(value):
+                value = _non_finite_error(value)
+            cells.append((column_index, value, xfs[column_index], -1))
+        yield first_row + offset, height, cells, 0
+
+
+def _new_head(
+    head: bytes, widths: dict[int, float], last_row: int, max_col: int
+) -> bytes:
+    match = _DIMENSION.search(head)
+    if match is None:
+        msg = "Sheet was not written by xpyxl (no <dimension>)"
+        raise ValueError(msg)
+    if match.group(1):
+        max_col = max(max_col, _column_index(match.group(1)))
+    dimension = f'<dimension ref="A1:{_column_letter(max_col)}{last_row}"/>'.encode()
+    head = head[: match.start()] + dimension + head[match.end() :]
+
+    col_widths: dict[int, float] = {}
+    cols = _COLS.search(head)
+    if cols is not None:
+        for first, last, width in _COL.findall(cols.group(0)):
+            for column_index in range(int(first), int(last) + 1):
+                col_widths[column_index] = float(width)
+    for column_index, width in widths.items():
+        if col_widths.get(column_index, 0.0) < width:
+            col_widths[column_index] = width
+    xml = "".join(
+        f'<col min="{first}" max="{last}" width="{_number(width)}" customWidth="1"/>'
+        for first, last, width in _column_ranges(col_widths)
+    )
+    block = f"<cols>{xml}</cols>".encode()
+    if cols is not None:
+        return head[: cols.start()] + block + head[cols.end() :]
+    split = head.index(b"<sheetData>")
+    return head[:split] + block + head[split:]
+
+
+def append_rows(
+    path: str | Path,
+    sheet: str,
+    rows: Iterable[Sequence[Any]],
+    *,
+    output: str | Path | None = None,
+) -> SheetStats:
+    """Append value rows below the last row of `sheet` in an xpyxl-written file.
+
+    The sheet must end with a table's body. New rows reuse the cell styles and
+    heights of that table's last two body rows, each taking the one of the same
+    parity, so banding continues; header and title rows are never copied.
+    Sheets ending in a table footer are refused, since the footer's aggregates
+    would not cover the new rows, and so are sheets with grouped tables, whose
+    subtotals and outline the new rows would fall outside of. Text is written
+    inline, leaving the shared-strings part untouched. workbook.xml is
+    rewritten so its record of the table body covers the new rows. Every other
+    part is copied as compressed bytes, without inflating it, and the sheet's
+    dimension and column widths are updated in place. The result replaces
+    `path` unless `output` is given.
+    """
+    import shutil
+    import tempfile
+    import zipfile
+    from itertools import batched
+
+    target = output if output is not None else path
+    with (
+        _atomic_output(target) as temp_path,
+        zipfile.ZipFile(path) as source,
+        tempfile.SpooledTemporaryFile(max_size=16 * 1024 * 1024) as body,
+    ):
+        part, index, marks = _sheet_part(source, sheet)
+        with source.open(part) as stream:
+            scan = _SheetScan(stream)
+        last_row = int(scan.templates[-1][0])
+        if b"outlineLevelRow=" in scan.head:
+            msg = (
+                f"Sheet '{sheet}' has row outlines from a grouped table; rebuild "
+                "the workbook to add rows to it"
+            )
+            raise ValueError(msg)
+        if last_row in marks.footers:
+            msg = (
+                f"Sheet '{sheet}' ends with a table footer; rebuild the workbook "
+                "to add rows to that table"
+            )
+            raise ValueError(msg)
+        table_body = next((span for span in marks.bodies if span[1] == last_row), None)
+        if table_body is None:
+            msg = (
+                f"Sheet '{sheet}' does not end with a table body row to copy; "
+                "rebuild the workbook to add rows below other content"
+            )
+            raise ValueError(msg)
+        body_start = table_body[0]
+        # Only body rows are templates; a header or title above a one-row
+        # body must not be copied.
+        templates = {
+            (int(row[0]) - body_start) % 2: _template(row)
+            for row in scan.templates
+            if int(row[0]) >= body_start
+        }
+
+        stats = SheetStats(name=sheet)
+        widths: dict[int, float] = {}
+        max_row = last_row
+        max_col = 0
+        resolved = _resolve_appended(rows, templates, last_row + 1, body_start)
+        for band in map(_format_rows, batched(resolved, _FLUSH_ROWS)):
+            body.write(band.xml)
+            for column_index, width in band.col_widths.items():
+                if widths.get(column_index, 0.0) < width:
+                    widths[column_index] = width
+            max_row = max(max_row, band.last_row)
+            max_col = max(max_col, band.max_col)
+            stats.rows += band.rows
+            stats.cells += band.cells
+        body.seek(0)
+
+        with zipfile.ZipFile(
+            temp_path, "w", compression=zipfile.ZIP_DEFLATED, allowZip64=True
+        ) as archive:
+            for info in source.infolist():
+                if info.filename == "xl/workbook.xml":
+                    # The body now runs to the last appended row, so a later
+                    # append continues its parity.
+                    workbook = source.read(info)
+                    if max_row > last_row:
+                        workbook = _extend_body(workbook, index, table_body, max_row)
+                    archive.writestr(info, workbook)
+                    continue
+                if info.filename != part:
+                    _copy_compressed(source, archive, info)
+                    continue
+                entry = zipfile.ZipInfo(info.filename, info.date_time)
+                entry.compress_type = info.compress_type
+                entry.external_attr = info.external_attr
+                with (
+                    source.open(info) as src,
+                    archive.open(entry, "w", force_zip64=True) as dst,
+                ):
+                    dst.write(_new_head(scan.head, widths, max_row, max_col))
+                    src.read(len(scan.head))
+                    remaining = scan.splice_at - len(scan.head)
+                    while remaining:
+                        chunk = src.read(min(remaining, _CHUNK_SIZE))
+                        dst.write(chunk)
+                        remaining -= len(chunk)
+                    shutil.copyfileobj(body, dst)
+                    shutil.copyfileobj(src, dst, _CHUNK_SIZE)
+    return stats
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import queue
+from collections.abc import AsyncIterable, Callable, Iterator, Sequence
+from contextvars import ContextVar
+from typing import Any, TypeVar
+
+from ._progress import CancelToken, RenderCancelled
+
+__all__ = ["AsyncRowSource", "render_async"]
+
+# How often blocked producers and consumers re-check for shutdown.
+_POLL_SECONDS = 0.05
+
+_DONE = object()
+
+_T = TypeVar("_T")
+
+
+class _Failure:
+    __slots__ = ("error",)
+
+    def __init__(self, error: BaseException) -> None:
+        self.error = error
+
+
+class _Pump:
+    """Event loop of one `render_async` call and the sources started under it."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.loop = loop
+        self.sources: list[AsyncRowSource] = []
+
+    def close(self) -> None:
+        for source in self.sources:
+            source.close()
+
+
+# Set by `render_async`; the render thread inherits it through `to_thread`.
+_PUMP: ContextVar[_Pump | None] = ContextVar("xpyxl_async_pump", default=None)
+
+
+class AsyncRowSource:
+    """Rows of an async iterable, handed to the render thread in batches.
+
+    The iterable is drained on the event loop by a producer task, started when
+    the renderer reaches the table, into a queue holding at most `prefetch`
+    batches.
+    """
+
+    __slots__ = ("_iterable", "_batch_size", "_queue", "_consumed", "_closed", "_task")
+
+    def __init__(
+        self,
+        iterable: AsyncIterable[Sequence[Any]],
+        *,
+        batch_size: int = 1000,
+        prefetch: int = 4,
+    ) -> None:
+        if not hasattr(iterable, "__aiter__"):
+            msg = "from_async expects an async iterable of rows"
+            raise TypeError(msg)
+        if batch_size < 1 or prefetch < 1:
+            msg = "Async batch size and prefetch must be >= 1"
+            raise ValueError(msg)
+        self._iterable = iterable
+        self._batch_size = batch_size
+        self._queue: queue.Queue[Any] = queue.Queue(maxsize=prefetch)
+        self._consumed = False
+        self._closed = False
+        self._task: Any = None
+
+    @property
+    def width(self) -> int:
+        return 0
+
+    async def _produce(self) -> None:
+        try:
+            batch: list[Sequence[Any]] = []
+            async for row in self._iterable:
+                batch.append(row)
+                if len(batch) >= self._batch_size:
+                    await self._put(batch)
+                    batch = []
+            if batch:
+                await self._put(batch)
+            await self._put(_DONE)
+        except Exception as exc:
+            await self._put(_Failure(exc))
+
+    async def _put(self, item: Any) -> None:
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            # Wait off the loop so other tasks keep running while the renderer
+            # catches up.
+            await asyncio.to_thread(self._put_blocking, item)
+
+    def _put_blocking(self, item: Any) -> None:
+        while not self._closed:
+            try:
+                self._queue.put(item, timeout=_POLL_SECONDS)
+                return
+            except queue.Full:
+                continue
+
+    def _get(self) -> Any:
+        while True:
+            try:
+                return self._queue.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                if self._closed:
+                    msg = "Render was cancelled"
+                    raise RenderCancelled(msg) from None
+
+    def rows(self) -> Iterator[Sequence[Any]]:
+        if self._consumed:
+            msg = "Async rows were already rendered; a fresh iterable is needed to render twice"
+            raise ValueError(msg)
+        pump = _PUMP.get()
+        if pump is None:
+            msg = "Tables built with from_async can only be rendered by Workbook.save_async"
+            raise ValueError(msg)
+        self._consumed = True
+        pump.sources.append(self)
+        self._task = asyncio.run_coroutine_threadsafe(self._produce(), pump.loop)
+        try:
+            while True:
+                item = self._get()
+                if item is _DONE:
+                    return
+                if isinstance(item, _Failure):
+                    raise item.error
+                yield from item
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Stop the producer; a renderer waiting for rows raises RenderCancelled."""
+        self._closed = True
+        if self._task is not None:
+            self._task.cancel()
+
+
+async def render_async(render: Callable[[], _T], cancel: CancelToken) -> _T:
+    """Run the blocking `render()` on a worker thread while async sources are
+    fed from the running loop.
+
+    Cancelling the awaiting task cancels the render through `cancel` and waits
+    for the thread to clean up before re-raising.
+    """
+    pump = _Pump(asyncio.get_running_loop())
+    token = _PUMP.set(pump)
+    try:
+        task = asyncio.ensure_future(asyncio.to_thread(render))
+    finally:
+        _PUMP.reset(token)
+    try:
+        return await asyncio.shield(task)
+    except asyncio.CancelledError:
+        cancel.cancel()
+        pump.close()
+        with contextlib.suppress(Exception):
+            await task
+        raise
+    finally:
+        pump.close()
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any
+
+from ._xlsx import _Band, _format_rows, _ResolvedRow
+
+__all__ = ["SharedBand", "format_shared_band", "release", "share_band"]
+
+# Per-cell value kinds. Numbers, text, booleans and blanks travel in shared
+# memory; the rest (dates, formulas, decimals, huge ints) is pickled.
+_OTHER = 0
+_INT = 1
+_FLOAT = 2
+_TEXT = 3
+_NONE = 4
+_FALSE = 5
+_TRUE = 6
+
+_INT64_MIN = -(2**63)
+_INT64_MAX = 2**63 - 1
+
+# Buffers in the order they are laid out in the segment. 8-byte columns come
+# first so every buffer stays naturally aligned.
+_LAYOUT = (
+    ("rows", "q"),
+    ("heights", "d"),
+    ("ints", "q"),
+    ("floats", "d"),
+    ("text_ends", "q"),
+    ("counts", "I"),
+    ("columns", "I"),
+    ("xfs", "I"),
+    ("ssts", "i"),
+    ("kinds", "B"),
+    ("levels", "B"),
+    ("text", "B"),
+)
+
+
+@dataclass(frozen=True)
+class SharedBand:
+    """Picklable handle to a band whose column buffers live in shared memory."""
+
+    name: str
+    # (typecode, byte offset, item count) per buffer, in `_LAYOUT` order.
+    buffers: tuple[tuple[str, int, int], ...]
+    others: tuple[Any, ...]
+
+
+def share_band(rows: Sequence[_ResolvedRow]) -> tuple[SharedMemory, SharedBand]:
+    """Copy a band's columns and text into a new shared-memory segment.
+
+    Strings are stored UTF-8 encoded, end to end, with their end offsets.
+
+    The caller owns the returned segment and must close and unlink it once the
+    band has been formatted.
+    """
+    columns = {name: array(typecode) for name, typecode in _LAYOUT}
+    row_ids = columns["rows"]
+    heights = columns["heights"]
+    ints = columns["ints"]
+    floats = columns["floats"]
+    text_ends = columns["text_ends"]
+    counts = columns["counts"]
+    cell_columns = columns["columns"]
+    xfs = columns["xfs"]
+    ssts = columns["ssts"]
+    kinds = columns["kinds"]
+    levels = columns["levels"]
+    others: list[Any] = []
+    texts: list[bytes] = []
+    text_end = 0
+    for row_index, height, cells, level in rows:
+        row_ids.append(row_index)
+        heights.append(height)
+        levels.append(level)
+        counts.append(len(cells))
+        for column_index, value, xf, sst in cells:
+            cell_columns.append(column_index)
+            xfs.append(xf)
+            ssts.append(sst)
+            kind = type(value)
+            if kind is str:
+                # surrogatepass keeps lone surrogates for the worker to reject.
+                data = value.encode("utf-8", "surrogatepass")
+                kinds.append(_TEXT)
+                texts.append(data)
+                text_end += len(data)
+                text_ends.append(text_end)
+            elif kind is float:
+                kinds.append(_FLOAT)
+                floats.append(value)
+            elif kind is int and _INT64_MIN <= value <= _INT64_MAX:
+                kinds.append(_INT)
+                ints.append(value)
+            elif value is None:
+                kinds.append(_NONE)
+            elif kind is bool:
+                kinds.append(_TRUE if value else _FALSE)
+            else:
+                kinds.append(_OTHER)
+                others.append(value)
+    columns["text"].frombytes(b"".join(texts))
+    del texts
+
+    buffers: list[tuple[str, int, int]] = []
+    offset = 0
+    for name, typecode in _LAYOUT:
+        column = columns[name]
+        buffers.append((typecode, offset, len(column)))
+        offset += len(column) * column.itemsize
+    segment = SharedMemory(create=True, size=max(offset, 1))
+    try:
+        for (_, start, _), (name, _) in zip(buffers, _LAYOUT):
+            data = columns[name].tobytes()
+            segment.buf[start : start + len(data)] = data
+    except BaseException:
+        release(segment)
+        raise
+    return segment, SharedBand(segment.name, tuple(buffers), tuple(others))
+
+
+def release(segment: SharedMemory) -> None:
+    """Unmap and destroy a segment created by `share_band`."""
+    segment.close()
+    segment.unlink()
+
+
+def _unpack(band: SharedBand, buf: memoryview) -> Iterator[_ResolvedRow]:
+    views = [
+        buf[start : start + count * array(typecode).itemsize].cast(typecode)
+        for typecode, start, count in band.buffers
+    ]
+    try:
+        (
+            row_ids,
+            heights,
+            ints,
+            floats,
+            text_ends,
+            counts,
+            columns,
+            xfs,
+            ssts,
+            kinds,
+            levels,
+            text,
+        ) = views
+        next_int = iter(ints).__next__
+        next_float = iter(floats).__next__
+        next_text_end = iter(text_ends).__next__
+        next_other = iter(band.others).__next__
+        text_start = 0
+        cell = 0
+        for row_index, height, count, level in zip(row_ids, heights, counts, levels):
+            cells = []
+            for position in range(cell, cell + count):
+                kind = kinds[position]
+                if kind == _TEXT:
+                    text_end = next_text_end()
+                    value = str(text[text_start:text_end], "utf-8", "surrogatepass")
+                    text_start = text_end
+                elif kind == _FLOAT:
+                    value = next_float()
+                elif kind == _INT:
+                    value = next_int()
+                elif kind == _NONE:
+                    value = None
+                elif kind == _FALSE:
+                    value = False
+                elif kind == _TRUE:
+                    value = True
+                else:
+                    value = next_other()
+                cells.append((columns[position], value, xfs[position], ssts[position]))
+            cell += count
+            yield row_index, height, cells, level
+    finally:
+        for view in views:
+            view.release()
+
+
+def format_shared_band(band: SharedBand) -> _Band:
+    """Worker entry point: attach to the segment, format, detach."""
+    segment = SharedMemory(name=band.name)
+    rows = _unpack(band, segment.buf)
+    try:
+        return _format_rows(rows)
+    finally:
+        # Drop the buffer views before closing, or close() refuses to unmap.
+        rows.close()
+        segment.close()
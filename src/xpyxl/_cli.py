@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+from typing import IO, Any
+
+from ._workbook import Workbook
+from ._xlsx import StringsStrategy
+
+__all__ = ["main", "render_job"]
+
+
+def render_job(
+    spec: str | Path, output: str | Path, *, strings: StringsStrategy = "auto"
+) -> dict[str, Any]:
+    """Render one serialized workbook spec to `output` and report timings in ms."""
+    start = time.perf_counter()
+    workbook = Workbook.from_bytes(Path(spec).read_bytes())
+    loaded = time.perf_counter()
+    stats = workbook.save(output, strings=strings)
+    done = time.perf_counter()
+    return {
+        "ok": True,
+        "output": str(output),
+        "sheets": len(stats.sheets),
+        "rows": sum(sheet.rows for sheet in stats.sheets),
+        "cells": sum(sheet.cells for sheet in stats.sheets),
+        "load_ms": round((loaded - start) * 1000, 3),
+        "render_ms": round((done - loaded) * 1000, 3),
+        "total_ms": round((done - start) * 1000, 3),
+    }
+
+
+def _run_job(line: str) -> dict[str, Any]:
+    try:
+        job = json.loads(line)
+        return render_job(
+            job["spec"], job["output"], strings=job.get("strings", "auto")
+        )
+    except Exception as exc:  # report and keep the worker alive
+        return {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+
+
+def _serve_lines(lines: Iterable[str], out: IO[str]) -> None:
+    for line in lines:
+        if not line.strip():
+            continue
+        out.write(json.dumps(_run_job(line)) + "\n")
+        out.flush()
+
+
+def _serve_socket(path: str) -> None:
+    import socketserver
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            for raw in self.rfile:
+                if not raw.strip():
+                    continue
+                reply = json.dumps(_run_job(raw.decode("utf-8"))) + "\n"
+                self.wfile.write(reply.encode("utf-8"))
+                self.wfile.flush()
+
+    Path(path).unlink(missing_ok=True)
+    with socketserver.UnixStreamServer(path, Handler) as server:
+        try:
+            server.serve_forever()
+        finally:
+            Path(path).unlink(missing_ok=True)
+
+
+def _warm_up() -> None:
+    # Pay the one-off costs (lazy stdlib imports, cache set-up) before the
+    # first job instead of inside its timings.
+    import shutil  # noqa: F401
+    import tempfile  # noqa: F401
+    import zipfile  # noqa: F401
+    from decimal import Decimal  # noqa: F401
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="xpyxl", description="Render serialized xpyxl workbooks to .xlsx."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    render = commands.add_parser("render", help="render one spec file")
+    render.add_argument("spec", help="file written by Workbook.to_bytes()")
+    render.add_argument("output", help="destination .xlsx path")
+    render.add_argument(
+        "--strings", choices=("shared", "inline", "auto"), default="auto"
+    )
+
+    worker = commands.add_parser(
+        "worker",
+        help="render a stream of JSON jobs, one per line",
+        description=(
+            'Each job is a JSON object {"spec": ..., "output": ..., "strings": ...}. '
+            "One JSON result line with per-job timings is written back per job."
+        ),
+    )
+    worker.add_argument(
+        "--socket", help="listen on this Unix socket instead of stdin/stdout"
+    )
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = _parser().parse_args(argv)
+    if args.command == "render":
+        result = render_job(args.spec, args.output, strings=args.strings)
+        print(json.dumps(result))
+        return 0
+    _warm_up()
+    if args.socket:
+        _serve_socket(args.socket)
+    else:
+        _serve_lines(sys.stdin, sys.stdout)
+    return 0
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable
+from datetime import datetime, time
+from typing import Any, NamedTuple
+
+__all__ = ["Converter", "convert_value", "register_converter"]
+
+Converter = Callable[[Any], Any]
+
+
+class _Entry(NamedTuple):
+    convert: Converter
+    # Applied when the cell's styles set no number format.
+    number_format: str | None
+
+
+# Types both backends write as they are. Everything else goes through the
+# dispatch table, resolved once per type.
+_NATIVE_TYPES = frozenset({str, int, float, bool, type(None)})
+
+_REGISTERED: dict[type, _Entry] = {}
+# Resolved entry per concrete type; None means "write unchanged". Lookups are
+# lock-free; filling and clearing hold `_LOCK` so a registration racing a
+# render on another thread cannot leave a stale entry behind.
+_DISPATCH: dict[type, _Entry | None] = {}
+_LOCK = threading.Lock()
+
+
+def register_converter(
+    kind: type, convert: Converter, *, number_format: str | None = None
+) -> None:
+    """Convert values of `kind` (and its subclasses) with `convert` before writing.
+
+    `convert` must return a value the backends accept: text, a number, a
+    boolean, None, or a naive date, time, datetime or timedelta.
+    `number_format` is the default format for those cells when their styles
+    set none. Registered converters take precedence over the built-in ones.
+    """
+    if not isinstance(kind, type):
+        msg = "Converters are registered for a type"
+        raise TypeError(msg)
+    if not callable(convert):
+        msg = "Converter must be callable"
+        raise TypeError(msg)
+    with _LOCK:
+        _REGISTERED[kind] = _Entry(convert, number_format)
+        _DISPATCH.clear()
+
+
+def _non_finite_error(value: Any) -> str:
+    """The Excel error written in place of a NaN or infinite number.
+
+    Excel has no such numbers, so these are the errors its own arithmetic
+    gives: #NUM! for NaN and #DIV/0! for an infinity.
+    """
+    return "#NUM!" if value != value else "#DIV/0!"
+
+
+def _naive_datetime(value: datetime) -> datetime:
+    # Excel has no time zones: keep the wall-clock time the value shows.
+    return value if value.tzinfo is None else value.replace(tzinfo=None)
+
+
+def _naive_time(value: time) -> time:
+    return value if value.tzinfo is None else value.replace(tzinfo=None)
+
+
+def _numpy_temporal(value: Any) -> Any:
+    # `item()` on nanosecond datetime64/timedelta64 values returns a bare int,
+    # so step down to microseconds, which map onto datetime/timedelta.
+    return value.astype(f"{type(value).__name__}[us]").item()
+
+
+def _numpy_scalar(value: Any) -> Any:
+    return value.item()
+
+
+def _builtin_entry(kind: type) -> _Entry | None:
+    if issubclass(kind, datetime):
+        return _Entry(_naive_datetime, None)
+    if issubclass(kind, time):
+        return _Entry(_naive_time, None)
+    # NumPy scalars are recognised by module so numpy is never imported here.
+    if kind.__module__ == "numpy" and hasattr(kind, "item"):
+        if kind.__name__ in ("datetime64", "timedelta64"):
+            return _Entry(_numpy_temporal, None)
+        return _Entry(_numpy_scalar, None)
+    return None
+
+
+def _resolve(kind: type) -> _Entry | None:
+    with _LOCK:
+        for base in kind.__mro__:
+            entry = _REGISTERED.get(base)
+            if entry is not None:
+                break
+        else:
+            entry = _builtin_entry(kind)
+        _DISPATCH[kind] = entry
+    return entry
+
+
+def _converter_for(kind: type) -> _Entry | None:
+    """Dispatch entry for values of `kind`, or None to write them unchanged."""
+    try:
+        return _DISPATCH[kind]
+    except KeyError:
+        return _resolve(kind)
+
+
+def convert_value(value: Any) -> tuple[Any, str | None]:
+    """`value` as the backends should write it, plus its default number format."""
+    kind = type(value)
+    if kind in _NATIVE_TYPES:
+        return value, None
+    entry = _converter_for(kind)
+    if entry is None:
+        return value, None
+    return entry.convert(value), entry.number_format
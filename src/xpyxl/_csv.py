@@ -0,0 +1,395 @@
+from __future__ import annotations
+
+import itertools
+import re
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from dataclasses import replace
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from itertools import batched
+from typing import TYPE_CHECKING, Any, Literal, TextIO
+
+from ._convert import convert_value
+from ._layout import (
+    _column_style,
+    _footer_row,
+    _Formula,
+    _iter_rows,
+    _Placement,
+    _placement_rows,
+    _resolve_chain,
+    _RowFragment,
+    _sheet_placements,
+    _table_chains,
+    _table_records,
+    _table_size,
+    _table_totals,
+)
+from .nodes import (
+    ColumnNode,
+    SheetFactoryNode,
+    SheetNode,
+    SpacerNode,
+    TableNode,
+    build_sheet,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+__all__ = ["CsvDialect", "save_csv", "write_sheet_csv"]
+
+CsvDialect = Literal["csv", "tsv"]
+
+_Formatter = Callable[[Any], Any]
+
+# Rows handed to `csv.writer.writerows` per call.
+_CSV_BATCH_ROWS = 4096
+
+# Excel date tokens, longest first so "yyyy" wins over "yy".
+_DATE_TOKEN = re.compile(
+    r"yyyy|yy|mmmm|mmm|mm|m|dddd|ddd|dd|d|hh|h|ss|s|AM/PM|am/pm|A/P|a/p",
+    re.IGNORECASE,
+)
+_LITERAL = re.compile(r'"([^"]*)"|\\(.)')
+_LOCALE = re.compile(r"\[\$([^\]-]*)(?:-[^\]]*)?\]")
+_BRACKETS = re.compile(r"\[[^\]]*\]")
+_NUMBER_PART = re.compile(r"[#0?,.]*[0#?][#0?,.]*")
+
+
+def _strip_format(number_format: str) -> str:
+    """First section of a format, with locale currency symbols kept and other
+    bracketed codes (colours, conditions) dropped."""
+    section = number_format.split(";", 1)[0]
+    section = _LOCALE.sub(lambda match: match.group(1), section)
+    return _BRACKETS.sub("", section)
+
+
+def _date_formatter(section: str) -> _Formatter | None:
+    plain = _LITERAL.sub("", section)
+    if not re.search(r"[ydhs]", plain, re.IGNORECASE) and "mm" not in plain.lower():
+        return None
+    if re.search(r"[0#?]", plain):
+        return None
+    twelve_hour = bool(re.search(r"AM/PM|A/P", plain, re.IGNORECASE))
+    pieces: list[str] = []
+    position = 0
+    tokens = list(_DATE_TOKEN.finditer(section))
+    for index, match in enumerate(tokens):
+        literal = section[position : match.start()]
+        pieces.append(_LITERAL.sub(lambda m: m.group(1) or m.group(2), literal))
+        token = match.group(0).lower()
+        if token in ("m", "mm"):
+            # "m"/"mm" mean minutes right after hours or right before seconds.
+            previous = tokens[index - 1].group(0).lower() if index else ""
+            following = (
+                tokens[index + 1].group(0).lower() if index + 1 < len(tokens) else ""
+            )
+            if previous in ("h", "hh") or following in ("s", "ss"):
+                token = "n" if token == "m" else "nn"
+        pieces.append(
+            {
+                "yyyy": "{year:04}",
+                "yy": "{yy:02}",
+                "mmmm": "{month_name}",
+                "mmm": "{month_abbr}",
+                "mm": "{month:02}",
+                "m": "{month}",
+                "dddd": "{day_name}",
+                "ddd": "{day_abbr}",
+                "dd": "{day:02}",
+                "d": "{day}",
+                "hh": "{hour:02}",
+                "h": "{hour}",
+                "nn": "{minute:02}",
+                "n": "{minute}",
+                "ss": "{second:02}",
+                "s": "{second}",
+            }.get(token, "{ampm}")
+        )
+        position = match.end()
+    pieces.append(_LITERAL.sub(lambda m: m.group(1) or m.group(2), section[position:]))
+    pattern = "".join(
+        piece if piece.startswith("{") else piece.replace("{", "{{").replace("}", "}}")
+        for piece in pieces
+    )
+
+    def fields(value: date | time) -> dict[str, Any]:
+        year = getattr(value, "year", 1899)
+        month = getattr(value, "month", 12)
+        day = getattr(value, "day", 30)
+        hour = getattr(value, "hour", 0)
+        stamp = datetime(year, month, day)
+        return {
+            "year": year,
+            "yy": year % 100,
+            "month": month,
+            "month_name": stamp.strftime("%B"),
+            "month_abbr": stamp.strftime("%b"),
+            "day": day,
+            "day_name": stamp.strftime("%A"),
+            "day_abbr": stamp.strftime("%a"),
+            "hour": (hour % 12 or 12) if twelve_hour else hour,
+            "minute": getattr(value, "minute", 0),
+            "second": getattr(value, "second", 0),
+            "ampm": "AM" if hour < 12 else "PM",
+        }
+
+    def format_date(value: Any) -> Any:
+        if isinstance(value, (date, time)):
+            return pattern.format(**fields(value))
+        return value
+
+    return format_date
+
+
+def _number_formatter(section: str) -> _Formatter | None:
+    from decimal import Decimal
+
+    match = _NUMBER_PART.search(_LITERAL.sub(lambda m: "\0" * len(m.group(0)), section))
+    if match is None:
+        return None
+    literal = lambda text: _LITERAL.sub(lambda m: m.group(1) or m.group(2), text)  # noqa: E731
+    prefix = literal(section[: match.start()])
+    suffix = literal(section[match.end() :])
+    digits = match.group(0)
+    integer, _, fraction = digits.partition(".")
+    decimals = len(fraction.replace(",", ""))
+    spec = f"{',' if ',' in integer else ''}.{decimals}f"
+    scale = 100 if "%" in suffix else 1
+
+    def format_number(value: Any) -> Any:
+        if isinstance(value, bool) or not isinstance(value, (int, float, Decimal)):
+            return value
+        scaled = value * scale
+        text = format(abs(scaled), spec)
+        sign = "-" if scaled < 0 and float(text.replace(",", "")) else ""
+        return f"{sign}{prefix}{text}{suffix}"
+
+    return format_number
+
+
+@lru_cache(maxsize=256)
+def _formatter(number_format: str | None) -> _Formatter | None:
+    """Value formatter for a number format, or None to write values as-is."""
+    if not number_format or number_format.lower() in ("general", "@"):
+        return None
+    section = _strip_format(number_format)
+    return _date_formatter(section) or _number_formatter(section)
+
+
+def _elapsed(value: timedelta) -> str:
+    seconds = int(value.total_seconds())
+    sign = "-" if seconds < 0 else ""
+    hours, remainder = divmod(abs(seconds), 3600)
+    return f"{sign}{hours}:{remainder // 60:02}:{remainder % 60:02}"
+
+
+class _Formats:
+    """Formatter per style chain, keyed by identity since table chains are shared."""
+
+    def __init__(self) -> None:
+        self._by_id: dict[int, tuple[tuple[Any, ...], _Formatter | None]] = {}
+
+    def get(self, chain: tuple[Any, ...]) -> _Formatter | None:
+        entry = self._by_id.get(id(chain))
+        if entry is not None and entry[0] is chain:
+            return entry[1]
+        formatter = _formatter(_resolve_chain(chain).number_format)
+        # Holding the chain keeps its id from being reused; cap the cache so
+        # per-cell chains cannot grow it without bound.
+        if len(self._by_id) < 4096:
+            self._by_id[id(chain)] = (chain, formatter)
+        return formatter
+
+
+# Types `csv.writer` already renders as a General cell shows them; anything
+# else goes through `_cell_text`.
+_PLAIN = frozenset({str, int, float, type(None), date})
+
+
+def _cell_text(value: Any, formatter: _Formatter | None) -> Any:
+    if type(value) is _Formula:
+        # Only the value a formula evaluates to is exported.
+        value = value.value
+    value, default_format = convert_value(value)
+    if formatter is None and default_format is not None:
+        formatter = _formatter(default_format)
+    if formatter is not None:
+        value = formatter(value)
+    kind = type(value)
+    if kind is bool:
+        return "TRUE" if value else "FALSE"
+    if kind is timedelta:
+        return _elapsed(value)
+    return value
+
+
+def _fragment_fields(fragment: _RowFragment, formats: _Formats) -> list[Any]:
+    fields: list[Any] = []
+    for column_index, value, chain in fragment[2]:
+        if column_index - 1 > len(fields):
+            fields.extend([""] * (column_index - 1 - len(fields)))
+        fields.append(_cell_text(value, formats.get(chain)))
+    return fields
+
+
+def _placement_height(placement: _Placement) -> int:
+    item = placement.item
+    if isinstance(item, TableNode):
+        return _table_size(item).height
+    if isinstance(item, ColumnNode):
+        return len(item.cells)
+    if isinstance(item, SpacerNode):
+        return item.rows
+    return 1
+
+
+def _stacked(placements: list[_Placement]) -> bool:
+    """True when no two placements share a row (no side-by-side items)."""
+    end = 0
+    for placement in placements:
+        # Placements arrive in layout order, so any step back means overlap.
+        if placement.row < end:
+            return False
+        end = placement.row + _placement_height(placement)
+    return True
+
+
+def _records_rows(
+    node: TableNode, start_row: int, start_col: int, formats: _Formats
+) -> Iterator[Iterable[Any]]:
+    """Fast path for bulk table bodies: one formatter per column, no fragments.
+
+    Ends with the footer row, if the table has one.
+    """
+    chains = _table_chains(node)
+    width = max(map(len, node.records), default=0)
+    if node.source is not None:
+        width = max(width, node.source.width)
+    totals = _table_totals(node)
+    records: Iterable[Sequence[Any]] = _table_records(node, start_row)
+    if totals is not None:
+        records = totals.feed(records)
+    # Stripes only add a fill, so both bands share each column's formatter.
+    # Past the styled columns every column resolves alike, which covers
+    # streamed rows wider than announced.
+    column_formats = [
+        formats.get((*chains.leading, *_column_style(node, offset), *chains.trailing))
+        for offset in range(max(width, len(node.column_styles)))
+    ]
+    default = formats.get((*chains.leading, *chains.trailing))
+    padding = [""] * (start_col - 1)
+    if not any(column_formats) and default is None and not padding:
+        # Records pass straight to the writer unless a batch holds a value
+        # whose text needs adjusting; the type scan runs at C speed.
+        for batch in batched(records, _CSV_BATCH_ROWS):
+            if _PLAIN.issuperset(map(type, itertools.chain.from_iterable(batch))):
+                yield from batch
+            else:
+                for record in batch:
+                    yield [_cell_text(value, None) for value in record]
+    else:
+        for record in records:
+            if len(record) > len(column_formats):
+                column_formats.extend([default] * (len(record) - len(column_formats)))
+            yield padding + [
+                _cell_text(value, column_formats[offset])
+                for offset, value in enumerate(record)
+            ]
+    if totals is not None:
+        row_index = start_row + totals.rows - len(node.rows)
+        footer = _footer_row(node, chains, totals, row_index, start_col, width)
+        yield _fragment_fields(footer, formats)
+
+
+def _sheet_rows(node: SheetNode) -> Iterator[Iterable[Any]]:
+    formats = _Formats()
+    placements = _sheet_placements(node)
+    next_row = 1
+
+    def fragments(stream: Iterable[_RowFragment]) -> Iterator[Iterable[Any]]:
+        nonlocal next_row
+        for fragment in stream:
+            # Gaps between items become empty lines.
+            while next_row < fragment[0]:
+                yield ()
+                next_row += 1
+            yield _fragment_fields(fragment, formats)
+            next_row = fragment[0] + 1
+
+    if not _stacked(placements):
+        yield from fragments(_iter_rows(placements))
+        return
+    for placement in placements:
+        item = placement.item
+        if (
+            isinstance(item, TableNode)
+            and (item.records or item.source is not None)
+            # Subtotal rows may format numbers differently from the body.
+            and item.outline is None
+        ):
+            head = replace(item, records=(), source=None, footer=None)
+            yield from fragments(_placement_rows(replace(placement, item=head)))
+            while next_row < placement.row + _table_size(head).height:
+                yield ()
+                next_row += 1
+            yield from _records_rows(item, next_row, placement.col, formats)
+            next_row += len(item.records) + (item.footer is not None)
+        else:
+            yield from fragments(_placement_rows(placement))
+
+
+def _check_dialect(dialect: str) -> None:
+    if dialect not in ("csv", "tsv"):
+        msg = f"Unknown CSV dialect '{dialect}'"
+        raise ValueError(msg)
+
+
+def write_sheet_csv(
+    node: SheetNode, stream: TextIO, *, dialect: CsvDialect = "csv"
+) -> int:
+    """Write the values of one sheet's layout to `stream`; returns lines written.
+
+    Styles and sizing are skipped; only `number_format` is consulted, to render
+    numbers and dates the way the cell would display them.
+    """
+    import csv
+
+    _check_dialect(dialect)
+    writer = csv.writer(
+        stream,
+        dialect="excel-tab" if dialect == "tsv" else "excel",
+        lineterminator="\n",
+    )
+    lines = 0
+    for batch in batched(_sheet_rows(node), _CSV_BATCH_ROWS):
+        writer.writerows(batch)
+        lines += len(batch)
+    return lines
+
+
+def save_csv(
+    sheets: Iterable[SheetNode | SheetFactoryNode],
+    directory: str | Path,
+    *,
+    dialect: CsvDialect = "csv",
+    encoding: str = "utf-8",
+) -> list[Path]:
+    """Write one `<sheet title>.csv` (or `.tsv`) file per sheet into `directory`."""
+    from pathlib import Path
+
+    from ._xlsx import _unique_titles
+
+    _check_dialect(dialect)
+    entries = list(sheets)
+    titles = _unique_titles(entry.name for entry in entries)
+    folder = Path(directory)
+    folder.mkdir(parents=True, exist_ok=True)
+    written: list[Path] = []
+    for entry, title in zip(entries, titles):
+        target = folder / f"{title}.{dialect}"
+        with open(target, "w", encoding=encoding, newline="") as stream:
+            write_sheet_csv(build_sheet(entry), stream, dialect=dialect)
+        written.append(target)
+    return written
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import sys
+from collections.abc import Iterator, Sequence
+from typing import Any
+
+from .styles import Style
+
+__all__ = ["CURSOR_BATCH_ROWS", "CursorSource"]
+
+# Rows per `fetchmany` call when the cursor keeps the DB-API default
+# `arraysize` of 1, which would mean one round trip per row.
+CURSOR_BATCH_ROWS = 1000
+
+
+def _numeric_scale(cursor: Any, type_code: Any, scale: Any) -> int | None:
+    """Decimal places of a fixed-point column, if the driver reports them."""
+    if not isinstance(scale, int) or isinstance(scale, bool) or scale <= 0:
+        return None
+    if isinstance(type_code, type):
+        from decimal import Decimal
+
+        return scale if issubclass(type_code, (Decimal, float)) else None
+    # DB-API type objects compare equal to every matching type code.
+    module = sys.modules.get(type(cursor).__module__.partition(".")[0])
+    number = getattr(module, "NUMBER", None)
+    if number is not None and type_code is not None and type_code == number:
+        return scale
+    return None
+
+
+class CursorSource:
+    """Body rows of a DB-API 2.0 cursor, fetched in batches while rendering.
+
+    Only one batch is held at a time. A cursor can be read once, so a table
+    built on it can be rendered once.
+    """
+
+    __slots__ = ("_cursor", "_batch_size", "_consumed", "headers", "column_styles")
+
+    def __init__(self, cursor: Any, *, batch_size: int | None = None) -> None:
+        description = cursor.description
+        if description is None:
+            msg = "Cursor has no result set; execute a query before building the table"
+            raise ValueError(msg)
+        if batch_size is None:
+            arraysize = getattr(cursor, "arraysize", 1)
+            batch_size = arraysize if arraysize > 1 else CURSOR_BATCH_ROWS
+        if batch_size < 1:
+            msg = "Cursor batch size must be >= 1"
+            raise ValueError(msg)
+        self._cursor = cursor
+        self._batch_size = batch_size
+        self._consumed = False
+        self.headers: tuple[str, ...] = tuple(column[0] for column in description)
+        styles: list[tuple[Style, ...]] = []
+        for column in description:
+            scale = _numeric_scale(cursor, column[1], column[5])
+            styles.append(
+                (Style(number_format="0." + "0" * scale),) if scale is not None else ()
+            )
+        self.column_styles: tuple[tuple[Style, ...], ...] = tuple(styles)
+
+    @property
+    def width(self) -> int:
+        return len(self.headers)
+
+    def rows(self) -> Iterator[Sequence[Any]]:
+        if self._consumed:
+            msg = (
+                "Cursor rows were already rendered; run the query again to render twice"
+            )
+            raise ValueError(msg)
+        self._consumed = True
+        fetchmany = self._cursor.fetchmany
+        while True:
+            batch = fetchmany(self._batch_size)
+            if not batch:
+                return
+            yield from batch
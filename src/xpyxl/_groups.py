@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from operator import itemgetter
+from typing import Any
+
+from ._layout import _Totals
+from .nodes import Aggregate, TableFooter
+
+__all__ = ["MAX_GROUP_KEYS", "group_records"]
+
+# Excel shows eight outline levels: the grand total sits on level 0, each
+# group key adds one, and detail rows go one below the last key.
+MAX_GROUP_KEYS = 6
+
+
+def group_records(
+    records: Sequence[tuple[Any, ...]],
+    *,
+    by: tuple[int, ...],
+    aggregates: tuple[Aggregate | None, ...],
+    width: int,
+    label: str,
+    grand_total: str | None,
+) -> tuple[tuple[tuple[Any, ...], ...], bytes]:
+    """Rows of `records` grouped on the `by` columns, each group followed by its
+    subtotal row, plus the outline level of every output row.
+
+    Records are bucketed by key in one hashing pass and each bucket is
+    aggregated in one step; outer subtotals merge their groups' aggregates
+    instead of revisiting rows. Groups keep the order they first appear in.
+    """
+    key_of = itemgetter(*by)
+    buckets: dict[Any, list[tuple[Any, ...]]] = {}
+    try:
+        for record in records:
+            key = key_of(record)
+            bucket = buckets.get(key)
+            if bucket is None:
+                buckets[key] = [record]
+            else:
+                bucket.append(record)
+    except IndexError:
+        msg = "Grouped rows must include every `by` column"
+        raise ValueError(msg) from None
+
+    depth = len(by)
+    tree: dict[Any, Any] = {}
+    for key, bucket in buckets.items():
+        parts = key if depth > 1 else (key,)
+        node = tree
+        for part in parts[:-1]:
+            node = node.setdefault(part, {})
+        node[parts[-1]] = bucket
+
+    footer = TableFooter(aggregates)
+    aggregated = [offset for offset, aggregate in enumerate(aggregates) if aggregate]
+    rows: list[tuple[Any, ...]] = []
+    levels = bytearray()
+    detail = bytes((depth + 1,))
+
+    def subtotal_row(column: int, text: str, totals: _Totals) -> tuple[Any, ...]:
+        cells: list[Any] = [None] * width
+        for offset in aggregated:
+            cells[offset] = totals.result(offset)
+        cells[column] = text
+        return tuple(cells)
+
+    def emit(node: dict[Any, Any], level: int) -> _Totals:
+        totals = _Totals(footer)
+        for part, child in node.items():
+            if level + 1 == depth:
+                group = _Totals(footer)
+                group.add(child)
+                rows.extend(child)
+                levels.extend(detail * len(child))
+            else:
+                group = emit(child, level + 1)
+            rows.append(subtotal_row(by[level], label.format(part), group))
+            levels.append(level + 1)
+            totals.merge(group)
+        return totals
+
+    totals = emit(tree, 0)
+    if grand_total is not None:
+        rows.append(subtotal_row(by[0], grand_total, totals))
+        levels.append(0)
+    return tuple(rows), bytes(levels)
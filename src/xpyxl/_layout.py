@@ -0,0 +1,852 @@
+from __future__ import annotations
+
+import heapq
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from itertools import batched
+from typing import Any, assert_never
+
+from ._convert import convert_value
+from .nodes import (
+    CellNode,
+    ColumnNode,
+    HorizontalStackNode,
+    RenderableItem,
+    RowNode,
+    SheetComponent,
+    SheetFactoryNode,
+    SheetNode,
+    SpacerNode,
+    TableFooter,
+    TableNode,
+    VerticalStackNode,
+)
+from .styles import (
+    BorderStyleName,
+    Style,
+    bold,
+    combine_styles,
+    normalize_hex,
+)
+
+# Backend-independent layout and style resolution. Kept free of openpyxl so that
+# building and streaming workbooks never imports it.
+
+DEFAULT_FONT_NAME = "Calibri"
+DEFAULT_FONT_SIZE = 11.0
+DEFAULT_MONO_FONT = "Consolas"
+DEFAULT_TEXT_COLOR = normalize_hex("#111827")
+DEFAULT_BORDER_COLOR = normalize_hex("#D0D5DD")
+DEFAULT_BORDER_STYLE: BorderStyleName = "thin"
+DEFAULT_ROW_HEIGHT = 16.0
+DEFAULT_TABLE_HEADER_BG = normalize_hex("#F2F4F7")
+DEFAULT_TABLE_HEADER_TEXT = normalize_hex("#1E293B")
+DEFAULT_TABLE_STRIPE_COLOR = normalize_hex("#F8FAFC")
+DEFAULT_TABLE_COMPACT_HEIGHT = 18.0
+MIN_COLUMN_WIDTH = 8.0
+# Excel's hard sheet limits.
+MAX_ROWS = 1_048_576
+MAX_COLUMNS = 16_384
+MAX_TITLE_LENGTH = 31
+
+# Body rows folded into footer aggregates per step.
+_TOTALS_BATCH_ROWS = 1024
+
+
+@dataclass(frozen=True)
+class EffectiveStyle:
+    font_name: str
+    font_size: float
+    bold: bool
+    italic: bool
+    text_color: str
+    fill_color: str | None
+    horizontal_align: str | None
+    vertical_align: str | None
+    indent: int | None
+    wrap_text: bool
+    number_format: str | None
+    border: BorderStyleName | None
+    border_color: str | None
+
+
+@dataclass(frozen=True)
+class _Size:
+    width: int
+    height: int
+
+
+@dataclass(frozen=True)
+class _Placement:
+    row: int
+    col: int
+    item: RenderableItem
+
+
+# A cell entry in the row stream: (column index, value, style chain).
+_CellEntry = tuple[int, Any, tuple[Style, ...]]
+# A row fragment: (row index, row height, cells in ascending column order,
+# outline level).
+_RowFragment = tuple[int, float, list[_CellEntry], int]
+
+
+def _resolve(styles: Sequence[Style]) -> EffectiveStyle:
+    base_style = Style(
+        font_name=DEFAULT_FONT_NAME,
+        font_size=DEFAULT_FONT_SIZE,
+        text_color=DEFAULT_TEXT_COLOR,
+    )
+    merged = combine_styles(styles, base=base_style)
+
+    font_name = merged.font_name or DEFAULT_FONT_NAME
+    if merged.mono:
+        font_name = DEFAULT_MONO_FONT
+    font_size = merged.font_size if merged.font_size is not None else DEFAULT_FONT_SIZE
+    if merged.font_size_delta is not None:
+        font_size += merged.font_size_delta
+
+    bold_flag = merged.bold if merged.bold is not None else False
+    italic_flag = merged.italic if merged.italic is not None else False
+
+    text_color = normalize_hex(merged.text_color or DEFAULT_TEXT_COLOR)
+    fill_color = normalize_hex(merged.fill_color) if merged.fill_color else None
+    border_color = normalize_hex(merged.border_color) if merged.border_color else None
+
+    return EffectiveStyle(
+        font_name=font_name,
+        font_size=font_size,
+        bold=bold_flag,
+        italic=italic_flag,
+        text_color=text_color,
+        fill_color=fill_color,
+        horizontal_align=merged.horizontal_align,
+        vertical_align=merged.vertical_align,
+        indent=merged.indent,
+        wrap_text=merged.wrap_text if merged.wrap_text is not None else False,
+        number_format=merged.number_format,
+        border=merged.border,
+        border_color=border_color,
+    )
+
+
+@lru_cache(maxsize=4096)
+def _resolve_chain(chain: tuple[Style, ...]) -> EffectiveStyle:
+    return _resolve(chain)
+
+
+def _default_row_height() -> float:
+    return DEFAULT_ROW_HEIGHT
+
+
+def _table_size(node: TableNode) -> _Size:
+    width = 0
+    height = 0
+    if node.header:
+        width = max(width, len(node.header.cells))
+        height += 1
+    for row in node.rows:
+        width = max(width, len(row.cells))
+        height += 1
+    if node.records:
+        width = max(width, max(map(len, node.records)))
+        height += len(node.records)
+    if node.source is not None:
+        # Streamed rows are not counted; they run on past the end of the sheet.
+        width = max(width, node.source.width)
+    if node.footer is not None:
+        width = max(width, len(node.footer.aggregates))
+        height += 1
+    return _Size(width=width, height=height)
+
+
+def _layout_item(
+    item: SheetComponent, start_row: int, start_col: int
+) -> tuple[list[_Placement], _Size]:
+    if isinstance(item, CellNode):
+        size = _Size(width=1, height=1)
+        return ([_Placement(row=start_row, col=start_col, item=item)], size)
+    elif isinstance(item, RowNode):
+        size = _Size(width=len(item.cells), height=1)
+        return ([_Placement(row=start_row, col=start_col, item=item)], size)
+    elif isinstance(item, ColumnNode):
+        size = _Size(width=1, height=len(item.cells))
+        return ([_Placement(row=start_row, col=start_col, item=item)], size)
+    elif isinstance(item, TableNode):
+        size = _table_size(item)
+        return ([_Placement(row=start_row, col=start_col, item=item)], size)
+    elif isinstance(item, SpacerNode):
+        size = _Size(width=0, height=item.rows)
+        return ([_Placement(row=start_row, col=start_col, item=item)], size)
+    elif isinstance(item, VerticalStackNode):
+        placements: list[_Placement] = []  # pyright: ignore[reportRedeclaration]
+        row_cursor = start_row
+        max_width = 0
+        for idx, child in enumerate(item.items):
+            child_placements, child_size = _layout_item(child, row_cursor, start_col)
+            placements.extend(child_placements)
+            row_cursor += child_size.height
+            if idx < len(item.items) - 1:
+                row_cursor += item.gap
+            max_width = max(max_width, child_size.width)
+        height = row_cursor - start_row
+        return placements, _Size(width=max_width, height=height)
+    elif isinstance(item, HorizontalStackNode):
+        placements: list[_Placement] = []
+        col_cursor = start_col
+        max_height = 0
+        for idx, child in enumerate(item.items):
+            child_placements, child_size = _layout_item(child, start_row, col_cursor)
+            placements.extend(child_placements)
+            col_cursor += child_size.width
+            if idx < len(item.items) - 1:
+                col_cursor += item.gap
+            max_height = max(max_height, child_size.height)
+        width = col_cursor - start_col
+        return placements, _Size(width=width, height=max_height)
+    else:
+        assert_never(item)
+
+
+@dataclass(frozen=True)
+class _TableChains:
+    """Style chain segments shared by every cell of a table."""
+
+    leading: tuple[Style, ...]
+    header: tuple[Style, ...]
+    footer: tuple[Style, ...]
+    subtotal: tuple[Style, ...]
+    stripe: tuple[Style, ...]
+    trailing: tuple[Style, ...]
+    height: float
+
+
+def _table_chains(node: TableNode) -> _TableChains:
+    table_style = combine_styles(node.styles)
+    banded = table_style.table_banded if table_style.table_banded is not None else True
+    bordered = (
+        table_style.table_bordered if table_style.table_bordered is not None else True
+    )
+    compact = (
+        table_style.table_compact if table_style.table_compact is not None else False
+    )
+    border_color = (
+        table_style.border_color
+        if table_style.border_color is not None
+        else DEFAULT_BORDER_COLOR
+    )
+    border_style = (
+        table_style.border if table_style.border is not None else DEFAULT_BORDER_STYLE
+    )
+
+    # `_render_table` passes the table border colour as the fallback for cells
+    # that set a border without a colour; leading the chain with it is equivalent.
+    leading = node.styles
+    if not bordered and border_color != DEFAULT_BORDER_COLOR:
+        leading = (Style(border_color=border_color), *node.styles)
+    return _TableChains(
+        leading=leading,
+        header=(
+            bold,
+            Style(fill_color=DEFAULT_TABLE_HEADER_BG),
+            Style(text_color=DEFAULT_TABLE_HEADER_TEXT),
+        ),
+        footer=(bold, Style(fill_color=DEFAULT_TABLE_HEADER_BG)),
+        subtotal=(bold,),
+        stripe=(Style(fill_color=DEFAULT_TABLE_STRIPE_COLOR),) if banded else (),
+        trailing=(
+            (Style(border=border_style, border_color=border_color),) if bordered else ()
+        ),
+        height=DEFAULT_TABLE_COMPACT_HEIGHT if compact else DEFAULT_ROW_HEIGHT,
+    )
+
+
+def _column_style(node: TableNode, offset: int) -> tuple[Style, ...]:
+    if offset < len(node.column_styles):
+        return node.column_styles[offset]
+    return ()
+
+
+def _column_letter(index: int) -> str:
+    letters = ""
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+class _Formula:
+    """A formula cell (text without the leading "=") and its cached value."""
+
+    __slots__ = ("text", "value")
+
+    def __init__(self, text: str, value: Any) -> None:
+        self.text = text
+        self.value = value
+
+
+_FOOTER_FUNCTIONS = {
+    "sum": "SUM",
+    "mean": "AVERAGE",
+    "min": "MIN",
+    "max": "MAX",
+    "count": "COUNT",
+}
+
+# Footer aggregates take these as they are and skip the ignored types; any
+# other value is converted first and counts if it comes out as a number.
+_NUMBER_TYPES = frozenset({int, float})
+_IGNORED_TYPES = frozenset({str, bool, type(None)})
+
+
+def _numbers(values: list[Any]) -> list[Any]:
+    numbers = [value for value in values if type(value) in _NUMBER_TYPES]
+    if len(numbers) == len(values):
+        return numbers
+    from decimal import Decimal
+
+    for value in values:
+        kind = type(value)
+        if kind in _NUMBER_TYPES or kind in _IGNORED_TYPES:
+            continue
+        value, _ = convert_value(value)
+        if isinstance(value, Decimal):
+            numbers.append(float(value))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            numbers.append(value)
+    return numbers
+
+
+class _Totals:
+    """Footer aggregates of one table, folded in a batch of body rows at a time
+    while the body is written, so the rows are only walked once."""
+
+    __slots__ = ("footer", "rows", "_columns", "_counts", "_values")
+
+    def __init__(self, footer: TableFooter) -> None:
+        self.footer = footer
+        self.rows = 0
+        self._columns = [
+            (offset, aggregate)
+            for offset, aggregate in enumerate(footer.aggregates)
+            if aggregate is not None
+        ]
+        self._counts = dict.fromkeys(range(len(footer.aggregates)), 0)
+        self._values: dict[int, Any] = {
+            offset: 0 if aggregate in ("sum", "mean") else None
+            for offset, aggregate in self._columns
+        }
+
+    def _fold(self, offset: int, aggregate: str, count: int, value: Any) -> None:
+        self._counts[offset] += count
+        current = self._values[offset]
+        if aggregate in ("sum", "mean"):
+            self._values[offset] = current + value
+        elif aggregate == "min":
+            self._values[offset] = value if current is None else min(current, value)
+        elif aggregate == "max":
+            self._values[offset] = value if current is None else max(current, value)
+
+    def add(self, batch: Sequence[Sequence[Any]]) -> None:
+        self.rows += len(batch)
+        for offset, aggregate in self._columns:
+            numbers = _numbers(
+                [record[offset] for record in batch if len(record) > offset]
+            )
+            if not numbers:
+                continue
+            value = None
+            if aggregate in ("sum", "mean"):
+                value = sum(numbers)
+            elif aggregate == "min":
+                value = min(numbers)
+            elif aggregate == "max":
+                value = max(numbers)
+            self._fold(offset, aggregate, len(numbers), value)
+
+    def merge(self, other: _Totals) -> None:
+        """Fold in the aggregates of another accumulator over the same columns."""
+        self.rows += other.rows
+        for offset, aggregate in self._columns:
+            count = other._counts[offset]
+            if count:
+                self._fold(offset, aggregate, count, other._values[offset])
+
+    def feed(self, rows: Iterable[Sequence[Any]]) -> Iterator[Sequence[Any]]:
+        """Pass `rows` through, folding each batch in before it is yielded."""
+        for batch in batched(rows, _TOTALS_BATCH_ROWS):
+            self.add(batch)
+            yield from batch
+
+    def result(self, offset: int) -> Any:
+        aggregate = self.footer.aggregates[offset]
+        count = self._counts[offset]
+        if aggregate == "count":
+            return count
+        if aggregate == "mean":
+            return self._values[offset] / count if count else None
+        return self._values.get(offset)
+
+    def values(self, first_row: int, start_col: int, width: int) -> list[Any]:
+        """Footer cell values, `width` wide, for a body from sheet row `first_row`."""
+        footer = self.footer
+        cells: list[Any] = [None] * max(width, len(footer.aggregates))
+        if footer.label is not None and cells:
+            cells[0] = footer.label
+        last_row = first_row + self.rows - 1
+        for offset, aggregate in self._columns:
+            value = self.result(offset)
+            if footer.formulas and self.rows:
+                letter = _column_letter(start_col + offset)
+                value = _Formula(
+                    f"{_FOOTER_FUNCTIONS[aggregate]}"
+                    f"({letter}{first_row}:{letter}{last_row})",
+                    value,
+                )
+            cells[offset] = value
+        return cells
+
+
+def _table_totals(node: TableNode) -> _Totals | None:
+    """Footer accumulator for `node`, already holding its styled body rows."""
+    if node.footer is None:
+        return None
+    totals = _Totals(node.footer)
+    if node.rows:
+        totals.add([[cell.value for cell in row.cells] for row in node.rows])
+    return totals
+
+
+def _footer_row(
+    node: TableNode,
+    chains: _TableChains,
+    totals: _Totals,
+    row_index: int,
+    start_col: int,
+    width: int,
+) -> _RowFragment:
+    """The footer fragment at `row_index`, right below the last body row."""
+    assert node.footer is not None
+    # `width` covers the records; the footer spans the header and rows too.
+    for row_node in (node.header, *node.rows):
+        if row_node is not None:
+            width = max(width, len(row_node.cells))
+    values = totals.values(row_index - totals.rows, start_col, width)
+    return (
+        row_index,
+        chains.height,
+        [
+            (
+                start_col + offset,
+                value,
+                (
+                    *chains.leading,
+                    *chains.footer,
+                    *_column_style(node, offset),
+                    *node.footer.styles,
+                    *chains.trailing,
+                ),
+            )
+            for offset, value in enumerate(values)
+        ],
+        0,
+    )
+
+
+def _table_records(node: TableNode, first_row: int) -> Iterator[Sequence[Any]]:
+    """Bare value rows of `node` from sheet row `first_row` on: the stored
+    records, then any streamed from its row source.
+
+    Streamed rows are only counted as they arrive, so the row limit is
+    enforced here rather than by `_limit_violations`.
+    """
+    yield from node.records
+    if node.source is None:
+        return
+    room = MAX_ROWS - first_row + 1 - len(node.records)
+    if node.footer is not None:
+        room -= 1
+    for count, record in enumerate(node.source.rows(), start=1):
+        if count > room:
+            msg = (
+                f"Streamed rows run past Excel's last row ({MAX_ROWS:,}); "
+                "limit the query or split it across sheets"
+            )
+            raise ValueError(msg)
+        yield record
+
+
+def _table_rows(
+    node: TableNode, start_row: int, start_col: int
+) -> Iterator[_RowFragment]:
+    chains = _table_chains(node)
+
+    def cells(
+        row_node: RowNode, extra: tuple[Style, ...], *, body: bool = True
+    ) -> list[_CellEntry]:
+        prefix = (*chains.leading, *row_node.styles, *extra)
+        return [
+            (
+                start_col + offset,
+                cell_node.value,
+                (
+                    *prefix,
+                    *(_column_style(node, offset) if body else ()),
+                    *cell_node.styles,
+                    *chains.trailing,
+                ),
+            )
+            for offset, cell_node in enumerate(row_node.cells)
+        ]
+
+    totals = _table_totals(node)
+    row_index = start_row
+    if node.header:
+        header_cells = cells(node.header, chains.header, body=False)
+        yield row_index, chains.height, header_cells, 0
+        row_index += 1
+    for idx, row_node in enumerate(node.rows):
+        extra = chains.stripe if idx % 2 == 1 else ()
+        yield row_index, chains.height, cells(row_node, extra), 0
+        row_index += 1
+
+    # Records carry bare values, so each column of a band shares one chain.
+    width = max(map(len, node.records), default=0)
+    if node.source is not None:
+        width = max(width, node.source.width)
+
+    def band_chain(offset: int, stripe: tuple[Style, ...]) -> tuple[Style, ...]:
+        return (
+            *chains.leading,
+            *stripe,
+            *_column_style(node, offset),
+            *chains.trailing,
+        )
+
+    plain = [band_chain(offset, ()) for offset in range(width)]
+    striped = [band_chain(offset, chains.stripe) for offset in range(width)]
+    outline = node.outline
+    if outline is not None:
+        subtotal = [
+            band_chain(offset, (*chains.subtotal, *outline.styles))
+            for offset in range(width)
+        ]
+        total = [
+            band_chain(offset, (*chains.footer, *outline.styles))
+            for offset in range(width)
+        ]
+    records: Iterable[Sequence[Any]] = _table_records(node, row_index)
+    if totals is not None:
+        records = totals.feed(records)
+    level = 0
+    for idx, record in enumerate(records, start=len(node.rows)):
+        if len(record) > width:
+            # Streamed rows may be wider than anything known up front.
+            plain.extend(band_chain(offset, ()) for offset in range(width, len(record)))
+            striped.extend(
+                band_chain(offset, chains.stripe)
+                for offset in range(width, len(record))
+            )
+            width = len(record)
+        band = striped if idx % 2 == 1 else plain
+        if outline is not None:
+            level = outline.levels[idx - len(node.rows)]
+            if level < outline.detail:
+                band = total if level == 0 else subtotal
+        yield (
+            row_index,
+            chains.height,
+            [
+                (start_col + offset, value, band[offset])
+                for offset, value in enumerate(record)
+            ],
+            level,
+        )
+        row_index += 1
+    if totals is not None:
+        yield _footer_row(node, chains, totals, row_index, start_col, width)
+
+
+def _column_width_hints(placements: Sequence[_Placement]) -> dict[int, float]:
+    """Fixed widths requested by tables, keyed by sheet column index."""
+    hints: dict[int, float] = {}
+    for placement in placements:
+        target = placement.item
+        if not isinstance(target, TableNode):
+            continue
+        for offset, width in enumerate(target.column_widths):
+            if width is not None:
+                column_index = placement.col + offset
+                hints[column_index] = max(hints.get(column_index, 0.0), width)
+    return hints
+
+
+def _placement_rows(placement: _Placement) -> Iterator[_RowFragment]:
+    target = placement.item
+    if isinstance(target, CellNode):
+        yield (
+            placement.row,
+            DEFAULT_ROW_HEIGHT,
+            [(placement.col, target.value, target.styles)],
+            0,
+        )
+    elif isinstance(target, RowNode):
+        yield (
+            placement.row,
+            DEFAULT_ROW_HEIGHT,
+            [
+                (
+                    placement.col + offset,
+                    cell_node.value,
+                    (*target.styles, *cell_node.styles),
+                )
+                for offset, cell_node in enumerate(target.cells)
+            ],
+            0,
+        )
+    elif isinstance(target, ColumnNode):
+        for offset, cell_node in enumerate(target.cells):
+            yield (
+                placement.row + offset,
+                DEFAULT_ROW_HEIGHT,
+                [(placement.col, cell_node.value, (*target.styles, *cell_node.styles))],
+                0,
+            )
+    elif isinstance(target, TableNode):
+        yield from _table_rows(target, placement.row, placement.col)
+    elif isinstance(target, SpacerNode):
+        height = target.height if target.height is not None else _default_row_height()
+        for offset in range(target.rows):
+            yield placement.row + offset, height, [], 0
+    else:
+        assert_never(target)
+
+
+def _sheet_placements(node: SheetNode) -> list[_Placement]:
+    placements: list[_Placement] = []
+    row_cursor = 1
+    for item in node.items:
+        item_placements, size = _layout_item(item, row_cursor, 1)
+        placements.extend(item_placements)
+        row_cursor += size.height
+    return placements
+
+
+@dataclass(frozen=True)
+class _TableMarks:
+    """Sheet rows that `append_rows` needs to know about, from the layout."""
+
+    # Inclusive (first, last) body rows of each table with a body.
+    bodies: tuple[tuple[int, int], ...]
+    footers: tuple[int, ...]
+
+
+def _table_marks(placements: Sequence[_Placement], last_row: int) -> _TableMarks:
+    """Body and footer rows of the sheet's tables, given its last written row.
+
+    A streamed table is the last item of its sheet, so its body runs to that
+    row, or to the row above when it has a footer there.
+    """
+    bodies = []
+    footers = []
+    for placement in placements:
+        item = placement.item
+        if not isinstance(item, TableNode):
+            continue
+        first = placement.row + (1 if item.header else 0)
+        if item.source is not None:
+            end = last_row
+        else:
+            end = placement.row + _table_size(item).height - 1
+        if item.footer is not None:
+            footers.append(end)
+            end -= 1
+        if first <= end:
+            bodies.append((first, end))
+    return _TableMarks(bodies=tuple(sorted(bodies)), footers=tuple(sorted(footers)))
+
+
+def _streams_rows(node: SheetNode) -> bool:
+    """Whether a table on the sheet pulls rows from a source while rendering.
+
+    Sources such as DB-API cursors and async pumps are tied to the thread
+    that created them, so these sheets are never handed to a worker thread.
+    """
+    return any(
+        isinstance(placement.item, TableNode) and placement.item.source is not None
+        for placement in _sheet_placements(node)
+    )
+
+
+def _table_slice(node: TableNode, start: int, stop: int) -> TableNode:
+    """Body rows `start:stop` of `node` (rows first, then records), same header."""
+    split = len(node.rows)
+    first, last = max(start - split, 0), max(stop - split, 0)
+    outline = node.outline
+    if outline is not None:
+        outline = replace(outline, levels=outline.levels[first:last])
+    return replace(
+        node,
+        rows=node.rows[start:stop],
+        records=node.records[first:last],
+        outline=outline,
+    )
+
+
+def _suffixed_title(name: str, suffix: str) -> str:
+    """`name` + `suffix`, cutting `name` so the result fits Excel's limit."""
+    return name[: MAX_TITLE_LENGTH - len(suffix)] + suffix
+
+
+def _spill_sheet(node: SheetNode) -> list[SheetNode]:
+    """Continue the first top-level `overflow="spill"` table that runs past the
+    last row on sheets named "<name> (2)", "<name> (3)", ... (with `name`
+    shortened as needed to keep titles within 31 characters).
+
+    Every continuation repeats the header, and chunks hold an even number of
+    body rows so banding keeps its parity. Items after the table move to the
+    last continuation sheet.
+    """
+    row_cursor = 1
+    for position, item in enumerate(node.items):
+        _, size = _layout_item(item, row_cursor, 1)
+        if (
+            isinstance(item, TableNode)
+            and item.overflow == "spill"
+            and row_cursor + size.height - 1 > MAX_ROWS
+        ):
+            header_rows = 1 if item.header else 0
+            body = len(item.rows) + len(item.records)
+            first = MAX_ROWS - row_cursor + 1 - header_rows
+            first -= first % 2
+            capacity = MAX_ROWS - header_rows
+            capacity -= capacity % 2
+            head_items = node.items[:position]
+            if first > 0:
+                head_items += (_table_slice(item, 0, first),)
+            sheets = [replace(node, items=head_items)]
+            for start in range(max(first, 0), body, capacity):
+                chunk = _table_slice(item, start, start + capacity)
+                title = _suffixed_title(node.name, f" ({len(sheets) + 1})")
+                sheets.append(SheetNode(name=title, items=(chunk,)))
+            last = sheets[-1]
+            sheets[-1] = replace(last, items=last.items + node.items[position + 1 :])
+            return sheets
+        row_cursor += size.height
+    return [node]
+
+
+def _limit_violations(node: SheetNode) -> list[str]:
+    row_cursor = 1
+    width = 0
+    for item in node.items:
+        _, size = _layout_item(item, row_cursor, 1)
+        row_cursor += size.height
+        width = max(width, size.width)
+    violations: list[str] = []
+    if row_cursor - 1 > MAX_ROWS:
+        violations.append(
+            f"Sheet '{node.name}' needs {row_cursor - 1:,} rows but Excel allows "
+            f'{MAX_ROWS:,}; use x.table(overflow="spill") to continue on new sheets'
+        )
+    if width > MAX_COLUMNS:
+        violations.append(
+            f"Sheet '{node.name}' needs {width:,} columns but Excel allows "
+            f"{MAX_COLUMNS:,}"
+        )
+    placements = _sheet_placements(node)
+    for placement in placements:
+        item = placement.item
+        if not isinstance(item, TableNode) or item.source is None:
+            continue
+        end = placement.row + _table_size(item).height
+        if any(other.row >= end for other in placements):
+            violations.append(
+                f"Sheet '{node.name}' places items below a streamed table; "
+                "it must be the last item of its sheet"
+            )
+    return violations
+
+
+def _plan_sheets(
+    sheets: Iterable[SheetNode | SheetFactoryNode],
+) -> list[SheetNode | SheetFactoryNode]:
+    """Spill oversized tables and report every limit violation up front.
+
+    Raises ValueError listing all offending sheets before anything is rendered.
+    Sheet factories pass through unchanged; see `_plan_lazy_sheet`.
+    """
+    planned: list[SheetNode | SheetFactoryNode] = []
+    violations: list[str] = []
+    for sheet in sheets:
+        if isinstance(sheet, SheetFactoryNode):
+            planned.append(sheet)
+            continue
+        for part in _spill_sheet(sheet):
+            planned.append(part)
+            violations.extend(_limit_violations(part))
+    if violations:
+        raise ValueError("\n".join(violations))
+    return planned
+
+
+def _plan_lazy_sheet(sheet: SheetNode) -> SheetNode:
+    """Limit check for a sheet built by a factory during rendering.
+
+    Sheet titles are fixed by then, so a lazy sheet cannot spill.
+    """
+    if len(_spill_sheet(sheet)) > 1:
+        msg = (
+            f"Table on lazy sheet '{sheet.name}' needs to spill past {MAX_ROWS:,} "
+            "rows; build that sheet eagerly so its continuation sheets can be "
+            "planned"
+        )
+        raise ValueError(msg)
+    violations = _limit_violations(sheet)
+    if violations:
+        raise ValueError("\n".join(violations))
+    return sheet
+
+
+def _iter_rows(placements: Sequence[_Placement]) -> Iterator[_RowFragment]:
+    """Stream placements as rows in ascending order, merging side-by-side items.
+
+    The tallest contribution to a row wins, and so does the deepest outline
+    level. Both the native writer and `render_sheet` consume this stream.
+    """
+    streams = [_placement_rows(placement) for placement in placements]
+    pending: _RowFragment | None = None
+    for fragment in heapq.merge(*streams, key=lambda fragment: fragment[0]):
+        if pending is None:
+            pending = fragment
+        elif pending[0] == fragment[0]:
+            cells = pending[2] + fragment[2]
+            if fragment[2] and pending[2] and fragment[2][0][0] < pending[2][-1][0]:
+                cells.sort(key=lambda entry: entry[0])
+            pending = (
+                pending[0],
+                max(pending[1], fragment[1]),
+                cells,
+                max(pending[3], fragment[3]),
+            )
+        else:
+            yield pending
+            pending = fragment
+    if pending is not None:
+        yield pending
+
+
+def _column_ranges(
+    col_widths: Mapping[int, float],
+) -> list[tuple[int, int, float]]:
+    """Group adjacent columns that share a width into `(min, max, width)` spans."""
+    ranges: list[tuple[int, int, float]] = []
+    for column_index in sorted(col_widths):
+        width = max(col_widths[column_index], MIN_COLUMN_WIDTH)
+        if ranges:
+            first, last, previous = ranges[-1]
+            if last == column_index - 1 and previous == width:
+                ranges[-1] = (first, column_index, width)
+                continue
+        ranges.append((column_index, column_index, width))
+    return ranges
@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterable
+from dataclasses import dataclass, field, replace
+from typing import Any
+
+from ._layout import (
+    _iter_rows,
+    _limit_violations,
+    _plan_lazy_sheet,
+    _RowFragment,
+    _sheet_placements,
+    _spill_sheet,
+)
+from ._xlsx import (
+    _BODY_SPOOL_SIZE,
+    _ERROR_CODES,
+    BAND_ROWS,
+    StringsStrategy,
+    _format_rows,
+    _resolve_rows,
+    _SharedStrings,
+    _StringColumns,
+    _StyleTable,
+    _temporal_format,
+)
+from .nodes import (
+    HorizontalStackNode,
+    SheetComponent,
+    SheetFactoryNode,
+    SheetNode,
+    TableNode,
+    VerticalStackNode,
+    build_sheet,
+)
+
+__all__ = ["SheetPlan", "WorkbookPlan", "plan_workbook"]
+
+# Rows per sheet (half from the top, half from the bottom) that are actually
+# formatted to measure bytes per cell.
+PLAN_SAMPLE_ROWS = 512
+
+# Rough per-object costs on 64-bit CPython, used for the memory estimates.
+_OPENPYXL_CELL_BYTES = 420
+_RESOLVED_CELL_BYTES = 110
+_SHARED_STRING_BYTES = 110
+_SHEET_PART_BYTES = 800
+
+
+@dataclass
+class SheetPlan:
+    name: str
+    rows: int = 0
+    cells: int = 0
+    # Distinct style tuples seen in the tree and distinct xf records they resolve to.
+    style_chains: int = 0
+    styles: int = 0
+    text_cells: int = 0
+    shared_strings: int = 0
+    xml_bytes: int = 0
+    compressed_bytes: int = 0
+    # Estimated peak memory in bytes per render mode, on top of the tree itself.
+    peak_memory: dict[str, int] = field(default_factory=dict)
+    violations: tuple[str, ...] = ()
+    # Streamed tables (cursor or async); their rows are not counted above.
+    streamed_tables: int = 0
+
+
+@dataclass
+class WorkbookPlan:
+    """Dry-run estimates for a workbook; see `Workbook.dry_run`."""
+
+    strings: StringsStrategy
+    workers: int
+    sheets: list[SheetPlan] = field(default_factory=list)
+
+    @property
+    def cells(self) -> int:
+        return sum(sheet.cells for sheet in self.sheets)
+
+    @property
+    def compressed_bytes(self) -> int:
+        return sum(sheet.compressed_bytes for sheet in self.sheets)
+
+    @property
+    def peak_memory(self) -> dict[str, int]:
+        """Largest per-sheet estimate for each mode; sheets render one at a time."""
+        modes: dict[str, int] = {}
+        for sheet in self.sheets:
+            for mode, size in sheet.peak_memory.items():
+                modes[mode] = max(modes.get(mode, 0), size)
+        # openpyxl keeps every sheet alive until the workbook is saved.
+        if self.sheets:
+            modes["to_openpyxl"] = sum(
+                sheet.peak_memory["to_openpyxl"] for sheet in self.sheets
+            )
+        return modes
+
+    @property
+    def violations(self) -> tuple[str, ...]:
+        return tuple(message for sheet in self.sheets for message in sheet.violations)
+
+
+def _measure_sample(
+    sample: list[_RowFragment], columns: _StringColumns
+) -> tuple[float, float]:
+    """Formatted bytes per cell and deflate ratio of sampled rows.
+
+    `columns` carries the string modes decided over the whole sheet, so
+    sampled text is stored the way the real save would store it.
+    """
+    import zlib
+
+    resolved = _resolve_rows(sample, _StyleTable(), _SharedStrings(), columns)
+    band = _format_rows(list(resolved))
+    if not band.cells:
+        return 0.0, 1.0
+    ratio = len(zlib.compress(band.xml)) / max(len(band.xml), 1)
+    return len(band.xml) / band.cells, ratio
+
+
+def _without_sources(item: SheetComponent) -> tuple[SheetComponent, int]:
+    """`item` with row sources detached, so planning never consumes them."""
+    if isinstance(item, TableNode) and item.source is not None:
+        return replace(item, source=None), 1
+    if isinstance(item, (VerticalStackNode, HorizontalStackNode)):
+        children = [_without_sources(child) for child in item.items]
+        count = sum(streamed for _, streamed in children)
+        if count:
+            return replace(item, items=tuple(child for child, _ in children)), count
+    return item, 0
+
+
+def _plan_sheet(node: SheetNode, strategy: StringsStrategy, workers: int) -> SheetPlan:
+    plan = SheetPlan(name=node.name, violations=tuple(_limit_violations(node)))
+    items = [_without_sources(item) for item in node.items]
+    plan.streamed_tables = sum(streamed for _, streamed in items)
+    if plan.streamed_tables:
+        node = replace(node, items=tuple(item for item, _ in items))
+    columns = _StringColumns(strategy)
+    distinct: set[str] = set()
+    # Chains are deduplicated by identity first; tables share one tuple per column.
+    chains: dict[tuple[int, str | None], tuple[Any, ...]] = {}
+    head: list[_RowFragment] = []
+    tail: deque[_RowFragment] = deque(maxlen=PLAN_SAMPLE_ROWS // 2)
+    for fragment in _iter_rows(_sheet_placements(node)):
+        cells = fragment[2]
+        plan.rows += 1
+        plan.cells += len(cells)
+        if len(head) < PLAN_SAMPLE_ROWS // 2:
+            head.append(fragment)
+        else:
+            tail.append(fragment)
+        for column_index, value, chain in cells:
+            default_format = None
+            if type(value) is str:
+                plan.text_cells += 1
+                if (
+                    value
+                    and not (len(value) > 1 and value[0] == "=")
+                    and value not in _ERROR_CODES
+                    and columns.shared(column_index, value)
+                ):
+                    distinct.add(value)
+            elif value is not None and not isinstance(value, (int, float)):
+                default_format = _temporal_format(value)
+            key = (id(chain), default_format)
+            if key not in chains:
+                chains[key] = chain
+
+    styles = _StyleTable()
+    for (_, default_format), chain in chains.items():
+        styles.xf_for(chain, default_format)
+    plan.style_chains = len({chain for chain in chains.values()})
+    plan.styles = len(styles)
+    plan.shared_strings = len(distinct)
+
+    bytes_per_cell, ratio = _measure_sample(head + list(tail), columns)
+    plan.xml_bytes = int(bytes_per_cell * plan.cells) + _SHEET_PART_BYTES
+    plan.compressed_bytes = int(plan.xml_bytes * ratio)
+
+    strings_bytes = sum(map(len, distinct)) + _SHARED_STRING_BYTES * len(distinct)
+    serial = min(plan.xml_bytes, _BODY_SPOOL_SIZE) + strings_bytes
+    cells_per_row = plan.cells / plan.rows if plan.rows else 0.0
+    band_bytes = BAND_ROWS * cells_per_row * (_RESOLVED_CELL_BYTES + bytes_per_cell)
+    in_flight = min(2 * workers + 1, -(-plan.rows // BAND_ROWS)) if plan.rows else 0
+    plan.peak_memory = {
+        "save": serial,
+        "save_parallel": serial + int(in_flight * band_bytes),
+        "to_openpyxl": plan.cells * _OPENPYXL_CELL_BYTES + strings_bytes,
+    }
+    return plan
+
+
+def plan_workbook(
+    sheets: Iterable[SheetNode | SheetFactoryNode],
+    *,
+    strings: StringsStrategy = "auto",
+    workers: int = 1,
+) -> WorkbookPlan:
+    plan = WorkbookPlan(strings=strings, workers=workers)
+    for entry in sheets:
+        # Factories are built one at a time, exactly as during save.
+        sheet = build_sheet(entry)
+        parts = _spill_sheet(sheet)
+        if isinstance(entry, SheetFactoryNode) and len(parts) > 1:
+            try:
+                _plan_lazy_sheet(sheet)
+            except ValueError as exc:
+                sheet_plan = _plan_sheet(sheet, strings, workers)
+                sheet_plan.violations += (str(exc),)
+                plan.sheets.append(sheet_plan)
+        else:
+            plan.sheets.extend(_plan_sheet(part, strings, workers) for part in parts)
+        del sheet, parts
+    return plan
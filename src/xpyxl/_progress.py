@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+__all__ = [
+    "PROGRESS_EVERY",
+    "CancelToken",
+    "Progress",
+    "ProgressCallback",
+    "RenderCancelled",
+]
+
+# Rows between cancellation/deadline checks in the openpyxl backend. The native
+# writer checks once per formatted band instead.
+PROGRESS_EVERY = 512
+
+
+class RenderCancelled(Exception):
+    """Raised inside a render when its `CancelToken` has been cancelled."""
+
+
+class CancelToken:
+    """Cooperative cancellation flag; `cancel()` may be called from any thread."""
+
+    __slots__ = ("_cancelled",)
+
+    def __init__(self) -> None:
+        self._cancelled = False
+
+    def cancel(self) -> None:
+        self._cancelled = True
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+
+@dataclass(frozen=True)
+class Progress:
+    sheet_index: int
+    sheet_count: int
+    sheet: str
+    # Rows written so far in the current sheet and across the workbook.
+    rows: int
+    total_rows: int
+    # Uncompressed sheet XML produced so far (0 for the openpyxl backend).
+    bytes_out: int
+
+
+ProgressCallback = Callable[[Progress], None]
+
+
+class _Monitor:
+    """Counters plus the cancel/deadline checks shared by both backends."""
+
+    def __init__(
+        self,
+        *,
+        progress: ProgressCallback | None,
+        cancel: CancelToken | None,
+        deadline: float | None,
+        sheet_count: int,
+    ) -> None:
+        self._progress = progress
+        self._cancel = cancel
+        self._deadline = deadline
+        self._sheet_count = sheet_count
+        self._sheet_index = 0
+        self._sheet = ""
+        self._rows = 0
+        self._total_rows = 0
+        self._bytes_out = 0
+
+    @classmethod
+    def create(
+        cls,
+        *,
+        progress: ProgressCallback | None,
+        cancel: CancelToken | None,
+        deadline: float | None,
+        sheet_count: int,
+    ) -> _Monitor | None:
+        if progress is None and cancel is None and deadline is None:
+            return None
+        return cls(
+            progress=progress, cancel=cancel, deadline=deadline, sheet_count=sheet_count
+        )
+
+    def start_sheet(self, index: int, name: str) -> None:
+        self._sheet_index = index
+        self._sheet = name
+        self._rows = 0
+        self.check()
+
+    def check(self) -> None:
+        # Only reads, so worker threads may call it while this thread reports.
+        if self._cancel is not None and self._cancel.cancelled:
+            msg = "Render was cancelled"
+            raise RenderCancelled(msg)
+        if self._deadline is not None and time.monotonic() >= self._deadline:
+            msg = "Render deadline exceeded"
+            raise TimeoutError(msg)
+
+    def advance(self, rows: int, bytes_out: int = 0) -> None:
+        self._rows += rows
+        self._total_rows += rows
+        self._bytes_out += bytes_out
+        self.check()
+        if self._progress is not None:
+            self._progress(
+                Progress(
+                    sheet_index=self._sheet_index,
+                    sheet_count=self._sheet_count,
+                    sheet=self._sheet,
+                    rows=self._rows,
+                    total_rows=self._total_rows,
+                    bytes_out=self._bytes_out,
+                )
+            )
+
+
+class _SheetCounter:
+    """`_Monitor` stand-in for a sheet rendered on a worker thread.
+
+    It counts rows and runs the cancel/deadline checks; the coordinating
+    thread reports the count when the sheet is collected, so progress
+    callbacks always run on the thread that started the render.
+    """
+
+    __slots__ = ("_monitor", "rows")
+
+    def __init__(self, monitor: _Monitor) -> None:
+        self._monitor = monitor
+        self.rows = 0
+
+    def advance(self, rows: int, bytes_out: int = 0) -> None:
+        self.rows += rows
+        self._monitor.check()
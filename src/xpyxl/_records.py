@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import dataclasses
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+from operator import attrgetter
+from typing import Annotated, Any, get_origin, get_type_hints
+
+from .styles import Style
+
+__all__ = ["ColumnHint", "RecordAdapter", "column_hint", "record_adapter"]
+
+
+@dataclass(frozen=True)
+class ColumnHint:
+    """Per-field table metadata, attached with `Annotated[T, column_hint(...)]`."""
+
+    header: str | None = None
+    width: float | None = None
+    styles: tuple[Style, ...] = ()
+
+
+@dataclass(frozen=True)
+class RecordAdapter:
+    """Column layout and value extractor compiled once per record type."""
+
+    headers: tuple[str, ...]
+    column_styles: tuple[tuple[Style, ...], ...]
+    column_widths: tuple[float | None, ...]
+    # None when records are already tuples (NamedTuple) and need no extraction.
+    extract: Callable[[Any], tuple[Any, ...]] | None
+
+
+def column_hint(
+    *,
+    header: str | None = None,
+    width: float | None = None,
+    style: Sequence[Style] | None = None,
+) -> ColumnHint:
+    return ColumnHint(header=header, width=width, styles=tuple(style or ()))
+
+
+def _field_names(record_type: type) -> tuple[str, ...]:
+    if issubclass(record_type, tuple) and hasattr(record_type, "_fields"):
+        return tuple(record_type._fields)  # pyright: ignore[reportAttributeAccessIssue]
+    if dataclasses.is_dataclass(record_type):
+        return tuple(field.name for field in dataclasses.fields(record_type))
+    names: list[str] = []
+    for klass in reversed(record_type.__mro__):
+        slots = klass.__dict__.get("__slots__", ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        names.extend(
+            name for name in slots if not name.startswith("__") and name not in names
+        )
+    if names:
+        return tuple(names)
+    msg = (
+        f"{record_type.__name__} is not a dataclass, NamedTuple or __slots__ class; "
+        "use from_records with explicit rows instead"
+    )
+    raise TypeError(msg)
+
+
+def _metadata(record_type: type) -> dict[str, tuple[Any, ...]]:
+    try:
+        hints = get_type_hints(record_type, include_extras=True)
+    except (NameError, TypeError):
+        return {}
+    return {
+        name: hint.__metadata__
+        for name, hint in hints.items()
+        if get_origin(hint) is Annotated
+    }
+
+
+def _extractor(
+    record_type: type, names: tuple[str, ...]
+) -> Callable[[Any], tuple[Any, ...]] | None:
+    if issubclass(record_type, tuple):
+        return None
+    if len(names) == 1:
+        getter = attrgetter(names[0])
+        return lambda record: (getter(record),)
+    return attrgetter(*names)
+
+
+@lru_cache(maxsize=256)
+def record_adapter(record_type: type) -> RecordAdapter:
+    names = _field_names(record_type)
+    metadata = _metadata(record_type)
+    headers: list[str] = []
+    column_styles: list[tuple[Style, ...]] = []
+    column_widths: list[float | None] = []
+    for name in names:
+        header = name
+        width = None
+        styles: list[Style] = []
+        for item in metadata.get(name, ()):
+            if isinstance(item, Style):
+                styles.append(item)
+            elif isinstance(item, ColumnHint):
+                header = item.header or header
+                width = item.width if item.width is not None else width
+                styles.extend(item.styles)
+        headers.append(header)
+        column_styles.append(tuple(styles))
+        column_widths.append(width)
+    return RecordAdapter(
+        headers=tuple(headers),
+        column_styles=tuple(column_styles),
+        column_widths=tuple(column_widths),
+        extract=_extractor(record_type, names),
+    )
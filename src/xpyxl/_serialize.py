@@ -0,0 +1,345 @@
+from __future__ import annotations
+
+import gc
+import marshal
+from array import array
+from collections.abc import Sequence
+from dataclasses import astuple
+from itertools import repeat
+from typing import Any, assert_never
+
+from .nodes import (
+    CellNode,
+    ColumnNode,
+    HorizontalStackNode,
+    RowNode,
+    SheetComponent,
+    SheetNode,
+    SpacerNode,
+    TableFooter,
+    TableNode,
+    TableOutline,
+    VerticalStackNode,
+    WorkbookNode,
+    build_sheet,
+)
+from .styles import Style
+
+__all__ = ["dumps", "loads"]
+
+# Layout: MAGIC + marshal((styles, chains, kind, body)).
+#
+# Every distinct Style is stored once and every distinct style tuple ("chain") is
+# a tuple of style ids, so nodes reference styles by a single integer. Runs of
+# cells are stored column-wise: one typed value column per cell offset plus a
+# parallel column of chain ids. Numeric columns are packed arrays.
+MAGIC = b"XPYXL\x00\x01"
+
+_WORKBOOK = 0
+_SHEET = 1
+
+_CELL = 0
+_ROW = 1
+_COLUMN = 2
+_TABLE = 3
+_SPACER = 4
+_VSTACK = 5
+_HSTACK = 6
+
+_COL_INT = 0
+_COL_FLOAT = 1
+_COL_STR = 2
+_COL_PLAIN = 3
+_COL_PICKLED = 4
+
+_PLAIN_TYPES = frozenset((type(None), bool, int, float, str))
+_INT64_MIN = -(2**63)
+_INT64_MAX = 2**63 - 1
+
+
+class _Encoder:
+    def __init__(self) -> None:
+        self.styles: dict[Style, int] = {}
+        self.chains: dict[tuple[Style, ...], int] = {(): 0}
+        self.chain_ids: list[tuple[int, ...]] = [()]
+
+    def chain(self, styles: tuple[Style, ...]) -> int:
+        chain_id = self.chains.get(styles)
+        if chain_id is None:
+            chain_id = self.chains[styles] = len(self.chains)
+            self.chain_ids.append(
+                tuple(
+                    self.styles.setdefault(style, len(self.styles)) for style in styles
+                )
+            )
+        return chain_id
+
+    def tables(self) -> tuple[tuple[Any, ...], tuple[tuple[int, ...], ...]]:
+        styles = tuple(astuple(style) for style in self.styles)
+        return styles, tuple(self.chain_ids)
+
+    def values(self, values: Sequence[Any]) -> tuple[int, Any]:
+        kinds = set(map(type, values))
+        if kinds == {int}:
+            if _INT64_MIN <= min(values) and max(values) <= _INT64_MAX:
+                return _COL_INT, array("q", values).tobytes()
+        elif kinds == {float}:
+            return _COL_FLOAT, array("d", values).tobytes()
+        elif kinds == {str}:
+            return _COL_STR, tuple(values)
+        if kinds <= _PLAIN_TYPES:
+            return _COL_PLAIN, tuple(values)
+        import pickle
+
+        return _COL_PICKLED, pickle.dumps(
+            list(values), protocol=pickle.HIGHEST_PROTOCOL
+        )
+
+    def cells(self, cells: Sequence[CellNode]) -> tuple[Any, ...]:
+        return (
+            self.values([cell.value for cell in cells]),
+            array("I", [self.chain(cell.styles) for cell in cells]).tobytes(),
+        )
+
+    def rows(self, rows: Sequence[RowNode]) -> tuple[Any, ...]:
+        lengths = [len(row.cells) for row in rows]
+        width = max(lengths, default=0)
+        columns = [
+            self.cells([row.cells[offset] for row in rows if len(row.cells) > offset])
+            for offset in range(width)
+        ]
+        return (
+            array("I", lengths).tobytes(),
+            array("I", [self.chain(row.styles) for row in rows]).tobytes(),
+            tuple(columns),
+        )
+
+    def records(self, records: Sequence[tuple[Any, ...]]) -> tuple[Any, ...]:
+        lengths = set(map(len, records))
+        if len(lengths) <= 1:
+            width = lengths.pop() if lengths else 0
+            columns = list(zip(*records)) if width else []
+            return len(records), None, tuple(self.values(column) for column in columns)
+        width = max(lengths)
+        columns = [
+            [record[offset] for record in records if len(record) > offset]
+            for offset in range(width)
+        ]
+        return (
+            len(records),
+            array("I", map(len, records)).tobytes(),
+            tuple(self.values(column) for column in columns),
+        )
+
+    def footer(self, footer: TableFooter | None) -> tuple[Any, ...] | None:
+        if footer is None:
+            return None
+        return (
+            footer.aggregates,
+            self.chain(footer.styles),
+            footer.label,
+            footer.formulas,
+        )
+
+    def outline(self, outline: TableOutline | None) -> tuple[Any, ...] | None:
+        if outline is None:
+            return None
+        return outline.levels, outline.detail, self.chain(outline.styles)
+
+    def component(self, item: SheetComponent) -> tuple[Any, ...]:
+        if isinstance(item, CellNode):
+            return _CELL, self.values([item.value]), self.chain(item.styles)
+        elif isinstance(item, RowNode):
+            return _ROW, self.cells(item.cells), self.chain(item.styles)
+        elif isinstance(item, ColumnNode):
+            return _COLUMN, self.cells(item.cells), self.chain(item.styles)
+        elif isinstance(item, TableNode):
+            if item.source is not None:
+                msg = "Streamed tables cannot be serialized; collect the rows first"
+                raise TypeError(msg)
+            header = None
+            if item.header is not None:
+                header = (self.cells(item.header.cells), self.chain(item.header.styles))
+            return (
+                _TABLE,
+                self.chain(item.styles),
+                header,
+                self.rows(item.rows),
+                self.records(item.records),
+                tuple(self.chain(styles) for styles in item.column_styles),
+                item.column_widths,
+                item.overflow,
+                self.footer(item.footer),
+                self.outline(item.outline),
+            )
+        elif isinstance(item, SpacerNode):
+            return _SPACER, item.rows, item.height
+        elif isinstance(item, VerticalStackNode):
+            return _VSTACK, tuple(map(self.component, item.items)), item.gap
+        elif isinstance(item, HorizontalStackNode):
+            return _HSTACK, tuple(map(self.component, item.items)), item.gap
+        else:
+            assert_never(item)
+
+    def sheet(self, node: SheetNode) -> tuple[Any, ...]:
+        return node.name, tuple(map(self.component, node.items))
+
+
+def _restore_cell(value: Any, styles: tuple[Style, ...]) -> CellNode:
+    # Like pickle, restore state directly instead of running the frozen
+    # dataclass __init__; cells dominate large trees.
+    cell = object.__new__(CellNode)
+    state = cell.__dict__
+    state["value"] = value
+    state["styles"] = styles
+    return cell
+
+
+class _Decoder:
+    def __init__(
+        self, styles: tuple[tuple[Any, ...], ...], chains: tuple[tuple[int, ...], ...]
+    ) -> None:
+        style_objects = [Style(*values) for values in styles]
+        self.chains = [tuple(style_objects[i] for i in ids) for ids in chains]
+
+    def values(self, column: tuple[int, Any]) -> list[Any]:
+        kind, payload = column
+        if kind == _COL_INT:
+            return array("q", payload).tolist()
+        if kind == _COL_FLOAT:
+            return array("d", payload).tolist()
+        if kind == _COL_PICKLED:
+            import pickle
+
+            return pickle.loads(payload)
+        return list(payload)
+
+    def cells(self, block: tuple[Any, ...]) -> list[CellNode]:
+        values, chain_ids = block
+        chains = map(self.chains.__getitem__, array("I", chain_ids))
+        return list(map(_restore_cell, self.values(values), chains))
+
+    def rows(self, block: tuple[Any, ...]) -> tuple[RowNode, ...]:
+        lengths_raw, chains_raw, columns = block
+        lengths = array("I", lengths_raw)
+        row_chains = map(self.chains.__getitem__, array("I", chains_raw))
+        cell_columns = [self.cells(column) for column in columns]
+        if cell_columns and lengths.count(len(cell_columns)) == len(lengths):
+            return tuple(map(RowNode, zip(*cell_columns), row_chains))
+        cell_iters = [iter(column) for column in cell_columns]
+        return tuple(
+            RowNode(tuple(next(cell_iters[offset]) for offset in range(length)), chain)
+            for length, chain in zip(lengths, row_chains)
+        )
+
+    def records(self, block: tuple[Any, ...]) -> tuple[tuple[Any, ...], ...]:
+        count, lengths_raw, columns = block
+        decoded = [self.values(column) for column in columns]
+        if lengths_raw is None:
+            if not decoded:
+                return tuple(repeat((), count))
+            return tuple(zip(*decoded))
+        value_iters = [iter(column) for column in decoded]
+        return tuple(
+            tuple(next(value_iters[offset]) for offset in range(length))
+            for length in array("I", lengths_raw)
+        )
+
+    def footer(self, entry: tuple[Any, ...] | None) -> TableFooter | None:
+        if entry is None:
+            return None
+        aggregates, chain_id, label, formulas = entry
+        return TableFooter(aggregates, self.chains[chain_id], label, formulas)
+
+    def outline(self, entry: tuple[Any, ...] | None) -> TableOutline | None:
+        if entry is None:
+            return None
+        levels, detail, chain_id = entry
+        return TableOutline(levels, detail, self.chains[chain_id])
+
+    def component(self, entry: tuple[Any, ...]) -> SheetComponent:
+        kind = entry[0]
+        if kind == _CELL:
+            (value,) = self.values(entry[1])
+            return CellNode(value, self.chains[entry[2]])
+        if kind == _ROW:
+            return RowNode(tuple(self.cells(entry[1])), self.chains[entry[2]])
+        if kind == _COLUMN:
+            return ColumnNode(tuple(self.cells(entry[1])), self.chains[entry[2]])
+        if kind == _TABLE:
+            _, chain_id, header, rows, records, column_styles, column_widths = entry[:7]
+            header_node = None
+            if header is not None:
+                header_node = RowNode(
+                    tuple(self.cells(header[0])), self.chains[header[1]]
+                )
+            return TableNode(
+                rows=self.rows(rows),
+                styles=self.chains[chain_id],
+                header=header_node,
+                records=self.records(records),
+                column_styles=tuple(self.chains[i] for i in column_styles),
+                column_widths=column_widths,
+                # Trees written before overflow policies existed omit the field.
+                overflow=entry[7] if len(entry) > 7 else "error",
+                footer=self.footer(entry[8]) if len(entry) > 8 else None,
+                outline=self.outline(entry[9]) if len(entry) > 9 else None,
+            )
+        if kind == _SPACER:
+            return SpacerNode(rows=entry[1], height=entry[2])
+        if kind == _VSTACK:
+            return VerticalStackNode(tuple(map(self.component, entry[1])), entry[2])
+        if kind == _HSTACK:
+            return HorizontalStackNode(tuple(map(self.component, entry[1])), entry[2])
+        msg = f"Unknown node tag {kind!r} in serialized workbook"
+        raise ValueError(msg)
+
+    def sheet(self, entry: tuple[Any, ...]) -> SheetNode:
+        name, items = entry
+        return SheetNode(name=name, items=tuple(map(self.component, items)))
+
+
+def dumps(node: WorkbookNode | SheetNode) -> bytes:
+    """Serialize a workbook or sheet tree into the compact binary format.
+
+    Styles are interned into a table and cell values are stored as typed
+    columns, so repeated styles cost one integer per cell. Values other than
+    None/bool/int/float/str (dates, Decimal, ...) are pickled per column.
+    Sheet factories are called and stored as the sheets they build.
+    """
+    encoder = _Encoder()
+    if isinstance(node, WorkbookNode):
+        kind = _WORKBOOK
+        body: Any = tuple(encoder.sheet(build_sheet(sheet)) for sheet in node.sheets)
+    elif isinstance(node, SheetNode):
+        kind = _SHEET
+        body = encoder.sheet(node)
+    else:
+        msg = "dumps() accepts WorkbookNode or SheetNode"
+        raise TypeError(msg)
+    styles, chains = encoder.tables()
+    return MAGIC + marshal.dumps((styles, chains, kind, body))
+
+
+def loads(data: bytes) -> WorkbookNode | SheetNode:
+    """Rebuild a tree produced by `dumps` without re-running builder validation.
+
+    Like pickle, the format is meant for trusted peers running the same
+    Python minor version.
+    """
+    if not data.startswith(MAGIC):
+        msg = "Not an xpyxl serialized tree (bad header)"
+        raise ValueError(msg)
+    styles, chains, kind, body = marshal.loads(memoryview(data)[len(MAGIC) :])
+    decoder = _Decoder(styles, chains)
+    # The tree is acyclic; pausing the cyclic GC avoids repeated full scans
+    # while millions of nodes are allocated.
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        if kind == _WORKBOOK:
+            return WorkbookNode(sheets=tuple(map(decoder.sheet, body)))
+        return decoder.sheet(body)
+    finally:
+        if gc_enabled:
+            gc.enable()
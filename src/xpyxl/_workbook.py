@@ -1,11 +1,26 @@
 from __future__ import annotations
 
-from pathlib import Path
+from typing import TYPE_CHECKING, TextIO
 
-from openpyxl import Workbook as _OpenpyxlWorkbook
+from ._csv import CsvDialect, save_csv, write_sheet_csv
+from ._layout import _plan_lazy_sheet, _plan_sheets, _streams_rows
+from ._plan import WorkbookPlan, plan_workbook
+from ._progress import CancelToken, ProgressCallback, _Monitor, _SheetCounter
+from ._serialize import dumps, loads
+from ._xlsx import (
+    PoolKind,
+    RenderStats,
+    StringsStrategy,
+    _unique_titles,
+    write_workbook,
+)
+from .nodes import SheetFactoryNode, SheetNode, WorkbookNode, build_sheet
 
-from .nodes import WorkbookNode
-from .render import render_sheet
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from openpyxl import Workbook as _OpenpyxlWorkbook
+    from openpyxl.worksheet.worksheet import Worksheet
 
 __all__ = ["Workbook"]
 
@@ -16,16 +31,272 @@ class Workbook:
     def __init__(self, node: WorkbookNode) -> None:
         self._node = node
 
-    def save(self, path: str | Path) -> None:
-        workbook = self.to_openpyxl()
-        workbook.save(str(Path(path)))
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Workbook:
+        """Rebuild a workbook serialized with `to_bytes`."""
+        node = loads(data)
+        if not isinstance(node, WorkbookNode):
+            msg = "Serialized data holds a sheet, not a workbook"
+            raise ValueError(msg)
+        return cls(node)
+
+    def to_bytes(self) -> bytes:
+        """Serialize the tree into the compact format read by `from_bytes`."""
+        return dumps(self._node)
+
+    def save(
+        self,
+        path: str | Path,
+        *,
+        strings: StringsStrategy = "auto",
+        workers: int = 1,
+        pool: PoolKind = "process",
+        progress: ProgressCallback | None = None,
+        cancel: CancelToken | None = None,
+        deadline: float | None = None,
+        deterministic: bool = False,
+    ) -> RenderStats:
+        """Write the workbook to `path` and return the collected render stats.
+
+        `strings` selects how text cells are stored: `"shared"` deduplicates every
+        string into the shared-strings table, `"inline"` writes each string in its
+        cell, and `"auto"` decides per column from the observed cardinality.
+
+        `workers > 1` formats large sheets in row bands on a process pool; the
+        output is byte-identical to a serial save. `pool="thread"` renders
+        whole sheets concurrently on a thread pool instead, with the same
+        output; it suits many medium sheets, and scales with cores on
+        free-threaded CPython.
+
+        `progress` receives a `Progress` snapshot as rows are written. Setting
+        `cancel` or passing `deadline` (a `time.monotonic()` value) aborts with
+        `RenderCancelled` or `TimeoutError`, and `path` is left untouched.
+
+        `deterministic=True` fixes timestamps and zip metadata so equal trees
+        save to equal bytes; the SHA-256 is returned in `RenderStats.digest`.
+        """
+        return write_workbook(
+            self._node,
+            path,
+            strings=strings,
+            workers=workers,
+            pool=pool,
+            progress=progress,
+            cancel=cancel,
+            deadline=deadline,
+            deterministic=deterministic,
+        )
+
+    async def save_async(
+        self,
+        path: str | Path,
+        *,
+        strings: StringsStrategy = "auto",
+        workers: int = 1,
+        pool: PoolKind = "process",
+        progress: ProgressCallback | None = None,
+        cancel: CancelToken | None = None,
+        deadline: float | None = None,
+        deterministic: bool = False,
+    ) -> RenderStats:
+        """`save` on a worker thread, feeding `from_async` tables from this loop.
+
+        Each async table is drained by a task on the running loop into a
+        bounded queue that the render thread reads, so fetching and writing
+        overlap. `progress` is called from the render thread. Cancelling the
+        awaiting task cancels the render, and `path` is left untouched.
+        """
+        from ._async import render_async
+
+        token = cancel if cancel is not None else CancelToken()
+        return await render_async(
+            lambda: self.save(
+                path,
+                strings=strings,
+                workers=workers,
+                pool=pool,
+                progress=progress,
+                cancel=token,
+                deadline=deadline,
+                deterministic=deterministic,
+            ),
+            token,
+        )
+
+    def digest(
+        self,
+        *,
+        strings: StringsStrategy = "auto",
+        workers: int = 1,
+        pool: PoolKind = "process",
+    ) -> str:
+        """SHA-256 of what `save(..., deterministic=True)` would write.
+
+        The package is rendered into the hash only, so nothing touches disk.
+        """
+        stats = write_workbook(
+            self._node,
+            None,
+            strings=strings,
+            workers=workers,
+            pool=pool,
+            deterministic=True,
+        )
+        assert stats.digest is not None
+        return stats.digest
+
+    def dry_run(
+        self, *, strings: StringsStrategy = "auto", workers: int = 1
+    ) -> WorkbookPlan:
+        """Estimate the cost of `save` without rendering anything.
+
+        Runs the layout and walks the cell stream once to count cells, style
+        chains and shared strings, then formats a small sample of rows per
+        sheet to extrapolate the output size. Memory figures are rough
+        estimates per render mode. Limit violations are listed rather than
+        raised. Sheet factories are called, one at a time.
+        """
+        return plan_workbook(self._node.sheets, strings=strings, workers=workers)
+
+    def save_csv(
+        self,
+        directory: str | Path,
+        *,
+        dialect: CsvDialect = "csv",
+        encoding: str = "utf-8",
+    ) -> list[Path]:
+        """Export cell values only, one `<sheet>.csv` (or `.tsv`) per sheet.
+
+        The layout is walked as for `save`, but styles and sizing are skipped;
+        `number_format` alone decides how numbers and dates are written.
+        Returns the written paths in sheet order.
+        """
+        return save_csv(
+            self._node.sheets, directory, dialect=dialect, encoding=encoding
+        )
+
+    def write_csv(
+        self, stream: TextIO, *, sheet: str | None = None, dialect: CsvDialect = "csv"
+    ) -> int:
+        """Write one sheet's values to a text stream; returns the lines written.
+
+        `sheet` defaults to the first sheet. Open files with `newline=""`.
+        """
+        entries = self._node.sheets
+        if sheet is not None:
+            entries = tuple(entry for entry in entries if entry.name == sheet)
+        if not entries:
+            msg = f"Workbook has no sheet named '{sheet}'"
+            if sheet is None:
+                msg = "Workbook has no sheets"
+            raise ValueError(msg)
+        return write_sheet_csv(build_sheet(entries[0]), stream, dialect=dialect)
+
+    def to_openpyxl(
+        self,
+        *,
+        workers: int = 1,
+        progress: ProgressCallback | None = None,
+        cancel: CancelToken | None = None,
+        deadline: float | None = None,
+    ) -> _OpenpyxlWorkbook:
+        """Render into a new openpyxl `Workbook`.
+
+        `workers > 1` renders sheets concurrently on a thread pool. Progress is
+        then reported once per sheet, in order, from the calling thread.
+        """
+        if workers < 1:
+            raise ValueError("workers must be >= 1")
+        # openpyxl is only needed here; importing it lazily keeps `import xpyxl`
+        # cheap for processes that just build or stream trees.
+        from openpyxl import Workbook as _OpenpyxlWorkbook
+        from openpyxl.worksheet.worksheet import Worksheet
+
+        from .render import render_sheet
 
-    def to_openpyxl(self) -> _OpenpyxlWorkbook:
         workbook = _OpenpyxlWorkbook()
         default_sheet = workbook.active
         if default_sheet is not None:
             workbook.remove(default_sheet)
-        for sheet in self._node.sheets:
-            ws = workbook.create_sheet(title=sheet.name)
-            render_sheet(ws, sheet)
+        sheets = _plan_sheets(self._node.sheets)
+        titles = _unique_titles(entry.name for entry in sheets)
+        # `create_sheet` rescans every existing title for each new sheet, which
+        # makes assembly quadratic in the sheet count. Titles are already
+        # unique, so build the worksheets detached and attach them in one step.
+        worksheets = [Worksheet(parent=workbook, title=title) for title in titles]
+        workbook._sheets.extend(worksheets)
+        monitor = _Monitor.create(
+            progress=progress, cancel=cancel, deadline=deadline, sheet_count=len(sheets)
+        )
+        if workers > 1:
+            _render_threaded(sheets, worksheets, workers, monitor)
+            return workbook
+        for index, (entry, ws) in enumerate(zip(sheets, worksheets)):
+            if monitor is not None:
+                monitor.start_sheet(index, ws.title)
+            sheet = entry
+            if isinstance(entry, SheetFactoryNode):
+                sheet = _plan_lazy_sheet(build_sheet(entry))
+            render_sheet(ws, sheet, monitor)
         return workbook
+
+
+def _render_threaded(
+    sheets: list[SheetNode | SheetFactoryNode],
+    worksheets: list[Worksheet],
+    workers: int,
+    monitor: _Monitor | None,
+) -> None:
+    """Render each sheet into its worksheet on a thread pool, collecting in order.
+
+    At most `workers` sheets are in flight, so factories are built lazily, on
+    this thread, as earlier sheets finish. Sheets with a streamed table are
+    rendered here when their turn comes, since their sources are bound to it.
+    """
+    from collections import deque
+    from concurrent.futures import Future, ThreadPoolExecutor
+
+    from .render import render_sheet
+
+    entries = iter(zip(sheets, worksheets))
+
+    def submit() -> None:
+        job = next(entries, None)
+        if job is None:
+            return
+        entry, ws = job
+        sheet = entry
+        if isinstance(entry, SheetFactoryNode):
+            sheet = _plan_lazy_sheet(build_sheet(entry))
+        if _streams_rows(sheet):
+            pending.append((sheet, ws, None, None))
+            return
+        counter = None if monitor is None else _SheetCounter(monitor)
+        future = executor.submit(render_sheet, ws, sheet, counter)
+        pending.append((sheet, ws, counter, future))
+
+    pending: deque[
+        tuple[SheetNode, Worksheet, _SheetCounter | None, Future[None] | None]
+    ] = deque()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        try:
+            for _ in range(workers):
+                submit()
+            index = 0
+            while pending:
+                sheet, ws, counter, future = pending.popleft()
+                if monitor is not None:
+                    monitor.start_sheet(index, ws.title)
+                if future is None:
+                    render_sheet(ws, sheet, monitor)
+                else:
+                    future.result()
+                    if monitor is not None and counter is not None:
+                        monitor.advance(counter.rows)
+                del sheet
+                index += 1
+                submit()
+        finally:
+            for _, _, _, future in pending:
+                if future is not None:
+                    future.cancel()
@@ -0,0 +1,1283 @@
+from __future__ import annotations
+
+import re
+from collections import deque
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta, timezone
+from typing import TYPE_CHECKING, Any, Literal
+
+from ._convert import _NATIVE_TYPES, _converter_for, _non_finite_error
+from ._layout import (
+    DEFAULT_BORDER_COLOR,
+    DEFAULT_FONT_NAME,
+    DEFAULT_FONT_SIZE,
+    DEFAULT_ROW_HEIGHT,
+    MAX_TITLE_LENGTH,
+    EffectiveStyle,
+    _column_letter,
+    _column_ranges,
+    _column_width_hints,
+    _Formula,
+    _iter_rows,
+    _Placement,
+    _plan_lazy_sheet,
+    _plan_sheets,
+    _resolve_chain,
+    _sheet_placements,
+    _streams_rows,
+    _suffixed_title,
+    _table_marks,
+    _TableMarks,
+)
+from ._progress import CancelToken, ProgressCallback, _Monitor
+from .nodes import SheetFactoryNode, SheetNode, WorkbookNode, build_sheet
+from .styles import Style, to_argb
+
+if TYPE_CHECKING:
+    import zipfile
+    from concurrent.futures import Executor, Future
+    from multiprocessing.shared_memory import SharedMemory
+    from pathlib import Path
+
+# zipfile, tempfile, shutil and decimal are imported when a workbook is written
+# so that `import xpyxl` stays cheap.
+
+__all__ = [
+    "PoolKind",
+    "RenderStats",
+    "SheetStats",
+    "StringsStrategy",
+    "write_workbook",
+]
+
+
+StringsStrategy = Literal["shared", "inline", "auto"]
+PoolKind = Literal["process", "thread"]
+
+# `auto` samples this many strings per column before committing to a strategy.
+AUTO_SAMPLE_SIZE = 1024
+# Columns whose sampled distinct/total ratio exceeds this are written inline.
+AUTO_INLINE_RATIO = 0.5
+
+# Rows per band handed to a worker process when saving with `workers > 1`.
+BAND_ROWS = 20_000
+
+_BODY_SPOOL_SIZE = 16 * 1024 * 1024
+_FLUSH_ROWS = 512
+
+# Hidden defined names listing each sheet's table body and footer rows.
+_BODY_NAME = "_xpyxl_body"
+_FOOTER_NAME = "_xpyxl_footer"
+
+_XML_HEADER = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+_SHEET_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+_CT_NS = "http://schemas.openxmlformats.org/package/2006/content-types"
+_CT_MAIN = "application/vnd.openxmlformats-officedocument.spreadsheetml"
+
+_ERROR_CODES = frozenset(
+    ("#NULL!", "#DIV/0!", "#VALUE!", "#REF!", "#NAME?", "#NUM!", "#N/A")
+)
+# Characters outside the XML 1.0 `Char` production.
+_ILLEGAL_CHARACTERS = re.compile(
+    "[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]"
+)
+_INVALID_TITLE = re.compile(r"[\\*?:/\[\]]")
+_EXCEL_EPOCH = datetime(1899, 12, 30)
+_SECONDS_PER_DAY = 86400
+
+
+@dataclass
+class SheetStats:
+    name: str
+    rows: int = 0
+    cells: int = 0
+    inline_columns: tuple[int, ...] = ()
+
+
+@dataclass
+class RenderStats:
+    """Counters collected while saving a workbook."""
+
+    strings: StringsStrategy
+    sheets: list[SheetStats] = field(default_factory=list)
+    shared_strings: int = 0
+    string_lookups: int = 0
+    inline_strings: int = 0
+    # SHA-256 of the package bytes, set by deterministic saves.
+    digest: str | None = None
+
+    @property
+    def string_hits(self) -> int:
+        return self.string_lookups - self.shared_strings
+
+    @property
+    def hit_rate(self) -> float:
+        if not self.string_lookups:
+            return 0.0
+        return self.string_hits / self.string_lookups
+
+
+def _number(value: float) -> str:
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+def escape(text: str) -> str:
+    if _ILLEGAL_CHARACTERS.search(text) is not None:
+        # Same error as openpyxl raises for these characters.
+        from openpyxl.utils.exceptions import IllegalCharacterError
+
+        msg = f"{text} cannot be used in worksheets."
+        raise IllegalCharacterError(msg)
+    # xml.sax.saxutils would pull urllib/http into `import xpyxl`.
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def quoteattr(text: str) -> str:
+    return '"' + escape(text).replace('"', "&quot;") + '"'
+
+
+def _text_xml(text: str) -> str:
+    if text != text.strip():
+        return f'<t xml:space="preserve">{escape(text)}</t>'
+    return f"<t>{escape(text)}</t>"
+
+
+def _excel_serial(value: date | time | timedelta) -> float:
+    if isinstance(value, timedelta):
+        return value.total_seconds() / _SECONDS_PER_DAY
+    if isinstance(value, time):
+        seconds = value.hour * 3600 + value.minute * 60 + value.second
+        return (seconds + value.microsecond / 10**6) / _SECONDS_PER_DAY
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            msg = (
+                "Excel does not support timezones in datetimes. "
+                "The tzinfo in the datetime/time object must be set to None."
+            )
+            raise TypeError(msg)
+        moment = value
+    else:
+        moment = datetime.combine(value, time())
+    days = (moment - _EXCEL_EPOCH).days
+    if 0 < days <= 60:
+        days -= 1
+    return days + _excel_serial(moment.time())
+
+
+def _temporal_format(value: Any) -> str | None:
+    if isinstance(value, datetime):
+        return "yyyy-mm-dd h:mm:ss"
+    if isinstance(value, date):
+        return "yyyy-mm-dd"
+    if isinstance(value, time):
+        return "h:mm:ss"
+    if isinstance(value, timedelta):
+        return "[hh]:mm:ss"
+    return None
+
+
+def _unique_titles(names: Iterable[str]) -> list[str]:
+    titles: list[str] = []
+    seen: set[str] = set()
+    for name in names:
+        if _INVALID_TITLE.search(name):
+            msg = f"Invalid character found in sheet title '{name}'"
+            raise ValueError(msg)
+        if len(name) > MAX_TITLE_LENGTH:
+            msg = (
+                f"Sheet title '{name}' is longer than Excel's "
+                f"{MAX_TITLE_LENGTH} characters"
+            )
+            raise ValueError(msg)
+        base = name or "Sheet"
+        title = base
+        counter = 0
+        while title.lower() in seen:
+            counter += 1
+            title = _suffixed_title(base, str(counter))
+        seen.add(title.lower())
+        titles.append(title)
+    return titles
+
+
+class _SharedStrings:
+    """Deduplicating string table backed by a plain dict."""
+
+    def __init__(self) -> None:
+        self._index: dict[str, int] = {}
+        self.lookups = 0
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def add(self, text: str) -> int:
+        self.lookups += 1
+        index = self._index.get(text)
+        if index is None:
+            index = self._index[text] = len(self._index)
+        return index
+
+    def merge(self, other: _SharedStrings) -> list[int]:
+        """Add `other`'s strings in its first-seen order; returns their ids here."""
+        ids = [self.add(text) for text in other._index]
+        self.lookups += other.lookups - len(ids)
+        return ids
+
+    def to_xml(self) -> bytes:
+        parts = [
+            _XML_HEADER,
+            f'<sst xmlns="{_SHEET_NS}" count="{self.lookups}" '
+            f'uniqueCount="{len(self._index)}">',
+        ]
+        parts.extend(f"<si>{_text_xml(text)}</si>" for text in self._index)
+        parts.append("</sst>")
+        return "".join(parts).encode("utf-8")
+
+
+class _StringColumns:
+    """Per-column choice between the shared table and inline strings."""
+
+    def __init__(self, strategy: StringsStrategy) -> None:
+        self._fixed = None if strategy == "auto" else strategy == "shared"
+        self._modes: dict[int, bool] = {}
+        self._samples: dict[int, set[str]] = {}
+        self._seen: dict[int, int] = {}
+
+    def shared(self, column: int, text: str) -> bool:
+        if self._fixed is not None:
+            return self._fixed
+        mode = self._modes.get(column)
+        if mode is not None:
+            return mode
+        sample = self._samples.setdefault(column, set())
+        sample.add(text)
+        seen = self._seen[column] = self._seen.get(column, 0) + 1
+        if seen >= AUTO_SAMPLE_SIZE:
+            self._modes[column] = len(sample) / seen <= AUTO_INLINE_RATIO
+            del self._samples[column]
+        return True
+
+    def inline_columns(self) -> tuple[int, ...]:
+        """Columns that `auto` switched to inline strings."""
+        return tuple(sorted(col for col, mode in self._modes.items() if not mode))
+
+
+class _StyleTable:
+    """Interns resolved styles into the font/fill/border/xf tables of styles.xml."""
+
+    def __init__(self) -> None:
+        default_font = (DEFAULT_FONT_NAME, DEFAULT_FONT_SIZE, False, False, None)
+        self._fonts: dict[tuple[Any, ...], int] = {default_font: 0}
+        self._fills: dict[str | None, int] = {None: 0, "gray125": 1}
+        self._borders: dict[tuple[str, str] | None, int] = {None: 0}
+        self._formats: dict[str, int] = {}
+        self._xfs: dict[tuple[Any, ...], int] = {(0, 0, 0, 0, None): 0}
+        self._chains: dict[tuple[tuple[Style, ...], str | None], int] = {}
+
+    def __len__(self) -> int:
+        return len(self._xfs)
+
+    def xf_for(self, chain: tuple[Style, ...], default_format: str | None) -> int:
+        key = (chain, default_format)
+        xf = self._chains.get(key)
+        if xf is None:
+            xf = self._chains[key] = self._intern(_resolve_chain(chain), default_format)
+        return xf
+
+    def merge(self, local: _ChainIds) -> list[int]:
+        """Intern `local`'s chains in first-seen order; returns their xf ids here."""
+        return [self.xf_for(chain, default_format) for chain, default_format in local]
+
+    def _intern(self, effective: EffectiveStyle, default_format: str | None) -> int:
+        font_key = (
+            effective.font_name,
+            effective.font_size,
+            effective.bold,
+            effective.italic,
+            to_argb(effective.text_color),
+        )
+        font_id = self._fonts.setdefault(font_key, len(self._fonts))
+
+        fill_key = to_argb(effective.fill_color) if effective.fill_color else None
+        fill_id = self._fills.setdefault(fill_key, len(self._fills))
+
+        border_key = None
+        if effective.border and effective.border != "none":
+            color = effective.border_color or DEFAULT_BORDER_COLOR
+            border_key = (effective.border, to_argb(color))
+        border_id = self._borders.setdefault(border_key, len(self._borders))
+
+        number_format = effective.number_format or default_format
+        format_id = 0
+        if number_format and number_format != "General":
+            format_id = self._formats.setdefault(
+                number_format, 164 + len(self._formats)
+            )
+
+        alignment = None
+        if (
+            effective.horizontal_align
+            or effective.vertical_align
+            or effective.indent is not None
+            or effective.wrap_text
+        ):
+            alignment = (
+                effective.horizontal_align,
+                effective.vertical_align or "bottom",
+                effective.indent,
+                effective.wrap_text,
+            )
+
+        xf_key = (format_id, font_id, fill_id, border_id, alignment)
+        return self._xfs.setdefault(xf_key, len(self._xfs))
+
+    def to_xml(self) -> bytes:
+        parts = [_XML_HEADER, f'<styleSheet xmlns="{_SHEET_NS}">']
+        if self._formats:
+            parts.append(f'<numFmts count="{len(self._formats)}">')
+            parts.extend(
+                f"<numFmt numFmtId={quoteattr(str(format_id))} "
+                f"formatCode={quoteattr(code)}/>"
+                for code, format_id in self._formats.items()
+            )
+            parts.append("</numFmts>")
+
+        parts.append(f'<fonts count="{len(self._fonts)}">')
+        for name, size, bold_flag, italic_flag, color in self._fonts:
+            parts.append("<font>")
+            if bold_flag:
+                parts.append("<b/>")
+            if italic_flag:
+                parts.append("<i/>")
+            parts.append(f'<sz val="{_number(size)}"/>')
+            if color:
+                parts.append(f'<color rgb="{color}"/>')
+            parts.append(f"<name val={quoteattr(name)}/></font>")
+        parts.append("</fonts>")
+
+        parts.append(f'<fills count="{len(self._fills)}">')
+        parts.append('<fill><patternFill patternType="none"/></fill>')
+        parts.append('<fill><patternFill patternType="gray125"/></fill>')
+        for color in list(self._fills)[2:]:
+            parts.append(
+                '<fill><patternFill patternType="solid">'
+                f'<fgColor rgb="{color}"/><bgColor rgb="{color}"/>'
+                "</patternFill></fill>"
+            )
+        parts.append("</fills>")
+
+        parts.append(f'<borders count="{len(self._borders)}">')
+        for border in self._borders:
+            if border is None:
+                parts.append(
+                    "<border><left/><right/><top/><bottom/><diagonal/></border>"
+                )
+                continue
+            style, color = border
+            side = f'style="{style}"><color rgb="{color}"/>'
+            parts.append(
+                f"<border><left {side}</left><right {side}</right>"
+                f"<top {side}</top><bottom {side}</bottom><diagonal/></border>"
+            )
+        parts.append("</borders>")
+
+        parts.append(
+            '<cellStyleXfs count="1">'
+            '<xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+        )
+        parts.append(f'<cellXfs count="{len(self._xfs)}">')
+        for format_id, font_id, fill_id, border_id, alignment in self._xfs:
+            attrs = (
+                f'numFmtId="{format_id}" fontId="{font_id}" fillId="{fill_id}" '
+                f'borderId="{border_id}" xfId="0"'
+            )
+            if format_id:
+                attrs += ' applyNumberFormat="1"'
+            if font_id:
+                attrs += ' applyFont="1"'
+            if fill_id:
+                attrs += ' applyFill="1"'
+            if border_id:
+                attrs += ' applyBorder="1"'
+            if alignment is None:
+                parts.append(f"<xf {attrs}/>")
+                continue
+            horizontal, vertical, indent, wrap_text = alignment
+            align = ""
+            if horizontal:
+                align += f' horizontal="{horizontal}"'
+            align += f' vertical="{vertical}"'
+            if indent is not None:
+                align += f' indent="{indent}"'
+            if wrap_text:
+                align += ' wrapText="1"'
+            parts.append(f'<xf {attrs} applyAlignment="1"><alignment{align}/></xf>')
+        parts.append("</cellXfs>")
+        parts.append(
+            '<cellStyles count="1">'
+            '<cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+        )
+        parts.append("</styleSheet>")
+        return "".join(parts).encode("utf-8")
+
+
+class _ChainIds:
+    """Sheet-local stand-in for `_StyleTable`: numbers chains as first seen.
+
+    Lets a worker thread resolve a sheet without touching the workbook tables;
+    iterating yields the chains in id order for `_StyleTable.merge`.
+    """
+
+    def __init__(self) -> None:
+        self._ids: dict[tuple[tuple[Style, ...], str | None], int] = {}
+
+    def __iter__(self) -> Iterator[tuple[tuple[Style, ...], str | None]]:
+        return iter(self._ids)
+
+    def xf_for(self, chain: tuple[Style, ...], default_format: str | None) -> int:
+        key = (chain, default_format)
+        xf = self._ids.get(key)
+        if xf is None:
+            xf = self._ids[key] = len(self._ids)
+        return xf
+
+
+# A resolved cell: (column index, value, xf id, shared-string id or -1).
+_ResolvedCell = tuple[int, Any, int, int]
+_ResolvedRow = tuple[int, float, list[_ResolvedCell], int]
+
+
+@dataclass
+class _Band:
+    """Serialized `<row>` XML for a run of rows plus what the sheet head needs."""
+
+    xml: bytes
+    col_widths: dict[int, float]
+    last_row: int
+    max_col: int
+    rows: int
+    cells: int
+    inline_strings: int
+    outline_level: int = 0
+
+
+def _resolve_rows(
+    fragments: Iterable[
+        tuple[int, float, list[tuple[int, Any, tuple[Style, ...]]], int]
+    ],
+    styles: _StyleTable | _ChainIds,
+    strings: _SharedStrings,
+    columns: _StringColumns,
+) -> Iterator[_ResolvedRow]:
+    """Assign xf and shared-string ids in stream order.
+
+    This is the only stage that touches the workbook-wide tables, so running it
+    serially keeps numbering identical however the formatting is distributed.
+    """
+    from decimal import Decimal
+    from math import isfinite
+
+    xf_for = styles.xf_for
+    for row_index, height, cells, level in fragments:
+        resolved: list[_ResolvedCell] = []
+        for column_index, value, chain in cells:
+            kind = type(value)
+            sst = -1
+            default_format = None
+            if kind not in _NATIVE_TYPES:
+                entry = _converter_for(kind)
+                if entry is not None:
+                    value = entry.convert(value)
+                    kind = type(value)
+                    default_format = entry.number_format
+            if (kind is float or kind is Decimal) and not isfinite(value):
+                value = _non_finite_error(value)
+                kind = str
+            if kind is str:
+                xf = xf_for(chain, None)
+                if (
+                    value
+                    and not (len(value) > 1 and value[0] == "=")
+                    and value not in _ERROR_CODES
+                    and columns.shared(column_index, value)
+                ):
+                    sst = strings.add(value)
+            elif (
+                kind is int
+                or kind is float
+                or value is None
+                or isinstance(value, (int, float, Decimal))
+            ):
+                xf = xf_for(chain, default_format)
+            elif kind is _Formula:
+                xf = xf_for(chain, None)
+            else:
+                default_format = default_format or _temporal_format(value)
+                if default_format is None:
+                    msg = f"Cannot convert {value!r} to Excel"
+                    raise ValueError(msg)
+                xf = xf_for(chain, default_format)
+            resolved.append((column_index, value, xf, sst))
+        yield row_index, height, resolved, level
+
+
+# Filled on first use; concurrent writers store the same letters, so threads
+# share it without a lock.
+_LETTERS: dict[int, str] = {}
+
+
+def _format_rows(rows: Iterable[_ResolvedRow]) -> _Band:
+    """Serialize resolved rows to `<row>` XML; pure, so it can run in a worker."""
+    from math import isfinite
+
+    letters = _LETTERS
+    parts: list[str] = []
+    col_widths: dict[int, float] = {}
+    last_row = 0
+    max_col = 0
+    row_count = 0
+    cell_count = 0
+    inline_count = 0
+    outline_level = 0
+    for row_index, height, cells, level in rows:
+        row_attrs = ""
+        if height != DEFAULT_ROW_HEIGHT:
+            row_attrs = f' ht="{_number(height)}" customHeight="1"'
+        elif not cells:
+            continue
+        if level:
+            row_attrs += f' outlineLevel="{level}"'
+            if level > outline_level:
+                outline_level = level
+        row_ref = str(row_index)
+        parts.append(f'<row r="{row_ref}"{row_attrs}>')
+        for column_index, value, xf, sst in cells:
+            letter = letters.get(column_index)
+            if letter is None:
+                letter = letters[column_index] = _column_letter(column_index)
+            ref = letter + row_ref
+            kind = type(value)
+            if sst >= 0:
+                width = len(value)
+                parts.append(f'<c r="{ref}" s="{xf}" t="s"><v>{sst}</v></c>')
+            elif kind is str:
+                width = len(value)
+                if not width:
+                    parts.append(f'<c r="{ref}" s="{xf}"/>')
+                elif width > 1 and value[0] == "=":
+                    parts.append(
+                        f'<c r="{ref}" s="{xf}"><f>{escape(value[1:])}</f></c>'
+                    )
+                elif value in _ERROR_CODES:
+                    parts.append(f'<c r="{ref}" s="{xf}" t="e"><v>{value}</v></c>')
+                else:
+                    inline_count += 1
+                    parts.append(
+                        f'<c r="{ref}" s="{xf}" t="inlineStr">'
+                        f"<is>{_text_xml(value)}</is></c>"
+                    )
+            elif value is None:
+                width = 0
+                parts.append(f'<c r="{ref}" s="{xf}"/>')
+            elif isinstance(value, bool):
+                width = 4 if value else 5
+                parts.append(f'<c r="{ref}" s="{xf}" t="b"><v>{int(value)}</v></c>')
+            elif isinstance(value, (date, time, timedelta)):
+                width = len(str(value))
+                serial = _excel_serial(value)
+                parts.append(f'<c r="{ref}" s="{xf}" t="n"><v>{serial!r}</v></c>')
+            elif kind is _Formula:
+                result = value.value
+                cell_type = ""
+                if isinstance(result, float) and not isfinite(result):
+                    result = _non_finite_error(result)
+                    cell_type = ' t="e"'
+                cached = "" if result is None else str(result)
+                width = len(cached)
+                if cached:
+                    cached = f"<v>{cached}</v>"
+                parts.append(
+                    f'<c r="{ref}" s="{xf}"{cell_type}><f>{escape(value.text)}</f>'
+                    f"{cached}</c>"
+                )
+            else:
+                text = str(value)
+                width = len(text)
+                parts.append(f'<c r="{ref}" s="{xf}" t="n"><v>{text}</v></c>')
+            width_hint = max(width, 1.0)
+            if col_widths.get(column_index, 0.0) < width_hint:
+                col_widths[column_index] = width_hint
+            if column_index > max_col:
+                max_col = column_index
+        parts.append("</row>")
+        row_count += 1
+        cell_count += len(cells)
+        last_row = row_index
+    return _Band(
+        xml="".join(parts).encode("utf-8"),
+        col_widths=col_widths,
+        last_row=last_row,
+        max_col=max_col,
+        rows=row_count,
+        cells=cell_count,
+        inline_strings=inline_count,
+        outline_level=outline_level,
+    )
+
+
+def _format_bands(
+    rows: Iterable[_ResolvedRow], executor: Executor | None, workers: int
+) -> Iterator[_Band]:
+    """Format rows in order, fanning bands out to `executor` when one is given."""
+    from itertools import batched
+
+    if executor is None:
+        yield from map(_format_rows, batched(rows, _FLUSH_ROWS))
+        return
+    from ._bands import format_shared_band, release, share_band
+
+    # Ids, numbers and text reach the workers through shared memory; each
+    # segment is unlinked as soon as its band has been joined, or on the way
+    # out if the save fails.
+    pending: deque[tuple[SharedMemory, Future[_Band]]] = deque()
+    try:
+        for band in batched(rows, BAND_ROWS):
+            segment, handle = share_band(band)
+            try:
+                future = executor.submit(format_shared_band, handle)
+            except BaseException:
+                release(segment)
+                raise
+            pending.append((segment, future))
+            # Bound the number of bands in flight so memory stays flat.
+            if len(pending) > 2 * workers:
+                segment, future = pending[0]
+                result = future.result()
+                pending.popleft()
+                release(segment)
+                yield result
+        while pending:
+            segment, future = pending[0]
+            result = future.result()
+            pending.popleft()
+            release(segment)
+            yield result
+    finally:
+        for segment, future in pending:
+            future.cancel()
+        # Wait for workers still attached before unlinking their segments.
+        for segment, future in pending:
+            if not future.cancelled():
+                try:
+                    future.result()
+                except BaseException:
+                    pass
+            release(segment)
+
+
+def _write_sheet(
+    archive: zipfile.ZipFile,
+    part_name: str | zipfile.ZipInfo,
+    node: SheetNode,
+    *,
+    title: str,
+    selected: bool,
+    styles: _StyleTable,
+    strings: _SharedStrings,
+    strategy: StringsStrategy,
+    stats: RenderStats,
+    executor: Executor | None = None,
+    workers: int = 1,
+    monitor: _Monitor | None = None,
+) -> tuple[SheetStats, _TableMarks]:
+    columns = _StringColumns(strategy)
+    placements = _sheet_placements(node)
+    resolved = _resolve_rows(_iter_rows(placements), styles, strings, columns)
+    return _write_part(
+        archive,
+        part_name,
+        _format_bands(resolved, executor, workers),
+        placements=placements,
+        columns=columns,
+        title=title,
+        selected=selected,
+        stats=stats,
+        monitor=monitor,
+    )
+
+
+def _write_part(
+    archive: zipfile.ZipFile,
+    part_name: str | zipfile.ZipInfo,
+    bands: Iterable[_Band],
+    *,
+    placements: list[_Placement],
+    columns: _StringColumns,
+    title: str,
+    selected: bool,
+    stats: RenderStats,
+    monitor: _Monitor | None,
+) -> tuple[SheetStats, _TableMarks]:
+    """Write one worksheet part from its formatted bands.
+
+    Returns the sheet's stats and where its table bodies and footers landed.
+    """
+    import shutil
+    import tempfile
+
+    sheet_stats = SheetStats(name=title)
+    col_widths: dict[int, float] = {}
+    max_row = 0
+    max_col = 0
+    outline_level = 0
+
+    with tempfile.SpooledTemporaryFile(max_size=_BODY_SPOOL_SIZE) as body:
+        for band in bands:
+            body.write(band.xml)
+            for column_index, width in band.col_widths.items():
+                if col_widths.get(column_index, 0.0) < width:
+                    col_widths[column_index] = width
+            max_row = max(max_row, band.last_row)
+            max_col = max(max_col, band.max_col)
+            outline_level = max(outline_level, band.outline_level)
+            sheet_stats.rows += band.rows
+            sheet_stats.cells += band.cells
+            stats.inline_strings += band.inline_strings
+            if monitor is not None:
+                monitor.advance(band.rows, len(band.xml))
+
+        dimension = "A1"
+        if max_row and max_col:
+            dimension = f"A1:{_column_letter(max_col)}{max_row}"
+        head = [
+            _XML_HEADER,
+            f'<worksheet xmlns="{_SHEET_NS}" xmlns:r="{_REL_NS}">',
+            f'<dimension ref="{dimension}"/>',
+            '<sheetViews><sheetView workbookViewId="0"',
+            ' tabSelected="1"/>' if selected else "/>",
+            "</sheetViews>",
+            f'<sheetFormatPr baseColWidth="8" '
+            f'defaultRowHeight="{_number(DEFAULT_ROW_HEIGHT)}" customHeight="1"',
+            f' outlineLevelRow="{outline_level}"/>' if outline_level else "/>",
+        ]
+        col_widths.update(_column_width_hints(placements))
+        ranges = _column_ranges(col_widths)
+        if ranges:
+            head.append("<cols>")
+            head.extend(
+                f'<col min="{first}" max="{last}" width="{_number(width)}" '
+                'customWidth="1"/>'
+                for first, last, width in ranges
+            )
+            head.append("</cols>")
+        head.append("<sheetData>")
+        tail = (
+            "</sheetData>"
+            '<pageMargins left="0.75" right="0.75" top="1" bottom="1" '
+            'header="0.5" footer="0.5"/></worksheet>'
+        )
+
+        body.seek(0)
+        with archive.open(part_name, "w", force_zip64=True) as part:
+            part.write("".join(head).encode("utf-8"))
+            shutil.copyfileobj(body, part)
+            part.write(tail.encode("utf-8"))
+
+    sheet_stats.inline_columns = columns.inline_columns()
+    return sheet_stats, _table_marks(placements, max_row)
+
+
+@dataclass
+class _LocalSheet:
+    """A sheet resolved by a worker thread against sheet-local id tables."""
+
+    rows: list[_ResolvedRow]
+    styles: _ChainIds
+    strings: _SharedStrings
+    columns: _StringColumns
+    placements: list[_Placement]
+
+
+def _resolve_local(sheet: SheetNode, strategy: StringsStrategy) -> _LocalSheet:
+    placements = _sheet_placements(sheet)
+    styles = _ChainIds()
+    strings = _SharedStrings()
+    columns = _StringColumns(strategy)
+    rows = list(_resolve_rows(_iter_rows(placements), styles, strings, columns))
+    return _LocalSheet(rows, styles, strings, columns, placements)
+
+
+def _format_local(sheet: _LocalSheet, xf_ids: list[int], sst_ids: list[int]) -> _Band:
+    rows, sheet.rows = sheet.rows, []
+    return _format_rows(
+        (
+            row_index,
+            height,
+            [
+                (column_index, value, xf_ids[xf], sst_ids[sst] if sst >= 0 else -1)
+                for column_index, value, xf, sst in cells
+            ],
+            level,
+        )
+        for row_index, height, cells, level in rows
+    )
+
+
+def _threaded_sheets(
+    sheets: Iterable[SheetNode | SheetFactoryNode],
+    executor: Executor,
+    workers: int,
+    styles: _StyleTable,
+    strings: _SharedStrings,
+    strategy: StringsStrategy,
+) -> Iterator[tuple[_LocalSheet, _Band] | tuple[SheetNode, None]]:
+    """Resolve and format whole sheets on a thread pool, yielding them in order.
+
+    Workers number styles and strings per sheet. The local tables are merged
+    into the workbook tables here, in sheet order, which hands out exactly the
+    ids a serial save would; the rows are then formatted with those ids.
+
+    Sheet factories are built on this thread. Sheets that stream rows from a
+    source are yielded with no band, once every sheet before them has been
+    yielded, for the caller to write serially on this thread.
+    """
+    entries = iter(sheets)
+
+    def submit() -> None:
+        entry = next(entries, None)
+        if entry is None:
+            return
+        if isinstance(entry, SheetFactoryNode):
+            entry = _plan_lazy_sheet(build_sheet(entry))
+        if _streams_rows(entry):
+            resolving.append(entry)
+        else:
+            resolving.append(executor.submit(_resolve_local, entry, strategy))
+
+    resolving: deque[Future[_LocalSheet] | SheetNode] = deque()
+    formatting: deque[tuple[_LocalSheet, Future[_Band]]] = deque()
+    try:
+        for _ in range(workers):
+            submit()
+        while resolving or formatting:
+            head = resolving[0] if resolving else None
+            if isinstance(head, SheetNode):
+                while formatting:
+                    local, future = formatting.popleft()
+                    yield local, future.result()
+                resolving.popleft()
+                submit()
+                yield head, None
+                continue
+            if head is not None:
+                local = resolving.popleft().result()
+                submit()
+                xf_ids = styles.merge(local.styles)
+                sst_ids = strings.merge(local.strings)
+                formatting.append(
+                    (local, executor.submit(_format_local, local, xf_ids, sst_ids))
+                )
+            if formatting and (len(formatting) > workers or not resolving):
+                local, future = formatting.popleft()
+                yield local, future.result()
+    finally:
+        for pending in resolving:
+            if not isinstance(pending, SheetNode):
+                pending.cancel()
+        for _, future in formatting:
+            future.cancel()
+
+
+def _content_types_xml(sheet_count: int) -> bytes:
+    overrides = [
+        ("/xl/workbook.xml", f"{_CT_MAIN}.sheet.main+xml"),
+        ("/xl/styles.xml", f"{_CT_MAIN}.styles+xml"),
+        ("/xl/sharedStrings.xml", f"{_CT_MAIN}.sharedStrings+xml"),
+        (
+            "/docProps/core.xml",
+            "application/vnd.openxmlformats-package.core-properties+xml",
+        ),
+        (
+            "/docProps/app.xml",
+            "application/vnd.openxmlformats-officedocument.extended-properties+xml",
+        ),
+    ]
+    overrides.extend(
+        (f"/xl/worksheets/sheet{index}.xml", f"{_CT_MAIN}.worksheet+xml")
+        for index in range(1, sheet_count + 1)
+    )
+    parts = [
+        _XML_HEADER,
+        f'<Types xmlns="{_CT_NS}">',
+        '<Default Extension="rels" '
+        'ContentType="application/vnd.openxmlformats-package.relationships+xml"/>',
+        '<Default Extension="xml" ContentType="application/xml"/>',
+    ]
+    parts.extend(
+        f'<Override PartName="{name}" ContentType="{content_type}"/>'
+        for name, content_type in overrides
+    )
+    parts.append("</Types>")
+    return "".join(parts).encode("utf-8")
+
+
+def _root_rels_xml() -> bytes:
+    return (
+        f'{_XML_HEADER}<Relationships xmlns="{_PKG_REL_NS}">'
+        f'<Relationship Id="rId1" Type="{_REL_NS}/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        f'<Relationship Id="rId2" Type="{_PKG_REL_NS}/metadata/core-properties" '
+        'Target="docProps/core.xml"/>'
+        f'<Relationship Id="rId3" Type="{_REL_NS}/extended-properties" '
+        'Target="docProps/app.xml"/>'
+        "</Relationships>"
+    ).encode("utf-8")
+
+
+def _defined_rows(
+    name: str, index: int, title: str, spans: Iterable[tuple[int, int]]
+) -> str:
+    """A hidden, sheet-local defined name covering whole rows `first:last`."""
+    quoted = title.replace("'", "''")
+    ref = ",".join(f"'{quoted}'!${first}:${last}" for first, last in spans)
+    return (
+        f'<definedName name="{name}" localSheetId="{index}" hidden="1">'
+        f"{escape(ref)}</definedName>"
+    )
+
+
+def _workbook_xml(titles: list[str], marks: list[_TableMarks]) -> bytes:
+    sheets = "".join(
+        f'<sheet name={quoteattr(title)} sheetId="{index}" r:id="rId{index}"/>'
+        for index, title in enumerate(titles, start=1)
+    )
+    # Table bodies and footers are recorded as hidden names so `append_rows`
+    # can copy body rows and refuse to append below a footer.
+    names = "".join(
+        _defined_rows(name, index, title, spans)
+        for index, (title, sheet_marks) in enumerate(zip(titles, marks))
+        for name, spans in (
+            (_BODY_NAME, sheet_marks.bodies),
+            (_FOOTER_NAME, [(row, row) for row in sheet_marks.footers]),
+        )
+        if spans
+    )
+    if names:
+        names = f"<definedNames>{names}</definedNames>"
+    return (
+        f'{_XML_HEADER}<workbook xmlns="{_SHEET_NS}" xmlns:r="{_REL_NS}">'
+        '<bookViews><workbookView activeTab="0"/></bookViews>'
+        f"<sheets>{sheets}</sheets>{names}</workbook>"
+    ).encode("utf-8")
+
+
+def _workbook_rels_xml(sheet_count: int) -> bytes:
+    rels = [
+        f'<Relationship Id="rId{index}" Type="{_REL_NS}/worksheet" '
+        f'Target="worksheets/sheet{index}.xml"/>'
+        for index in range(1, sheet_count + 1)
+    ]
+    rels.append(
+        f'<Relationship Id="rId{sheet_count + 1}" Type="{_REL_NS}/styles" '
+        'Target="styles.xml"/>'
+    )
+    rels.append(
+        f'<Relationship Id="rId{sheet_count + 2}" Type="{_REL_NS}/sharedStrings" '
+        'Target="sharedStrings.xml"/>'
+    )
+    return (
+        f'{_XML_HEADER}<Relationships xmlns="{_PKG_REL_NS}">'
+        + "".join(rels)
+        + "</Relationships>"
+    ).encode("utf-8")
+
+
+def _core_xml(created: datetime) -> bytes:
+    stamp = created.strftime("%Y-%m-%dT%H:%M:%SZ")
+    return (
+        f"{_XML_HEADER}<cp:coreProperties "
+        'xmlns:cp="http://schemas.openxmlformats.org/package/2006/metadata/core-properties" '
+        'xmlns:dc="http://purl.org/dc/elements/1.1/" '
+        'xmlns:dcterms="http://purl.org/dc/terms/" '
+        'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">'
+        "<dc:creator>xpyxl</dc:creator>"
+        f'<dcterms:created xsi:type="dcterms:W3CDTF">{stamp}</dcterms:created>'
+        f'<dcterms:modified xsi:type="dcterms:W3CDTF">{stamp}</dcterms:modified>'
+        "</cp:coreProperties>"
+    ).encode("utf-8")
+
+
+def _app_xml() -> bytes:
+    return (
+        f"{_XML_HEADER}<Properties "
+        'xmlns="http://schemas.openxmlformats.org/officeDocument/2006/extended-properties">'
+        "<Application>xpyxl</Application></Properties>"
+    ).encode("utf-8")
+
+
+# Earliest timestamp a zip entry can carry; used by deterministic saves unless
+# SOURCE_DATE_EPOCH is set.
+_ZIP_EPOCH = datetime(1980, 1, 1, tzinfo=timezone.utc)
+
+
+def _reproducible_time() -> datetime:
+    import os
+
+    epoch = os.environ.get("SOURCE_DATE_EPOCH")
+    if not epoch:
+        return _ZIP_EPOCH
+    return max(datetime.fromtimestamp(int(epoch), timezone.utc), _ZIP_EPOCH)
+
+
+class _PartNames:
+    """Zip entry names, or ZipInfo records with fixed metadata when reproducible."""
+
+    def __init__(self, timestamp: datetime | None) -> None:
+        self._date_time = None if timestamp is None else timestamp.timetuple()[:6]
+
+    def __call__(self, name: str) -> str | zipfile.ZipInfo:
+        if self._date_time is None:
+            return name
+        import zipfile
+
+        info = zipfile.ZipInfo(name, self._date_time)
+        info.compress_type = zipfile.ZIP_DEFLATED
+        info.create_system = 3
+        info.external_attr = 0o644 << 16
+        return info
+
+
+class _HashingWriter:
+    """Write-only, non-seekable sink that hashes what it forwards.
+
+    zipfile cannot seek back into it, so every entry is written with a data
+    descriptor and the bytes hashed are exactly the bytes of the file.
+    """
+
+    def __init__(self, digest: Any, file: Any = None) -> None:
+        self._digest = digest
+        self._file = file
+
+    def write(self, data: bytes) -> int:
+        self._digest.update(data)
+        if self._file is not None:
+            self._file.write(data)
+        return len(data)
+
+    def flush(self) -> None:
+        if self._file is not None:
+            self._file.flush()
+
+
+@contextmanager
+def _atomic_output(path: str | Path) -> Iterator[str]:
+    """Yield a temp path next to `path` that replaces it only on success.
+
+    The result keeps the mode of the file it replaces, or gets the usual
+    umask-derived mode for a new file, rather than mkstemp's private 0600.
+    """
+    import os
+    import stat
+    import tempfile
+
+    target = os.fspath(path)
+    handle, temp_path = tempfile.mkstemp(
+        suffix=".xlsx", dir=os.path.dirname(os.path.abspath(target))
+    )
+    os.close(handle)
+    try:
+        yield temp_path
+        try:
+            mode = stat.S_IMODE(os.stat(target).st_mode)
+        except FileNotFoundError:
+            umask = os.umask(0)
+            os.umask(umask)
+            mode = 0o666 & ~umask
+        os.chmod(temp_path, mode)
+        os.replace(temp_path, target)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def write_workbook(
+    node: WorkbookNode,
+    path: str | Path | None,
+    *,
+    strings: StringsStrategy = "auto",
+    workers: int = 1,
+    pool: PoolKind = "process",
+    progress: ProgressCallback | None = None,
+    cancel: CancelToken | None = None,
+    deadline: float | None = None,
+    deterministic: bool = False,
+) -> RenderStats:
+    """Stream `node` to an .xlsx package without building an openpyxl workbook.
+
+    With `workers > 1` the `<row>` XML of each sheet is formatted in bands of
+    `BAND_ROWS` rows by a process pool. Style and shared-string ids are still
+    assigned in the parent in row order, so the file is byte-identical to a
+    serial save.
+
+    `pool="thread"` instead renders whole sheets concurrently on a thread
+    pool, resolving ids per sheet and merging them in sheet order, so the file
+    is again byte-identical. Sheet factories are still built on the calling
+    thread, and sheets with a streamed table (cursors, async sources) are
+    rendered there as well, since their sources are bound to it. Progress is
+    reported once per sheet.
+
+    `progress` is called after every formatted band. `cancel` and `deadline`
+    (a `time.monotonic()` timestamp) are checked at the same points and abort
+    with `RenderCancelled` / `TimeoutError`. The package is written to a temp
+    file that only replaces `path` once complete, so an aborted or failed
+    save leaves no partial file behind.
+
+    `deterministic=True` pins every timestamp and zip attribute so the same
+    tree always produces the same bytes, and records their SHA-256 in
+    `RenderStats.digest`. With `path=None` only the digest is computed.
+    """
+    import zipfile
+    from contextlib import ExitStack, closing
+
+    if strings not in ("shared", "inline", "auto"):
+        msg = f"Unknown strings strategy '{strings}'"
+        raise ValueError(msg)
+    if workers < 1:
+        raise ValueError("workers must be >= 1")
+    if pool not in ("process", "thread"):
+        msg = f"Unknown pool '{pool}'"
+        raise ValueError(msg)
+    if path is None and not deterministic:
+        raise ValueError("path=None is only supported with deterministic=True")
+    stats = RenderStats(strings=strings)
+    styles = _StyleTable()
+    shared = _SharedStrings()
+    # Oversized tables are spilled and limits checked for every prebuilt sheet
+    # before anything is written.
+    sheets = _plan_sheets(node.sheets)
+    titles = _unique_titles(sheet.name for sheet in sheets)
+    monitor = _Monitor.create(
+        progress=progress, cancel=cancel, deadline=deadline, sheet_count=len(sheets)
+    )
+    created = _reproducible_time() if deterministic else datetime.now(timezone.utc)
+    part = _PartNames(created if deterministic else None)
+
+    with ExitStack() as stack:
+        executor = None
+        if workers > 1 and pool == "thread":
+            from concurrent.futures import ThreadPoolExecutor
+
+            executor = stack.enter_context(ThreadPoolExecutor(max_workers=workers))
+        elif workers > 1:
+            import multiprocessing
+            import threading
+            from concurrent.futures import ProcessPoolExecutor
+
+            context = None
+            # fork() from a process with other threads (save_async renders on
+            # one) can deadlock the child, so start workers from a server.
+            if (
+                threading.active_count() > 1
+                and "forkserver" in multiprocessing.get_all_start_methods()
+            ):
+                context = multiprocessing.get_context("forkserver")
+            executor = stack.enter_context(
+                ProcessPoolExecutor(max_workers=workers, mp_context=context)
+            )
+        target: Any = None
+        if path is not None:
+            target = stack.enter_context(_atomic_output(path))
+        digest = None
+        if deterministic:
+            import hashlib
+
+            digest = hashlib.sha256()
+            file = None
+            if target is not None:
+                file = stack.enter_context(open(target, "wb"))
+            target = _HashingWriter(digest, file)
+        archive = stack.enter_context(
+            zipfile.ZipFile(
+                target, "w", compression=zipfile.ZIP_DEFLATED, allowZip64=True
+            )
+        )
+        archive.writestr(part("[Content_Types].xml"), _content_types_xml(len(titles)))
+        archive.writestr(part("_rels/.rels"), _root_rels_xml())
+        archive.writestr(part("docProps/app.xml"), _app_xml())
+        archive.writestr(part("docProps/core.xml"), _core_xml(created))
+        archive.writestr(
+            part("xl/_rels/workbook.xml.rels"), _workbook_rels_xml(len(titles))
+        )
+        threaded = None
+        if executor is not None and pool == "thread":
+            # Closed before the pool shuts down, so queued sheets are dropped
+            # when the save fails.
+            threaded = stack.enter_context(
+                closing(
+                    _threaded_sheets(sheets, executor, workers, styles, shared, strings)
+                )
+            )
+        marks: list[_TableMarks] = []
+        for index, (entry, title) in enumerate(zip(sheets, titles), start=1):
+            if monitor is not None:
+                monitor.start_sheet(index - 1, title)
+            sheet = entry
+            if threaded is not None:
+                local, band = next(threaded)
+                if band is None:
+                    # A streamed sheet: written below, on this thread.
+                    sheet = local
+                else:
+                    sheet_stats, sheet_marks = _write_part(
+                        archive,
+                        part(f"xl/worksheets/sheet{index}.xml"),
+                        (band,),
+                        placements=local.placements,
+                        columns=local.columns,
+                        title=title,
+                        selected=index == 1,
+                        stats=stats,
+                        monitor=monitor,
+                    )
+                    stats.sheets.append(sheet_stats)
+                    marks.append(sheet_marks)
+                    continue
+            elif isinstance(entry, SheetFactoryNode):
+                # Sheet factories run here, one at a time; the built tree is
+                # dropped before the next sheet is built.
+                sheet = _plan_lazy_sheet(build_sheet(entry))
+            sheet_stats, sheet_marks = _write_sheet(
+                archive,
+                part(f"xl/worksheets/sheet{index}.xml"),
+                sheet,
+                title=title,
+                selected=index == 1,
+                styles=styles,
+                strings=shared,
+                strategy=strings,
+                stats=stats,
+                # Thread pools render whole sheets; only processes take bands.
+                executor=executor if threaded is None else None,
+                workers=workers,
+                monitor=monitor,
+            )
+            stats.sheets.append(sheet_stats)
+            marks.append(sheet_marks)
+            del sheet
+        archive.writestr(part("xl/workbook.xml"), _workbook_xml(titles, marks))
+        archive.writestr(part("xl/styles.xml"), styles.to_xml())
+        archive.writestr(part("xl/sharedStrings.xml"), shared.to_xml())
+        # Close the archive first so the central directory is hashed too.
+        archive.close()
+        if digest is not None:
+            stats.digest = digest.hexdigest()
+
+    stats.shared_strings = len(shared)
+    stats.string_lookups = shared.lookups
+    return stats
@@ -1,24 +1,46 @@
 from __future__ import annotations
 
-from collections.abc import Sequence
-from typing import Any
-
+from collections.abc import (
+    AsyncIterable,
+    Callable,
+    Iterable,
+    Iterator,
+    Mapping,
+    Sequence,
+)
+from contextlib import contextmanager
+from contextvars import ContextVar
+from operator import itemgetter
+from typing import TYPE_CHECKING, Any
+
+from ._cursor import CursorSource
+from ._groups import MAX_GROUP_KEYS, group_records
+from ._records import record_adapter
 from ._workbook import Workbook
 from .nodes import (
+    Aggregate,
     CellNode,
     ColumnNode,
     HorizontalStackNode,
+    OverflowPolicy,
     RowNode,
+    RowSource,
     SheetComponent,
+    SheetFactoryNode,
     SheetItem,
     SheetNode,
     SpacerNode,
+    TableFooter,
     TableNode,
+    TableOutline,
     VerticalStackNode,
     WorkbookNode,
 )
 from .styles import Style
 
+if TYPE_CHECKING:
+    FooterSpec = Mapping[str | int, Aggregate] | Sequence[Aggregate | None]
+
 __all__ = [
     "cell",
     "col",
@@ -26,6 +48,7 @@ __all__ = [
     "space",
     "vstack",
     "hstack",
+    "interning",
     "sheet",
     "table",
     "workbook",
@@ -43,6 +66,10 @@ Node = (
 )
 
 
+# Bulk builders only inspect this many leading rows for misplaced nodes.
+BULK_SAMPLE_SIZE = 64
+
+
 def _as_tuple(values: Any) -> tuple[Any, ...]:
     if isinstance(values, tuple):
         return values
@@ -53,15 +80,107 @@ def _as_tuple(values: Any) -> tuple[Any, ...]:
     return (values,)
 
 
+# Value types whose equal instances always render alike. Equal Decimals
+# ("1.0" vs "1.00") or aware datetimes in other zones do not, so those cells
+# are never shared. Floats are keyed by their hex form to keep -0.0 apart.
+_INTERNED_VALUES = frozenset({str, int, bool, type(None)})
+
+
+class _InternTable:
+    """Canonical cells and style tuples for one `interning()` block.
+
+    Each table stops growing at `max_size` entries; later misses build fresh
+    objects as usual.
+    """
+
+    __slots__ = ("_by_ids", "_styles", "_cells", "_max_size")
+
+    def __init__(self, max_size: int) -> None:
+        self._by_ids: dict[tuple[int, ...], tuple[Style, ...]] = {}
+        self._styles: dict[tuple[Style, ...], tuple[Style, ...]] = {}
+        self._cells: dict[tuple[Any, ...], CellNode] = {}
+        self._max_size = max_size
+
+    def _canonical(self, styles: tuple[Style, ...]) -> tuple[Style, ...] | None:
+        # Style instances are mostly shared module constants, so look them up
+        # by id before hashing every field. Only canonical tuples are keyed
+        # that way; they keep their members alive, so the ids stay valid.
+        canonical = self._by_ids.get(tuple(map(id, styles)))
+        if canonical is not None:
+            return canonical
+        canonical = self._styles.get(styles)
+        if canonical is None and len(self._styles) < self._max_size:
+            canonical = self._styles[styles] = styles
+            self._by_ids[tuple(map(id, styles))] = styles
+        return canonical
+
+    def styles(self, styles: tuple[Style, ...]) -> tuple[Style, ...]:
+        canonical = self._canonical(styles)
+        return styles if canonical is None else canonical
+
+    def cell(self, value: Any, styles: tuple[Style, ...] = ()) -> CellNode:
+        kind = type(value)
+        if kind is float:
+            key_value = value.hex()
+        elif kind in _INTERNED_VALUES:
+            key_value = value
+        else:
+            return CellNode(value=value, styles=styles)
+        canonical = self._canonical(styles)
+        if canonical is None:
+            # The style table is full, so there is no stable id to key on.
+            return CellNode(value=value, styles=styles)
+        key = (kind, key_value, id(canonical))
+        node = self._cells.get(key)
+        if node is None:
+            node = CellNode(value=value, styles=canonical)
+            if len(self._cells) < self._max_size:
+                self._cells[key] = node
+        return node
+
+
+_INTERN: ContextVar[_InternTable | None] = ContextVar("xpyxl_intern", default=None)
+
+
+@contextmanager
+def interning(max_size: int = 65_536) -> Iterator[None]:
+    """Share equal cells and style tuples among nodes built inside the block.
+
+    Builders return one canonical `CellNode` for equal plain values (text,
+    numbers, booleans, None) with equal styles, and one tuple per distinct
+    style list, which cuts memory on repetitive reports. Each table holds at
+    most `max_size` entries and is dropped when the block exits.
+    """
+    if max_size < 1:
+        msg = "Interning table size must be >= 1"
+        raise ValueError(msg)
+    token = _INTERN.set(_InternTable(max_size))
+    try:
+        yield
+    finally:
+        _INTERN.reset(token)
+
+
 def _ensure_cell(value: Any) -> CellNode:
     if isinstance(value, CellNode):
         return value
     if isinstance(value, (RowNode, ColumnNode, TableNode)):
         msg = "Cannot nest row/column/table directly inside a cell"
         raise TypeError(msg)
+    table = _INTERN.get()
+    if table is not None:
+        return table.cell(value)
     return CellNode(value=value)
 
 
+def _style_tuple(styles: Sequence[Style] | None) -> tuple[Style, ...]:
+    result = tuple(styles or ())
+    table = _INTERN.get()
+    if table is not None and result:
+        return table.styles(result)
+    return result
+
+
 def _ensure_component(value: Any) -> SheetComponent:
     if isinstance(value, Node):
         return value
@@ -73,18 +192,45 @@ def _coerce_row(value: Any, extra_styles: Sequence[Style] = ()) -> RowNode:
     if isinstance(value, RowNode):
         if not extra_styles:
             return value
-        return RowNode(cells=value.cells, styles=tuple(extra_styles) + value.styles)
+        return RowNode(
+            cells=value.cells, styles=_style_tuple((*extra_styles, *value.styles))
+        )
     cells = tuple(_ensure_cell(item) for item in _as_tuple(value))
-    return RowNode(cells=cells, styles=tuple(extra_styles))
+    return RowNode(cells=cells, styles=_style_tuple(extra_styles))
+
+
+def _check_records(records: tuple[tuple[Any, ...], ...]) -> None:
+    for record in records[:BULK_SAMPLE_SIZE]:
+        for value in record:
+            if isinstance(value, Node):
+                msg = (
+                    "Bulk table rows accept plain values. "
+                    "Use table()[...] for rows with styled cells."
+                )
+                raise TypeError(msg)
+
+
+def _as_records(rows: Iterable[Sequence[Any]]) -> tuple[tuple[Any, ...], ...]:
+    materialized = tuple(rows)
+    for row in materialized[:BULK_SAMPLE_SIZE]:
+        if isinstance(row, (str, bytes, bytearray)) or isinstance(row, Node):
+            msg = "Bulk table rows must be plain sequences of values"
+            raise TypeError(msg)
+    records = tuple(map(tuple, materialized))
+    _check_records(records)
+    return records
 
 
 class _BuilderBase:
     def __init__(self, *, styles: Sequence[Style] | None = None) -> None:
-        self._styles: tuple[Style, ...] = tuple(styles or ())
+        self._styles: tuple[Style, ...] = _style_tuple(styles)
 
 
 class CellBuilder(_BuilderBase):
     def __getitem__(self, value: Any) -> CellNode:
+        table = _INTERN.get()
+        if table is not None:
+            return table.cell(value, self._styles)
         return CellNode(value=value, styles=self._styles)
 
 
@@ -100,6 +246,46 @@ class ColumnBuilder(_BuilderBase):
         return ColumnNode(cells=cells, styles=self._styles)
 
 
+_AGGREGATES = frozenset(("sum", "mean", "min", "max", "count"))
+
+
+def _column_offset(key: str | int, header: RowNode | None) -> int:
+    """Column offset of `key`, a header name or an offset."""
+    if isinstance(key, int) and not isinstance(key, bool):
+        if key < 0:
+            msg = "Column offsets must be >= 0"
+            raise ValueError(msg)
+        return key
+    names = [cell.value for cell in header.cells] if header is not None else []
+    if key not in names:
+        msg = f"Column '{key}' is not in the table header"
+        raise ValueError(msg)
+    return names.index(key)
+
+
+def _footer_aggregates(
+    spec: FooterSpec, header: RowNode | None
+) -> tuple[Aggregate | None, ...]:
+    if isinstance(spec, (str, bytes)):
+        msg = (
+            "Aggregates take a mapping of columns to aggregates or one entry per column"
+        )
+        raise TypeError(msg)
+    if not isinstance(spec, Mapping):
+        aggregates = tuple(spec)
+    else:
+        by_offset = {
+            _column_offset(key, header): aggregate for key, aggregate in spec.items()
+        }
+        width = max(by_offset, default=-1) + 1
+        aggregates = tuple(by_offset.get(offset) for offset in range(width))
+    for aggregate in aggregates:
+        if aggregate is not None and aggregate not in _AGGREGATES:
+            msg = f"Unknown aggregate '{aggregate}'"
+            raise ValueError(msg)
+    return aggregates
+
+
 class TableBuilder(_BuilderBase):
     def __init__(
         self,
@@ -107,19 +293,245 @@ class TableBuilder(_BuilderBase):
         header: Any | None = None,
         styles: Sequence[Style] | None = None,
         header_style: Sequence[Style] | None = None,
+        footer: FooterSpec | None = None,
+        footer_style: Sequence[Style] | None = None,
+        footer_label: str | None = None,
+        footer_formulas: bool = False,
+        overflow: OverflowPolicy = "error",
     ) -> None:
         super().__init__(styles=styles)
+        if overflow not in ("error", "spill"):
+            msg = f"Unknown overflow policy '{overflow}'"
+            raise ValueError(msg)
+        if footer is not None and overflow == "spill":
+            msg = "Footer aggregates cover one sheet, so tables with a footer cannot spill"
+            raise ValueError(msg)
         self._header_raw = header
-        self._header_styles: tuple[Style, ...] = tuple(header_style or ())
+        self._header_styles: tuple[Style, ...] = _style_tuple(header_style)
+        self._footer_raw = footer
+        self._footer_styles: tuple[Style, ...] = _style_tuple(footer_style)
+        self._footer_label = footer_label
+        self._footer_formulas = footer_formulas
+        self._overflow: OverflowPolicy = overflow
+
+    def _header_node(self, header: Any | None) -> RowNode | None:
+        if header is None:
+            return None
+        return _coerce_row(header, extra_styles=self._header_styles)
+
+    def _footer(self, header: RowNode | None) -> TableFooter | None:
+        if self._footer_raw is None:
+            return None
+        aggregates = _footer_aggregates(self._footer_raw, header)
+        if self._footer_label is not None:
+            if aggregates and aggregates[0] is not None:
+                msg = "The footer label takes the first column, which has an aggregate"
+                raise ValueError(msg)
+            aggregates = aggregates or (None,)
+        return TableFooter(
+            aggregates=aggregates,
+            styles=self._footer_styles,
+            label=self._footer_label,
+            formulas=self._footer_formulas,
+        )
+
+    def _table(self, header: Any | None, **fields: Any) -> TableNode:
+        header_node = self._header_node(header)
+        return TableNode(
+            styles=self._styles,
+            header=header_node,
+            overflow=self._overflow,
+            footer=self._footer(header_node),
+            **fields,
+        )
 
     def __getitem__(self, rows: Sequence[RowNode] | Sequence[list]) -> TableNode:
         row_nodes = tuple(_coerce_row(row) for row in _as_tuple(rows))
-        header_node = None
-        if self._header_raw is not None:
-            header_node = _coerce_row(
-                self._header_raw, extra_styles=self._header_styles
-            )
-        return TableNode(rows=row_nodes, styles=self._styles, header=header_node)
+        return self._table(self._header_raw, rows=row_nodes)
+
+    def from_records(self, records: Iterable[Sequence[Any]]) -> TableNode:
+        """Build the body from plain value rows without wrapping each value.
+
+        Only the first `BULK_SAMPLE_SIZE` rows are checked for nested nodes, so
+        use `table()[...]` when rows carry styled cells.
+        """
+        return self._table(self._header_raw, rows=(), records=_as_records(records))
+
+    def from_rows(self, rows: Sequence[Sequence[Any]]) -> TableNode:
+        """Alias of `from_records` for an in-memory list of lists."""
+        return self.from_records(rows)
+
+    def from_objects(
+        self,
+        objects: Iterable[Any],
+        *,
+        record_type: type | None = None,
+    ) -> TableNode:
+        """Build the body from dataclass, NamedTuple or `__slots__` instances.
+
+        The record type (taken from the first object unless `record_type` is
+        given) is inspected once: its fields become the header, and
+        `Annotated[..., style]` / `Annotated[..., column_hint(...)]` metadata
+        sets per-column body styles and widths. Values are pulled with a single
+        precompiled getter call per record.
+        """
+        items = objects if isinstance(objects, Sequence) else list(objects)
+        kind = record_type
+        if kind is None and items:
+            kind = type(items[0])
+        if kind is None:
+            return self.from_records(())
+        adapter = record_adapter(kind)
+        if adapter.extract is None:
+            records = tuple(items)
+        else:
+            records = tuple(map(adapter.extract, items))
+        header = self._header_raw
+        if header is None:
+            header = list(adapter.headers)
+        return self._table(
+            header,
+            rows=(),
+            records=records,
+            column_styles=adapter.column_styles,
+            column_widths=adapter.column_widths,
+        )
+
+    def from_dicts(
+        self,
+        records: Iterable[Mapping[str, Any]],
+        *,
+        columns: Sequence[str] | None = None,
+    ) -> TableNode:
+        """Build the body from mappings, one column per key in `columns`.
+
+        `columns` defaults to the keys of the first mapping and doubles as the
+        header when the table was created without one. Missing keys become
+        empty cells.
+        """
+        rows = records if isinstance(records, Sequence) else list(records)
+        keys = tuple(columns) if columns is not None else tuple(rows[0] if rows else ())
+        body: tuple[tuple[Any, ...], ...] = ()
+        if keys:
+            try:
+                if len(keys) == 1:
+                    (key,) = keys
+                    body = tuple((row[key],) for row in rows)
+                else:
+                    body = tuple(map(itemgetter(*keys), rows))
+            except KeyError:
+                body = tuple(tuple(row.get(key) for key in keys) for row in rows)
+        _check_records(body)
+        header = self._header_raw
+        if header is None and keys:
+            header = list(keys)
+        return self._table(header, rows=(), records=body)
+
+    def grouped(
+        self,
+        records: Iterable[Sequence[Any]] | Mapping[str, Sequence[Any]],
+        *,
+        by: Sequence[str | int],
+        aggregates: FooterSpec,
+        subtotal_style: Sequence[Style] | None = None,
+        label: str = "{} Total",
+        grand_total: str | None = "Grand Total",
+    ) -> TableNode:
+        """Group bulk rows on the `by` columns, closing each group with a subtotal.
+
+        `records` are value rows, or a mapping of column names to values that
+        also serves as the header when none was given. Rows are bucketed in one
+        hashing pass, and groups keep the order they first appear in, nested in
+        `by` order. `aggregates` takes the same forms as `footer`. Each subtotal
+        row shows `label` formatted with the group value, in that group's
+        column. `grand_total` labels a closing row over all rows; pass None to
+        omit it. Rows get Excel outline levels, so the report folds by group.
+        """
+        if self._footer_raw is not None:
+            msg = "Grouped tables end with their own grand total, not a footer"
+            raise ValueError(msg)
+        header = self._header_raw
+        if isinstance(records, Mapping):
+            if header is None:
+                header = list(records)
+            body = tuple(zip(*records.values(), strict=True))
+            _check_records(body)
+        else:
+            body = _as_records(records)
+        header_node = self._header_node(header)
+        if not by:
+            msg = "Grouping needs at least one `by` column"
+            raise ValueError(msg)
+        if len(by) > MAX_GROUP_KEYS:
+            msg = f"Excel outlines nest at most {MAX_GROUP_KEYS} groups deep"
+            raise ValueError(msg)
+        keys = tuple(_column_offset(key, header_node) for key in by)
+        columns = _footer_aggregates(aggregates, header_node)
+        if any(offset < len(columns) and columns[offset] for offset in keys):
+            msg = "Group columns hold the subtotal labels and cannot be aggregated"
+            raise ValueError(msg)
+        width = max(
+            max(map(len, body), default=0),
+            len(columns),
+            max(keys) + 1,
+            len(header_node.cells) if header_node is not None else 0,
+        )
+        rows, levels = group_records(
+            body,
+            by=keys,
+            aggregates=columns,
+            width=width,
+            label=label,
+            grand_total=grand_total,
+        )
+        outline = TableOutline(
+            levels=levels, detail=len(keys) + 1, styles=_style_tuple(subtotal_style)
+        )
+        return self._table(header, rows=(), records=rows, outline=outline)
+
+    def _streamed(
+        self, header: Any | None, source: RowSource, **fields: Any
+    ) -> TableNode:
+        if self._overflow == "spill":
+            msg = "Streamed tables cannot spill; their row count is unknown"
+            raise ValueError(msg)
+        return self._table(header, rows=(), source=source, **fields)
+
+    def from_cursor(self, cursor: Any, *, batch_size: int | None = None) -> TableNode:
+        """Stream the body from an executed DB-API 2.0 cursor while saving.
+
+        Column names from `cursor.description` become the header unless one was
+        given, and fixed-point columns with a reported scale get a matching
+        number format. Rows are pulled with `fetchmany(batch_size)` (default:
+        the cursor's `arraysize`, or 1000 when it is left at 1) and
+        written as they arrive. The table must be the last item of its sheet
+        and renders once, since a cursor can only be read once.
+        """
+        source = CursorSource(cursor, batch_size=batch_size)
+        header = self._header_raw
+        if header is None:
+            header = list(source.headers)
+        return self._streamed(header, source, column_styles=source.column_styles)
+
+    def from_async(
+        self,
+        rows: AsyncIterable[Sequence[Any]],
+        *,
+        batch_size: int = 1000,
+        prefetch: int = 4,
+    ) -> TableNode:
+        """Stream the body from an async iterable of value rows.
+
+        Only `Workbook.save_async` can render the table. There the iterable is
+        drained on the event loop into a queue of at most `prefetch` batches of
+        `batch_size` rows, so fetching the next page overlaps with writing the
+        current one. The same rules as for `from_cursor` apply.
+        """
+        # asyncio is only imported when an async source is actually built.
+        from ._async import AsyncRowSource
+
+        source = AsyncRowSource(rows, batch_size=batch_size, prefetch=prefetch)
+        return self._streamed(self._header_raw, source)
 
 
 class SheetBuilder:
@@ -139,12 +551,23 @@ class SheetBuilder:
                 raise TypeError(msg)
         return SheetNode(name=self._name, items=tuple(entries))
 
+    def lazy(self, factory: Callable[[], SheetNode]) -> SheetFactoryNode:
+        """Defer building the sheet until save, then drop it once written.
+
+        `factory` is called once per render and should return a `SheetNode`;
+        the sheet keeps the name given here.
+        """
+        if not callable(factory):
+            msg = "Sheet factories must be callables returning a SheetNode"
+            raise TypeError(msg)
+        return SheetFactoryNode(name=self._name, build=factory)
+
 
 class WorkbookBuilder:
     def __getitem__(self, sheets: Any) -> Workbook:
-        sheet_nodes: list[SheetNode] = []
+        sheet_nodes: list[SheetNode | SheetFactoryNode] = []
         for item in _as_tuple(sheets):
-            if isinstance(item, SheetNode):
+            if isinstance(item, (SheetNode, SheetFactoryNode)):
                 sheet_nodes.append(item)
             else:
                 raise TypeError(
@@ -171,8 +594,31 @@ def table(
     header: Any | None = None,
     style: Sequence[Style] | None = None,
     header_style: Sequence[Style] | None = None,
+    footer: FooterSpec | None = None,
+    footer_style: Sequence[Style] | None = None,
+    footer_label: str | None = None,
+    footer_formulas: bool = False,
+    overflow: OverflowPolicy = "error",
 ) -> TableBuilder:
-    return TableBuilder(header=header, styles=style, header_style=header_style)
+    """Table builder; `footer` adds a row of column aggregates below the body.
+
+    `footer` maps header names (or column offsets) to "sum", "mean", "min",
+    "max" or "count", or lists one aggregate or None per column. The values are
+    computed while the body is written, streamed bodies included.
+    `footer_label` fills the first footer cell, `footer_style` styles the row,
+    and `footer_formulas=True` writes SUM/AVERAGE/... formulas over the body
+    with the computed values cached.
+    """
+    return TableBuilder(
+        header=header,
+        styles=style,
+        header_style=header_style,
+        footer=footer,
+        footer_style=footer_style,
+        footer_label=footer_label,
+        footer_formulas=footer_formulas,
+        overflow=overflow,
+    )
 
 
 def sheet(name: str) -> SheetBuilder:
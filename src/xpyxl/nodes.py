@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+from collections.abc import Callable, Iterator, Sequence
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Literal, Protocol
 
 from .styles import Style
 
@@ -14,9 +15,16 @@ __all__ = [
     "VerticalStackNode",
     "HorizontalStackNode",
     "SheetNode",
+    "SheetFactoryNode",
     "WorkbookNode",
     "SheetItem",
     "RenderableItem",
+    "OverflowPolicy",
+    "Aggregate",
+    "TableFooter",
+    "TableOutline",
+    "RowSource",
+    "build_sheet",
 ]
 
 
@@ -38,11 +46,68 @@ class ColumnNode:
     styles: tuple[Style, ...] = ()
 
 
+# What to do with a table that runs past Excel's last row.
+OverflowPolicy = Literal["error", "spill"]
+
+
+# Footer aggregates; each one skips text, booleans and empty cells, as the
+# matching Excel function does over a range.
+Aggregate = Literal["sum", "mean", "min", "max", "count"]
+
+
+@dataclass(frozen=True)
+class TableFooter:
+    """Row of per-column aggregates written below a table's body."""
+
+    # Aggregate per column offset; None leaves that footer cell empty.
+    aggregates: tuple[Aggregate | None, ...]
+    styles: tuple[Style, ...] = ()
+    # Text for the first footer cell, which then carries no aggregate.
+    label: str | None = None
+    # Write SUM/AVERAGE/MIN/MAX/COUNT formulas over the body, values cached.
+    formulas: bool = False
+
+
+@dataclass(frozen=True)
+class TableOutline:
+    """Row outline of a grouped table, one level per record."""
+
+    levels: bytes
+    # Level of detail rows; records at lower levels are subtotals, and level 0
+    # is the grand total.
+    detail: int
+    styles: tuple[Style, ...] = ()
+
+
+class RowSource(Protocol):
+    """Table body rows produced while rendering, e.g. from a database cursor."""
+
+    # Number of columns if known up front, else 0.
+    @property
+    def width(self) -> int: ...
+
+    # Called once per render; may raise ValueError if already consumed.
+    def rows(self) -> Iterator[Sequence[Any]]: ...
+
+
 @dataclass(frozen=True)
 class TableNode:
     rows: tuple[RowNode, ...]
     styles: tuple[Style, ...] = ()
     header: RowNode | None = None
+    # Bare value rows from the bulk builders, rendered after `rows`.
+    records: tuple[tuple[Any, ...], ...] = ()
+    # Body styles and fixed widths by column offset, e.g. from a record adapter.
+    column_styles: tuple[tuple[Style, ...], ...] = ()
+    column_widths: tuple[float | None, ...] = ()
+    overflow: OverflowPolicy = "error"
+    # Rows streamed during rendering (cursor or async iterable), after `records`.
+    # Their count is unknown up front, so such a table must end its sheet.
+    source: RowSource | None = None
+    # Aggregated while the body is written, so it works for streamed rows too.
+    footer: TableFooter | None = None
+    # Set by `table().grouped(...)`; records then mix detail and subtotal rows.
+    outline: TableOutline | None = None
 
 
 @dataclass(frozen=True)
@@ -86,6 +151,27 @@ class SheetNode:
     items: tuple[SheetItem, ...]
 
 
+@dataclass(frozen=True)
+class SheetFactoryNode:
+    """A sheet whose tree is built by `build` only when the workbook renders."""
+
+    name: str
+    build: Callable[[], SheetNode]
+
+
 @dataclass(frozen=True)
 class WorkbookNode:
-    sheets: tuple[SheetNode, ...]
+    sheets: tuple[SheetNode | SheetFactoryNode, ...]
+
+
+def build_sheet(sheet: SheetNode | SheetFactoryNode) -> SheetNode:
+    """Return `sheet` itself, or the tree its factory builds under its name."""
+    if isinstance(sheet, SheetNode):
+        return sheet
+    node = sheet.build()
+    if not isinstance(node, SheetNode):
+        msg = f"Sheet factory '{sheet.name}' must return a SheetNode"
+        raise TypeError(msg)
+    if node.name != sheet.name:
+        node = SheetNode(name=sheet.name, items=node.items)
+    return node
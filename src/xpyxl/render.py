@@ -1,142 +1,86 @@
 from __future__ import annotations
 
-from collections.abc import Mapping, Sequence
-from dataclasses import dataclass
-from typing import Any, assert_never
-
+import threading
+from collections.abc import Mapping
+from datetime import date, time, timedelta
+from decimal import Decimal
+from math import isfinite
+from typing import Any
+from weakref import WeakKeyDictionary
+
+from openpyxl.cell.cell import Cell
 from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
 from openpyxl.utils import get_column_letter
 
-from .nodes import (
-    CellNode,
-    ColumnNode,
-    HorizontalStackNode,
-    RenderableItem,
-    RowNode,
-    SheetComponent,
-    SheetNode,
-    SpacerNode,
-    TableNode,
-    VerticalStackNode,
-)
-from .styles import (
-    BorderStyleName,
-    Style,
-    bold,
-    combine_styles,
-    normalize_hex,
-    to_argb,
+from ._convert import _NATIVE_TYPES, _non_finite_error, convert_value
+from ._layout import (
+    DEFAULT_BORDER_COLOR,
+    DEFAULT_ROW_HEIGHT,
+    EffectiveStyle,
+    _column_ranges,
+    _column_width_hints,
+    _Formula,
+    _iter_rows,
+    _resolve_chain,
+    _sheet_placements,
 )
+from ._progress import PROGRESS_EVERY, _Monitor, _SheetCounter
+from ._xlsx import _temporal_format
+from .nodes import SheetNode
+from .styles import Style, to_argb
 
 __all__ = ["render_sheet"]
 
 
-DEFAULT_FONT_NAME = "Calibri"
-DEFAULT_FONT_SIZE = 11.0
-DEFAULT_MONO_FONT = "Consolas"
-DEFAULT_TEXT_COLOR = normalize_hex("#111827")
-DEFAULT_BORDER_COLOR = normalize_hex("#D0D5DD")
-DEFAULT_BORDER_STYLE: BorderStyleName = "thin"
-DEFAULT_ROW_HEIGHT = 16.0
-DEFAULT_TABLE_HEADER_BG = normalize_hex("#F2F4F7")
-DEFAULT_TABLE_HEADER_TEXT = normalize_hex("#1E293B")
-DEFAULT_TABLE_STRIPE_COLOR = normalize_hex("#F8FAFC")
-DEFAULT_TABLE_COMPACT_HEIGHT = 18.0
-
-
-@dataclass
-class EffectiveStyle:
-    font_name: str
-    font_size: float
-    bold: bool
-    italic: bool
-    text_color: str
-    fill_color: str | None
-    horizontal_align: str | None
-    vertical_align: str | None
-    indent: int | None
-    wrap_text: bool
-    number_format: str | None
-    border: BorderStyleName | None
-    border_color: str | None
-
-
-@dataclass(frozen=True)
-class _Size:
-    width: int
-    height: int
-
-
-@dataclass(frozen=True)
-class _Placement:
-    row: int
-    col: int
-    item: RenderableItem
-
-
-def _resolve(styles: Sequence[Style]) -> EffectiveStyle:
-    base_style = Style(
-        font_name=DEFAULT_FONT_NAME,
-        font_size=DEFAULT_FONT_SIZE,
-        text_color=DEFAULT_TEXT_COLOR,
-    )
-    merged = combine_styles(styles, base=base_style)
-
-    font_name = merged.font_name or DEFAULT_FONT_NAME
-    if merged.mono:
-        font_name = DEFAULT_MONO_FONT
-    font_size = merged.font_size if merged.font_size is not None else DEFAULT_FONT_SIZE
-    if merged.font_size_delta is not None:
-        font_size += merged.font_size_delta
-
-    bold_flag = merged.bold if merged.bold is not None else False
-    italic_flag = merged.italic if merged.italic is not None else False
-
-    text_color = normalize_hex(merged.text_color or DEFAULT_TEXT_COLOR)
-    fill_color = normalize_hex(merged.fill_color) if merged.fill_color else None
-    border_color = normalize_hex(merged.border_color) if merged.border_color else None
-
-    return EffectiveStyle(
-        font_name=font_name,
-        font_size=font_size,
-        bold=bold_flag,
-        italic=italic_flag,
-        text_color=text_color,
-        fill_color=fill_color,
-        horizontal_align=merged.horizontal_align,
-        vertical_align=merged.vertical_align,
-        indent=merged.indent,
-        wrap_text=merged.wrap_text if merged.wrap_text is not None else False,
-        number_format=merged.number_format,
-        border=merged.border,
-        border_color=border_color,
-    )
-
-
-def _default_row_height() -> float:
-    return DEFAULT_ROW_HEIGHT
-
-
-def _update_dimensions(
-    *,
-    col_widths: dict[int, float],
-    row_heights: dict[int, float],
-    column_index: int,
-    row_index: int,
-    value: Any,
-    style: EffectiveStyle,
-    prefer_height: float | None = None,
-) -> None:
-    text = "" if value is None else str(value)
-    width_hint = max(len(text), 1.0)
-    existing_width = col_widths.get(column_index, 0.0)
-    col_widths[column_index] = max(existing_width, width_hint)
-
-    base_height = prefer_height if prefer_height is not None else _default_row_height()
-    row_heights[row_index] = max(row_heights.get(row_index, 0.0), base_height)
-
-
-def _apply_style(cell, effective: EffectiveStyle, border_fallback_color: str) -> None:
+# Style arrays (openpyxl's per-cell style ids) already built per workbook, so
+# repeated styles skip constructing and hashing Font/Fill/Border objects.
+_STYLE_ARRAYS: WeakKeyDictionary[Any, dict[tuple[Any, ...], Any]] = WeakKeyDictionary()
+# openpyxl appends fonts, fills, borders and number formats to unguarded
+# workbook-wide lists. Anything that may add to them holds this lock, so sheets
+# of one workbook can render on several threads; cached styles do not need it.
+_STYLE_LOCK = threading.Lock()
+_TEMPORAL_TYPES = (date, time, timedelta)
+
+
+class _StyleHandles:
+    """Style array per (style chain, default number format) for one sheet.
+
+    Chains are looked up by identity first, since table chains are shared by
+    every row; misses fall back to the workbook's `_STYLE_ARRAYS` entry.
+    """
+
+    def __init__(self, ws: Any) -> None:
+        self._ws = ws
+        with _STYLE_LOCK:
+            self._arrays = _STYLE_ARRAYS.setdefault(ws.parent, {})
+        self._by_id: dict[tuple[int, str | None], tuple[tuple[Style, ...], Any]] = {}
+
+    def get(self, chain: tuple[Style, ...], default_format: str | None) -> Any:
+        key = (id(chain), default_format)
+        entry = self._by_id.get(key)
+        if entry is not None and entry[0] is chain:
+            return entry[1]
+        effective = _resolve_chain(chain)
+        array_key = (effective, default_format)
+        array = self._arrays.get(array_key)
+        if array is None:
+            with _STYLE_LOCK:
+                array = self._arrays.get(array_key)
+                if array is None:
+                    # Built on a detached cell; only its style array is kept.
+                    scratch = Cell(self._ws)
+                    if default_format is not None:
+                        scratch.number_format = default_format
+                    _build_style(scratch, effective, DEFAULT_BORDER_COLOR)
+                    array = self._arrays[array_key] = scratch._style
+        # Holding the chain keeps its id from being reused; cap the cache so
+        # per-row chains cannot grow it without bound.
+        if len(self._by_id) < 4096:
+            self._by_id[key] = (chain, array)
+        return array
+
+
+def _build_style(cell, effective: EffectiveStyle, border_fallback_color: str) -> None:
     cell.font = Font(
         name=effective.font_name,
         size=effective.font_size,
@@ -173,258 +117,134 @@ def _apply_style(cell, effective: EffectiveStyle, border_fallback_color: str) ->
         cell.border = Border(left=side, right=side, top=side, bottom=side)
 
 
-def _render_row(
-    ws,
-    node: RowNode,
-    start_row: int,
-    start_col: int,
-    col_widths: dict[int, float],
-    row_heights: dict[int, float],
-) -> None:
-    row_index = start_row
-    for column_offset, cell_node in enumerate(node.cells, start=1):
-        styles = (*node.styles, *cell_node.styles)
-        effective = _resolve(styles)
-        column_index = start_col + column_offset - 1
-        target_cell = ws.cell(row=row_index, column=column_index, value=cell_node.value)
-        _apply_style(target_cell, effective, DEFAULT_BORDER_COLOR)
-        _update_dimensions(
-            col_widths=col_widths,
-            row_heights=row_heights,
-            column_index=column_index,
-            row_index=row_index,
-            value=cell_node.value,
-            style=effective,
-        )
-
-
-def _render_column(
-    ws,
-    node: ColumnNode,
-    start_row: int,
-    start_col: int,
-    col_widths: dict[int, float],
-    row_heights: dict[int, float],
-) -> None:
-    row_index = start_row
-    for cell_node in node.cells:
-        styles = (*node.styles, *cell_node.styles)
-        effective = _resolve(styles)
-        target_cell = ws.cell(row=row_index, column=start_col, value=cell_node.value)
-        _apply_style(target_cell, effective, DEFAULT_BORDER_COLOR)
-        _update_dimensions(
-            col_widths=col_widths,
-            row_heights=row_heights,
-            column_index=start_col,
-            row_index=row_index,
-            value=cell_node.value,
-            style=effective,
-        )
-        row_index += 1
-
-
-def _render_cell(
-    ws,
-    node: CellNode,
-    row_index: int,
-    column_index: int,
-    col_widths: dict[int, float],
-    row_heights: dict[int, float],
-) -> None:
-    effective = _resolve(node.styles)
-    target_cell = ws.cell(row=row_index, column=column_index, value=node.value)
-    _apply_style(target_cell, effective, DEFAULT_BORDER_COLOR)
-    _update_dimensions(
-        col_widths=col_widths,
-        row_heights=row_heights,
-        column_index=column_index,
-        row_index=row_index,
-        value=node.value,
-        style=effective,
-    )
-
-
-def _render_table(
-    ws,
-    node: TableNode,
-    start_row: int,
-    start_col: int,
-    col_widths: dict[int, float],
-    row_heights: dict[int, float],
-) -> None:
-    table_style = combine_styles(node.styles)
-    banded = table_style.table_banded if table_style.table_banded is not None else True
-    bordered = (
-        table_style.table_bordered if table_style.table_bordered is not None else True
-    )
-    compact = (
-        table_style.table_compact if table_style.table_compact is not None else False
-    )
-    border_color = (
-        table_style.border_color
-        if table_style.border_color is not None
-        else DEFAULT_BORDER_COLOR
-    )
-    border_style = (
-        table_style.border if table_style.border is not None else DEFAULT_BORDER_STYLE
-    )
-
-    table_border_style = (
-        Style(border=border_style, border_color=border_color) if bordered else None
-    )
-    stripe_style = Style(fill_color=DEFAULT_TABLE_STRIPE_COLOR) if banded else None
-    compact_height = DEFAULT_TABLE_COMPACT_HEIGHT if compact else None
-
-    current_row = start_row
-
-    def render(
-        row_node: RowNode,
-        *,
-        extra: Sequence[Style] = (),
-        prefer_height: float | None = None,
-    ) -> None:
-        for column_offset, cell_node in enumerate(row_node.cells, start=1):
-            style_chain = (*node.styles, *row_node.styles, *extra, *cell_node.styles)
-            if table_border_style:
-                style_chain = (*style_chain, table_border_style)
-            effective = _resolve(style_chain)
-            column_index = start_col + column_offset - 1
-            target_cell = ws.cell(
-                row=current_row, column=column_index, value=cell_node.value
-            )
-            _apply_style(target_cell, effective, border_color)
-            _update_dimensions(
-                col_widths=col_widths,
-                row_heights=row_heights,
-                column_index=column_index,
-                row_index=current_row,
-                value=cell_node.value,
-                style=effective,
-                prefer_height=prefer_height,
-            )
-
-    if node.header:
-        header_extras: list[Style] = [bold]
-        header_extras.append(Style(fill_color=DEFAULT_TABLE_HEADER_BG))
-        header_extras.append(Style(text_color=DEFAULT_TABLE_HEADER_TEXT))
-        render(node.header, extra=header_extras, prefer_height=compact_height)
-        current_row += 1
-
-    for idx, row_node in enumerate(node.rows):
-        extras: list[Style] = []
-        if stripe_style and idx % 2 == 1:
-            extras.append(stripe_style)
-        render(row_node, extra=extras, prefer_height=compact_height)
-        current_row += 1
-
-
-def _table_size(node: TableNode) -> _Size:
-    width = 0
-    height = 0
-    if node.header:
-        width = max(width, len(node.header.cells))
-        height += 1
-    for row in node.rows:
-        width = max(width, len(row.cells))
-        height += 1
-    return _Size(width=width, height=height)
-
-
-def _layout_item(
-    item: SheetComponent, start_row: int, start_col: int
-) -> tuple[list[_Placement], _Size]:
-    if isinstance(item, CellNode):
-        size = _Size(width=1, height=1)
-        return ([_Placement(row=start_row, col=start_col, item=item)], size)
-    elif isinstance(item, RowNode):
-        size = _Size(width=len(item.cells), height=1)
-        return ([_Placement(row=start_row, col=start_col, item=item)], size)
-    elif isinstance(item, ColumnNode):
-        size = _Size(width=1, height=len(item.cells))
-        return ([_Placement(row=start_row, col=start_col, item=item)], size)
-    elif isinstance(item, TableNode):
-        size = _table_size(item)
-        return ([_Placement(row=start_row, col=start_col, item=item)], size)
-    elif isinstance(item, SpacerNode):
-        size = _Size(width=0, height=item.rows)
-        return ([_Placement(row=start_row, col=start_col, item=item)], size)
-    elif isinstance(item, VerticalStackNode):
-        placements: list[_Placement] = []  # pyright: ignore[reportRedeclaration]
-        row_cursor = start_row
-        max_width = 0
-        for idx, child in enumerate(item.items):
-            child_placements, child_size = _layout_item(child, row_cursor, start_col)
-            placements.extend(child_placements)
-            row_cursor += child_size.height
-            if idx < len(item.items) - 1:
-                row_cursor += item.gap
-            max_width = max(max_width, child_size.width)
-        height = row_cursor - start_row
-        return placements, _Size(width=max_width, height=height)
-    elif isinstance(item, HorizontalStackNode):
-        placements: list[_Placement] = []
-        col_cursor = start_col
-        max_height = 0
-        for idx, child in enumerate(item.items):
-            child_placements, child_size = _layout_item(child, start_row, col_cursor)
-            placements.extend(child_placements)
-            col_cursor += child_size.width
-            if idx < len(item.items) - 1:
-                col_cursor += item.gap
-            max_height = max(max_height, child_size.height)
-        width = col_cursor - start_col
-        return placements, _Size(width=width, height=max_height)
-    else:
-        assert_never(item)
-
-
 def _apply_dimensions(
     ws, col_widths: Mapping[int, float], row_heights: Mapping[int, float]
 ) -> None:
-    for column_index, width in col_widths.items():
-        letter = get_column_letter(column_index)
-        ws.column_dimensions[letter].width = max(width, 8.0)
+    ws.sheet_format.defaultRowHeight = DEFAULT_ROW_HEIGHT
+    ws.sheet_format.customHeight = True
+    for first, last, width in _column_ranges(col_widths):
+        dimension = ws.column_dimensions[get_column_letter(first)]
+        dimension.width = width
+        dimension.min = first
+        dimension.max = last
     for row_index, height in row_heights.items():
-        ws.row_dimensions[row_index].height = height
+        if height != DEFAULT_ROW_HEIGHT:
+            ws.row_dimensions[row_index].height = height
 
 
-def render_sheet(ws, node: SheetNode) -> None:
-    col_widths: dict[int, float] = {}
-    row_heights: dict[int, float] = {}
-    placements: list[_Placement] = []
-    row_cursor = 1
+def _store_cells(ws, batch: list[tuple[tuple[int, int], Cell]]) -> None:
+    """Copy built cells into `ws` through its public `cell()` method."""
+    for (row, column), cell in batch:
+        target = ws.cell(row=row, column=column)
+        target._value = cell._value
+        target.data_type = cell.data_type
+        target._style = cell._style
 
-    for item in node.items:
-        item_placements, size = _layout_item(item, row_cursor, 1)
-        placements.extend(item_placements)
-        row_cursor += size.height
 
-    for placement in placements:
-        target = placement.item
-        if isinstance(target, CellNode):
-            _render_cell(
-                ws, target, placement.row, placement.col, col_widths, row_heights
-            )
-        elif isinstance(target, RowNode):
-            _render_row(
-                ws, target, placement.row, placement.col, col_widths, row_heights
-            )
-        elif isinstance(target, ColumnNode):
-            _render_column(
-                ws, target, placement.row, placement.col, col_widths, row_heights
-            )
-        elif isinstance(target, TableNode):
-            _render_table(
-                ws, target, placement.row, placement.col, col_widths, row_heights
-            )
-        elif isinstance(target, SpacerNode):
-            height = (
-                target.height if target.height is not None else _default_row_height()
-            )
-            for offset in range(target.rows):
-                row_index = placement.row + offset
-                row_heights[row_index] = max(row_heights.get(row_index, 0.0), height)
+def render_sheet(
+    ws, node: SheetNode, monitor: _Monitor | _SheetCounter | None = None
+) -> None:
+    """Render `node` into the openpyxl worksheet `ws`.
+
+    Placements are merged into sheet rows by the same stream the native
+    writer uses; each row's cells are built with their shared style arrays and
+    inserted into the worksheet in one step.
+
+    Sheets of one workbook may be rendered from several threads at once, one
+    thread per sheet; additions to the workbook's style lists are serialized.
+    """
+    placements = _sheet_placements(node)
+    style_for = _StyleHandles(ws).get
+    # Worksheet._cells is an openpyxl internal (the range is pinned in
+    # pyproject.toml); without it cells go in one at a time via ws.cell().
+    cells = getattr(ws, "_cells", None)
+    col_widths: dict[int, float] = {}
+    row_heights: dict[int, float] = {}
+    outline_level = 0
+    last_row = 0
+    written = 0
+
+    for row_index, height, entries, level in _iter_rows(placements):
+        if height != DEFAULT_ROW_HEIGHT:
+            row_heights[row_index] = height
+        elif not entries:
+            continue
+        if level:
+            ws.row_dimensions[row_index].outlineLevel = level
+            outline_level = max(outline_level, level)
+        batch: list[tuple[tuple[int, int], Cell]] = []
+        for column_index, value, chain in entries:
+            kind = type(value)
+            if kind is float and not isfinite(value):
+                value = _non_finite_error(value)
+                kind = str
+            if kind in _NATIVE_TYPES:
+                cell = Cell(
+                    ws,
+                    row=row_index,
+                    column=column_index,
+                    value=value,
+                    style_array=style_for(chain, None),
+                )
+                if kind is str:
+                    width = len(value)
+                else:
+                    width = 0 if value is None else len(str(value))
+            elif kind is _Formula:
+                # openpyxl cannot store a formula's cached value; Excel computes
+                # it on load. The cell is sized from the value all the same.
+                cell = Cell(
+                    ws,
+                    row=row_index,
+                    column=column_index,
+                    value=f"={value.text}",
+                    style_array=style_for(chain, None),
+                )
+                width = 0 if value.value is None else len(str(value.value))
+            else:
+                value, default_format = convert_value(value)
+                if isinstance(value, (float, Decimal)) and not isfinite(value):
+                    value = _non_finite_error(value)
+                if isinstance(value, _TEMPORAL_TYPES):
+                    # Binding a date would register its format on the workbook;
+                    # the style array already carries it, so store the value.
+                    cell = Cell(
+                        ws,
+                        row=row_index,
+                        column=column_index,
+                        style_array=style_for(
+                            chain, default_format or _temporal_format(value)
+                        ),
+                    )
+                    cell._value = value
+                    cell.data_type = "d"
+                else:
+                    cell = Cell(
+                        ws,
+                        row=row_index,
+                        column=column_index,
+                        value=value,
+                        style_array=style_for(chain, default_format),
+                    )
+                width = 0 if value is None else len(str(value))
+            batch.append(((row_index, column_index), cell))
+            width_hint = max(width, 1.0)
+            if col_widths.get(column_index, 0.0) < width_hint:
+                col_widths[column_index] = width_hint
+        if cells is not None:
+            cells.update(batch)
         else:
-            assert_never(target)
-
+            _store_cells(ws, batch)
+        last_row = row_index
+        written += 1
+        if monitor is not None and not written % PROGRESS_EVERY:
+            monitor.advance(PROGRESS_EVERY)
+
+    if monitor is not None:
+        monitor.advance(written % PROGRESS_EVERY)
+    if cells is not None:
+        ws._current_row = max(ws._current_row, last_row)
+    if outline_level:
+        ws.sheet_format.outlineLevelRow = outline_level
+    col_widths.update(_column_width_hints(placements))
     _apply_dimensions(ws, col_widths, row_heights)
@@ -0,0 +1,200 @@
+import os
+import sqlite3
+import stat
+import zipfile
+
+import openpyxl
+import pytest
+
+import xpyxl as x
+
+
+def _footer_book(**options):
+    return x.workbook()[
+        x.sheet("Sales")[
+            x.table(
+                header=["Region", "Units"],
+                footer={"Units": "sum"},
+                footer_label="Total",
+                **options,
+            ).from_records([("north", 3), ("south", 4)])
+        ],
+        x.sheet("Plain")[
+            x.table(header=["Region", "Units"]).from_records([("east", 5)])
+        ],
+    ]
+
+
+def test_append_extends_plain_table(tmp_path):
+    path = tmp_path / "book.xlsx"
+    _footer_book().save(path)
+
+    stats = x.append_rows(path, "Plain", [("west", 6), ("up", 7)])
+
+    assert stats.rows == 2
+    with zipfile.ZipFile(path) as archive:
+        sheet = archive.read("xl/worksheets/sheet2.xml")
+    assert b'<dimension ref="A1:B4"/>' in sheet
+
+
+def test_append_refuses_table_footer(tmp_path):
+    path = tmp_path / "book.xlsx"
+    _footer_book().save(path)
+    before = path.read_bytes()
+
+    with pytest.raises(ValueError, match="table footer"):
+        x.append_rows(path, "Sales", [("west", 6)])
+    assert path.read_bytes() == before
+
+
+def test_append_refuses_streamed_table_footer(tmp_path):
+    connection = sqlite3.connect(":memory:")
+    connection.execute("create table sales (region text, units integer)")
+    connection.executemany("insert into sales values (?, ?)", [("north", 3)] * 5)
+    cursor = connection.execute("select region, units from sales")
+    path = tmp_path / "book.xlsx"
+    x.workbook()[
+        x.sheet("It's")[
+            x.table(footer={"units": "sum"}).from_cursor(cursor, batch_size=2)
+        ]
+    ].save(path)
+
+    with pytest.raises(ValueError, match="table footer"):
+        x.append_rows(path, "It's", [("west", 6)])
+
+
+def test_append_refuses_grouped_table(tmp_path):
+    path = tmp_path / "book.xlsx"
+    x.workbook()[
+        x.sheet("Grouped")[
+            x.table(header=["Region", "Units"]).grouped(
+                [("north", 3), ("south", 4)],
+                by=["Region"],
+                aggregates={"Units": "sum"},
+            )
+        ]
+    ].save(path)
+    before = path.read_bytes()
+
+    with pytest.raises(ValueError, match="row outlines"):
+        x.append_rows(path, "Grouped", [("west", 6)])
+    assert path.read_bytes() == before
+
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX file modes")
+def test_save_and_append_keep_file_mode(tmp_path):
+    path = tmp_path / "book.xlsx"
+    umask = os.umask(0o022)
+    try:
+        _footer_book().save(path)
+    finally:
+        os.umask(umask)
+    assert stat.S_IMODE(path.stat().st_mode) == 0o644
+
+    path.chmod(0o640)
+    x.append_rows(path, "Plain", [("west", 6)])
+    assert stat.S_IMODE(path.stat().st_mode) == 0o640
+    _footer_book().save(path)
+    assert stat.S_IMODE(path.stat().st_mode) == 0o640
+
+
+def test_append_copies_other_parts_compressed(monkeypatch, tmp_path):
+    path = tmp_path / "book.xlsx"
+    _footer_book().save(path)
+    with zipfile.ZipFile(path) as archive:
+        before = {info.filename: info for info in archive.infolist()}
+    compressed = []
+    get_compressor = zipfile._get_compressor
+
+    def counting(*args, **kwargs):
+        compressed.append(args)
+        return get_compressor(*args, **kwargs)
+
+    monkeypatch.setattr(zipfile, "_get_compressor", counting)
+
+    x.append_rows(path, "Plain", [("west", 6)])
+    x.append_rows(path, "Plain", [("up", 7)])
+
+    # Only the appended sheet part and workbook.xml, whose recorded table body
+    # grows, are deflated again.
+    assert len(compressed) == 4
+    with zipfile.ZipFile(path) as archive:
+        assert archive.testzip() is None
+        after = {info.filename: info for info in archive.infolist()}
+    assert list(after) == list(before)
+    for name, info in before.items():
+        if name not in ("xl/worksheets/sheet2.xml", "xl/workbook.xml"):
+            assert (after[name].CRC, after[name].compress_size) == (
+                info.CRC,
+                info.compress_size,
+            )
+    ws = openpyxl.load_workbook(path)["Plain"]
+    assert [cell.value for cell in ws[4]] == ["up", 7]
+
+
+def _fills(path, sheet):
+    ws = openpyxl.load_workbook(path)[sheet]
+    return [
+        [(cell.fill.fgColor.rgb, cell.font.b) for cell in row] for row in ws.iter_rows()
+    ]
+
+
+def test_append_continues_banding_across_appends(tmp_path):
+    records = [(f"r{i}", i) for i in range(6)]
+    path = tmp_path / "book.xlsx"
+    expected = tmp_path / "expected.xlsx"
+    header = ["Region", "Units"]
+    x.workbook()[
+        x.sheet("Data")[x.table(header=header).from_records(records[:3])]
+    ].save(path)
+    x.workbook()[x.sheet("Data")[x.table(header=header).from_records(records)]].save(
+        expected
+    )
+
+    # An odd first append, so the second starts on the other parity.
+    x.append_rows(path, "Data", records[3:4])
+    x.append_rows(path, "Data", records[4:])
+
+    assert _fills(path, "Data") == _fills(expected, "Data")
+
+
+def test_append_below_single_body_row_skips_header(tmp_path):
+    path = tmp_path / "book.xlsx"
+    x.workbook()[
+        x.sheet("Data")[
+            x.row()["Quarterly units"],
+            x.table(header=["Region", "Units"]).from_records([("north", 3)]),
+        ]
+    ].save(path)
+
+    x.append_rows(path, "Data", [("south", 4), ("east", 5)])
+
+    fills = _fills(path, "Data")
+    assert fills[3] == fills[2]
+    assert fills[4] == fills[2]
+    assert fills[2] != fills[1]
+
+
+def test_append_refuses_table_without_body(tmp_path):
+    path = tmp_path / "book.xlsx"
+    x.workbook()[
+        x.sheet("Data")[x.table(header=["Region", "Units"]).from_records([])]
+    ].save(path)
+    before = path.read_bytes()
+
+    with pytest.raises(ValueError, match="table body row"):
+        x.append_rows(path, "Data", [("west", 6)])
+    assert path.read_bytes() == before
+
+
+def test_append_refuses_sheet_ending_in_spacer(tmp_path):
+    path = tmp_path / "book.xlsx"
+    x.workbook()[
+        x.sheet("Data")[
+            x.table(header=["Region", "Units"]).from_records([("north", 3)]),
+            x.space(height=30),
+        ]
+    ].save(path)
+
+    with pytest.raises(ValueError, match="table body row"):
+        x.append_rows(path, "Data", [("west", 6)])
@@ -0,0 +1,104 @@
+import asyncio
+import time
+import zipfile
+
+import pytest
+
+import xpyxl as x
+import xpyxl._xlsx as xlsx
+
+
+class Rows:
+    """Async row source that counts how far it has run ahead."""
+
+    def __init__(self, count, *, pause=0.0):
+        self.count = count
+        self.pause = pause
+        self.produced = 0
+        self.closed = False
+
+    async def __aiter__(self):
+        try:
+            for i in range(self.count):
+                if self.pause and i % 100 == 0:
+                    await asyncio.sleep(self.pause)
+                self.produced += 1
+                yield (f"deal {i % 9}", i, i * 0.5)
+        finally:
+            self.closed = True
+
+
+def _book(rows, *, batch_size=100, prefetch=2):
+    table = x.table(header=["Deal", "Units", "Amount"]).from_async(
+        rows, batch_size=batch_size, prefetch=prefetch
+    )
+    return x.workbook()[x.sheet("Deals")[table]]
+
+
+def _sheet_xml(path):
+    with zipfile.ZipFile(path) as archive:
+        return archive.read("xl/worksheets/sheet1.xml")
+
+
+def test_producer_waits_for_the_renderer(tmp_path):
+    rows = Rows(20_000)
+    lead = []
+
+    def progress(update):
+        if not lead:
+            # Stall the renderer; the producer must stop at the queue bound.
+            time.sleep(0.3)
+            lead.append(rows.produced - update.rows)
+
+    stats = asyncio.run(
+        _book(rows, batch_size=100, prefetch=2).save_async(
+            tmp_path / "deals.xlsx", progress=progress
+        )
+    )
+
+    # Queued batches, the batch being rendered, and one blocked in `put`.
+    assert lead[0] <= (2 + 2) * 100
+    assert stats.sheets[0].rows == 20_001
+    assert rows.produced == 20_000
+
+
+def test_cancel_leaves_path_untouched(tmp_path):
+    path = tmp_path / "deals.xlsx"
+    path.write_bytes(b"previous")
+    rows = Rows(10**9, pause=0.001)
+
+    async def main():
+        task = asyncio.create_task(_book(rows).save_async(path))
+        while rows.produced < 2000:
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+
+    assert path.read_bytes() == b"previous"
+    assert [p.name for p in tmp_path.iterdir()] == ["deals.xlsx"]
+    assert rows.closed
+
+
+@pytest.mark.parametrize("pool", ["process", "thread"])
+def test_pool_matches_serial(monkeypatch, tmp_path, pool):
+    # Small bands, so the process pool formats several of them; the thread
+    # pool renders the async sheet on the thread that feeds it.
+    monkeypatch.setattr(xlsx, "BAND_ROWS", 500)
+    serial = tmp_path / "serial.xlsx"
+    pooled = tmp_path / "pooled.xlsx"
+
+    async def main():
+        await _book(Rows(3000)).save_async(serial)
+        await _book(Rows(3000)).save_async(pooled, workers=2, pool=pool)
+
+    asyncio.run(main())
+
+    assert _sheet_xml(pooled) == _sheet_xml(serial)
+
+
+def test_async_table_needs_save_async(tmp_path):
+    with pytest.raises(ValueError, match="save_async"):
+        _book(Rows(10)).save(tmp_path / "deals.xlsx")
@@ -0,0 +1,175 @@
+import os
+import subprocess
+import sys
+import textwrap
+import zipfile
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from openpyxl.utils.exceptions import IllegalCharacterError
+
+import xpyxl as x
+import xpyxl._xlsx as xlsx
+from xpyxl._bands import format_shared_band, release, share_band
+from xpyxl._xlsx import _format_rows
+
+pytestmark = pytest.mark.skipif(
+    not os.path.isdir("/dev/shm"), reason="needs /dev/shm to observe segments"
+)
+
+ROWS = 6000
+
+
+def _segments():
+    return {name for name in os.listdir("/dev/shm") if name.startswith("psm_")}
+
+
+def _book(bad_row=None):
+    records = [
+        (i, f"region {i % 12}", i * 1.25, "\ud800" if i == bad_row else f"id-{i}")
+        for i in range(ROWS)
+    ]
+    return x.workbook()[
+        x.sheet("Data")[
+            x.table(header=["n", "region", "amount", "key"]).from_records(records)
+        ]
+    ]
+
+
+def _sheet_xml(path):
+    with zipfile.ZipFile(path) as archive:
+        return archive.read("xl/worksheets/sheet1.xml")
+
+
+@pytest.fixture
+def small_bands(monkeypatch):
+    monkeypatch.setattr(xlsx, "BAND_ROWS", 500)
+
+
+def test_shared_band_formats_like_serial():
+    rows = [
+        (1, 16.0, [(1, "héllo €😀", 1, -1), (2, "", 1, -1), (3, "sst", 2, 0)], 0),
+        (2, 20.5, [(1, None, 1, -1), (2, True, 1, -1), (3, False, 1, -1)], 2),
+        (3, 16.0, [(1, 2**70, 1, -1), (2, Decimal("1.5"), 1, -1)], 0),
+        (4, 16.0, [(1, date(2024, 1, 2), 3, -1), (2, -7, 1, -1), (3, 0.1, 1, -1)], 0),
+        (5, 16.0, [], 0),
+    ]
+    segment, band = share_band(rows)
+    try:
+        assert format_shared_band(band) == _format_rows(rows)
+        # Only values without a fixed-width or text encoding are pickled.
+        assert band.others == (2**70, Decimal("1.5"), date(2024, 1, 2))
+    finally:
+        release(segment)
+
+
+def test_parallel_save_matches_serial_and_releases_segments(small_bands, tmp_path):
+    book = _book()
+    before = _segments()
+
+    book.save(tmp_path / "serial.xlsx")
+    book.save(tmp_path / "parallel.xlsx", workers=2)
+
+    assert _segments() == before
+    serial = _sheet_xml(tmp_path / "serial.xlsx")
+    assert _sheet_xml(tmp_path / "parallel.xlsx") == serial
+
+
+def _mixed_book():
+    records = [
+        (i, f"region {i % 12}", date(2024, 1, 1 + i % 28), Decimal(i) / 4, i % 3 == 0)
+        for i in range(ROWS)
+    ]
+    grouped = [(f"g{i % 4}", i % 7, i * 0.5) for i in range(ROWS)]
+    return x.workbook()[
+        x.sheet("Data")[
+            x.row(style=[x.bold])["Report"],
+            x.table(
+                header=["n", "region", "day", "amount", "flag"],
+                footer={"amount": "sum"},
+                footer_label="Total",
+            ).from_records(records),
+        ],
+        x.sheet("Grouped")[
+            x.table(header=["g", "k", "v"]).grouped(
+                sorted(grouped), by=["g", "k"], aggregates={"v": "sum"}
+            )
+        ],
+        x.sheet("Small")[x.row()["region 1", None, 2.5]],
+    ]
+
+
+@pytest.mark.parametrize("strings", ["shared", "inline", "auto"])
+def test_parallel_package_matches_serial(small_bands, strings):
+    book = _mixed_book()
+    serial = book.digest(strings=strings)
+    assert book.digest(strings=strings, workers=2) == serial
+    assert book.digest(strings=strings, workers=3) == serial
+
+
+def test_failed_save_releases_segments(small_bands, tmp_path):
+    before = _segments()
+    # A lone surrogate is illegal in XML, so formatting fails in the worker.
+    with pytest.raises(IllegalCharacterError):
+        _book(bad_row=ROWS - 10).save(
+            tmp_path / "book.xlsx", workers=2, strings="inline"
+        )
+    assert _segments() == before
+
+
+def test_cancelled_parallel_save_releases_segments(small_bands, tmp_path):
+    before = _segments()
+    token = x.CancelToken()
+
+    def progress(snapshot):
+        token.cancel()
+
+    with pytest.raises(x.RenderCancelled):
+        _book().save(tmp_path / "book.xlsx", workers=2, progress=progress, cancel=token)
+    assert _segments() == before
+    assert not (tmp_path / "book.xlsx").exists()
+
+
+_RSS_SCRIPT = textwrap.dedent(
+    """
+    import resource, sys, tempfile
+    from pathlib import Path
+
+    import xpyxl as x
+    import xpyxl._xlsx as xlsx
+
+    xlsx.BAND_ROWS = 2000
+    rows = int(sys.argv[1])
+    records = [(i, f"region {i % 12}", i * 1.25, f"id-{i}") for i in range(rows)]
+    book = x.workbook()[
+        x.sheet("Data")[x.table(header=["a", "b", "c", "d"]).from_records(records)]
+    ]
+    # Resident size now, not the high-water mark left by building `records`.
+    with open("/proc/self/statm") as statm:
+        before = int(statm.read().split()[1]) * resource.getpagesize() // 1024
+    with tempfile.TemporaryDirectory() as tmp:
+        book.save(Path(tmp) / "book.xlsx", workers=2)
+    print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before)
+    """
+)
+
+
+def _peak_growth_kib(rows):
+    result = subprocess.run(
+        [sys.executable, "-c", _RSS_SCRIPT, str(rows)],
+        capture_output=True,
+        check=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+    )
+    return int(result.stdout)
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="ru_maxrss is in KiB on Linux")
+def test_parallel_save_peak_rss_is_bounded_by_bands_in_flight():
+    # Bands in flight are capped, so the parent's peak growth during the save
+    # must not scale with the sheet: four times the rows, well under 2x growth.
+    small = _peak_growth_kib(40_000)
+    large = _peak_growth_kib(160_000)
+    assert large < 2 * max(small, 8 * 1024)
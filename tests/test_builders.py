@@ -0,0 +1,57 @@
+import pytest
+
+import xpyxl as x
+from xpyxl.builders import BULK_SAMPLE_SIZE
+
+HEADER = ["Region", "Units", "Rate"]
+RECORDS = [("north", 3, 1.5), ("south", None, -0.5), ("east", 7, 0.25)]
+
+
+def _values(node):
+    ws = x.workbook()[x.sheet("Data")[node]].to_openpyxl()["Data"]
+    return [[cell.value for cell in row] for row in ws.iter_rows()]
+
+
+def test_from_records_matches_wrapped_rows():
+    bulk = x.table(header=HEADER).from_records(RECORDS)
+    wrapped = x.table(header=HEADER)[[list(record) for record in RECORDS]]
+
+    assert _values(bulk) == _values(wrapped)
+    assert _values(bulk) == [HEADER, *map(list, RECORDS)]
+
+
+def test_from_records_saves_like_wrapped_rows():
+    bulk = x.workbook()[x.sheet("Data")[x.table(header=HEADER).from_records(RECORDS)]]
+    wrapped = x.workbook()[
+        x.sheet("Data")[x.table(header=HEADER)[[list(r) for r in RECORDS]]]
+    ]
+    assert bulk.digest() == wrapped.digest()
+
+
+def test_from_records_accepts_generators_and_from_rows_is_an_alias():
+    generated = x.table(header=HEADER).from_records(record for record in RECORDS)
+    aliased = x.table(header=HEADER).from_rows(RECORDS)
+
+    assert _values(generated) == _values(aliased)
+
+
+def test_from_records_rejects_nested_nodes_in_the_sample():
+    records = [("a", 1)] * (BULK_SAMPLE_SIZE - 1) + [("b", x.cell()["styled"])]
+    with pytest.raises(TypeError, match="accept plain values"):
+        x.table().from_records(records)
+
+
+def test_from_records_rejects_string_rows():
+    with pytest.raises(TypeError, match="plain sequences"):
+        x.table().from_records(["north", "south"])
+
+
+def test_from_dicts_takes_columns_from_the_first_mapping():
+    records = [{"a": 1, "b": 2}, {"a": 3, "b": 4}]
+    assert _values(x.table().from_dicts(records)) == [["a", "b"], [1, 2], [3, 4]]
+
+
+def test_from_dicts_leaves_missing_keys_empty():
+    records = [{"a": 1, "b": 2}, {"b": 4}]
+    node = x.table(header=["B", "A"]).from_dicts(records, columns=["b", "a"])
+    assert _values(node) == [["B", "A"], [2, 1], [4, None]]
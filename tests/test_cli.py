@@ -0,0 +1,77 @@
+import io
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import openpyxl
+
+import xpyxl as x
+from xpyxl._cli import main
+
+
+def _spec(tmp_path):
+    book = x.workbook()[
+        x.sheet("Data")[x.table(header=["a", "b"]).from_records([(1, "x"), (2, "y")])],
+        x.sheet("Notes")[x.row()["hello"]],
+    ]
+    path = tmp_path / "book.xpyxl"
+    path.write_bytes(book.to_bytes())
+    return path
+
+
+def test_render_writes_the_workbook_and_reports_counts(tmp_path, capsys):
+    spec = _spec(tmp_path)
+    output = tmp_path / "out.xlsx"
+
+    assert main(["render", str(spec), str(output)]) == 0
+
+    result = json.loads(capsys.readouterr().out)
+    assert result["ok"] is True
+    assert (result["sheets"], result["rows"], result["cells"]) == (2, 4, 7)
+    assert result["total_ms"] >= result["render_ms"]
+    ws = openpyxl.load_workbook(output)["Data"]
+    assert [[cell.value for cell in row] for row in ws.iter_rows()] == [
+        ["a", "b"],
+        [1, "x"],
+        [2, "y"],
+    ]
+
+
+def test_worker_answers_one_line_per_job_and_survives_errors(
+    tmp_path, capsys, monkeypatch
+):
+    spec = _spec(tmp_path)
+    jobs = [
+        {"spec": str(spec), "output": str(tmp_path / "one.xlsx")},
+        {"spec": str(tmp_path / "missing.xpyxl"), "output": str(tmp_path / "x.xlsx")},
+        {"spec": str(spec), "output": str(tmp_path / "two.xlsx"), "strings": "inline"},
+    ]
+    lines = "\n".join(map(json.dumps, jobs)) + "\n\n"
+    monkeypatch.setattr(sys, "stdin", io.StringIO(lines))
+
+    assert main(["worker"]) == 0
+
+    results = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [result["ok"] for result in results] == [True, False, True]
+    assert results[1]["error"].startswith("FileNotFoundError")
+    assert (tmp_path / "one.xlsx").exists()
+    assert (tmp_path / "two.xlsx").exists()
+
+
+def test_module_entry_point(tmp_path):
+    spec = _spec(tmp_path)
+    output = tmp_path / "out.xlsx"
+    env = {**os.environ, "PYTHONPATH": str(Path(x.__file__).parents[1])}
+
+    completed = subprocess.run(
+        [sys.executable, "-m", "xpyxl", "render", str(spec), str(output)],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+
+    assert json.loads(completed.stdout)["output"] == str(output)
+    assert openpyxl.load_workbook(output).sheetnames == ["Data", "Notes"]
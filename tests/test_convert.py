@@ -0,0 +1,144 @@
+import io
+import math
+import zipfile
+from datetime import datetime, time, timedelta, timezone
+from decimal import Decimal
+
+import openpyxl
+import pytest
+
+import xpyxl as x
+import xpyxl._convert as convert
+
+NON_FINITE = [math.nan, math.inf, -math.inf, Decimal("NaN"), Decimal("-Infinity")]
+ERRORS = ["#NUM!", "#DIV/0!", "#DIV/0!", "#NUM!", "#DIV/0!"]
+
+
+def _book():
+    return x.workbook()[
+        x.sheet("Data")[
+            x.table(header=["a", "b", "c", "d", "e"]).from_records([NON_FINITE]),
+            x.table(
+                header=["n"], footer={"n": "mean"}, footer_formulas=True
+            ).from_records([(1.0,), (math.nan,)]),
+        ]
+    ]
+
+
+def test_non_finite_numbers_become_error_cells(tmp_path):
+    path = tmp_path / "book.xlsx"
+    _book().save(path)
+
+    with zipfile.ZipFile(path) as archive:
+        sheet = archive.read("xl/worksheets/sheet1.xml")
+    assert b"nan" not in sheet.lower()
+    assert b"inf" not in sheet.lower()
+    ws = openpyxl.load_workbook(path)["Data"]
+    assert [cell.value for cell in ws[2]] == ERRORS
+    assert [cell.data_type for cell in ws[2]] == ["e"] * 5
+    # The footer formula keeps its text; its cached result is the error.
+    assert ws["A6"].value == "=AVERAGE(A4:A5)"
+    assert b't="e"><f>AVERAGE(A4:A5)</f><v>#NUM!</v>' in sheet
+
+
+def test_to_openpyxl_writes_the_same_errors():
+    ws = _book().to_openpyxl()["Data"]
+    assert [cell.value for cell in ws[2]] == ERRORS
+    assert [cell.data_type for cell in ws[2]] == ["e"] * 5
+
+
+def test_append_rows_writes_the_same_errors(tmp_path):
+    path = tmp_path / "book.xlsx"
+    x.workbook()[
+        x.sheet("Data")[x.table(header=["a", "b"]).from_records([(1.0, 2.0)])]
+    ].save(path)
+
+    x.append_rows(path, "Data", [(math.nan, -math.inf)])
+
+    ws = openpyxl.load_workbook(path)["Data"]
+    assert [cell.value for cell in ws[3]] == ["#NUM!", "#DIV/0!"]
+
+
+TOKYO = timezone(timedelta(hours=9))
+
+
+class Money:
+    def __init__(self, cents):
+        self.cents = cents
+
+
+class Refund(Money):
+    pass
+
+
+class float64:
+    """Stands in for a NumPy scalar, which is recognised by its module."""
+
+    __module__ = "numpy"
+
+    def __init__(self, value):
+        self.value = value
+
+    def item(self):
+        return self.value
+
+
+@pytest.fixture(autouse=True)
+def _fresh_converters(monkeypatch):
+    monkeypatch.setattr(convert, "_REGISTERED", {})
+    monkeypatch.setattr(convert, "_DISPATCH", {})
+
+
+def _saved_row(tmp_path, *values, style=()):
+    path = tmp_path / "book.xlsx"
+    x.workbook()[x.sheet("Data")[x.row(style=style)[values]]].save(path)
+    return openpyxl.load_workbook(path)["Data"][1]
+
+
+def test_aware_datetimes_keep_their_wall_clock(tmp_path):
+    stamp = datetime(2024, 3, 5, 14, 7, tzinfo=TOKYO)
+    clock = time(9, 30, tzinfo=TOKYO)
+
+    saved = _saved_row(tmp_path, stamp, clock)
+    assert [cell.value for cell in saved] == [datetime(2024, 3, 5, 14, 7), time(9, 30)]
+    ws = x.workbook()[x.sheet("Data")[x.row()[stamp, clock]]].to_openpyxl()["Data"]
+    assert [cell.value for cell in ws[1]] == [
+        datetime(2024, 3, 5, 14, 7),
+        time(9, 30),
+    ]
+
+
+def test_numpy_scalars_are_unwrapped_without_numpy(tmp_path):
+    saved = _saved_row(tmp_path, float64(1.5), float64(math.nan))
+    assert [cell.value for cell in saved] == [1.5, "#NUM!"]
+
+
+def test_registered_converter_and_default_format(tmp_path):
+    x.register_converter(Money, lambda money: money.cents / 100, number_format="0.0")
+
+    saved = _saved_row(tmp_path, Money(1250), Refund(-50))
+    assert [cell.value for cell in saved] == [12.5, -0.5]
+    assert [cell.number_format for cell in saved] == ["0.0", "0.0"]
+    # A format from the cell's styles wins over the converter's default.
+    styled = _saved_row(tmp_path, Money(1250), style=[x.currency_usd])
+    assert styled[0].number_format == "$#,##0.00"
+    ws = x.workbook()[x.sheet("Data")[x.row()[Money(5)]]].to_openpyxl()["Data"]
+    assert (ws["A1"].value, ws["A1"].number_format) == (0.05, "0.0")
+    stream = io.StringIO()
+    x.workbook()[x.sheet("Data")[x.row()[Money(1250)]]].write_csv(stream)
+    assert stream.getvalue() == "12.5\n"
+
+
+def test_registering_replaces_resolved_entries(tmp_path):
+    x.register_converter(Money, lambda money: money.cents)
+    assert _saved_row(tmp_path, Refund(7))[0].value == 7
+
+    x.register_converter(Refund, lambda money: -money.cents)
+    assert _saved_row(tmp_path, Refund(7))[0].value == -7
+
+
+def test_registration_is_validated():
+    with pytest.raises(TypeError, match="registered for a type"):
+        x.register_converter(Money(1), str)
+    with pytest.raises(TypeError, match="must be callable"):
+        x.register_converter(Money, "cents")
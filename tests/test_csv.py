@@ -0,0 +1,86 @@
+import io
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+import pytest
+
+import xpyxl as x
+
+
+def _csv(*items, dialect="csv"):
+    stream = io.StringIO()
+    x.workbook()[x.sheet("Data")[items]].write_csv(stream, dialect=dialect)
+    return stream.getvalue()
+
+
+def test_layout_matches_the_saved_rows_and_columns():
+    text = _csv(
+        x.row()["Report"],
+        x.space(2),
+        x.hstack(
+            x.table(header=["a", "b"]).from_records([(1, "x"), (2, "y,z")]),
+            x.col()["side", True, None],
+            gap=1,
+        ),
+    )
+    assert text == 'Report\n\n\na,b,,side\n1,x,,TRUE\n2,"y,z",,\n'
+
+
+def test_number_and_date_formats_are_applied():
+    text = _csv(
+        x.row(style=[x.currency_usd])[1234.5, -0.004, Decimal("-2")],
+        x.row(style=[x.percent])[0.125],
+        x.row(style=[x.date_short])[date(2024, 3, 5)],
+        x.row(style=[x.datetime_short])[datetime(2024, 3, 5, 14, 7)],
+        x.row(style=[x.time_short])[time(9, 30)],
+        x.row(style=[x.number_comma])[1234567],
+    )
+    assert text.splitlines() == [
+        '"$1,234.50",$0.00,-$2.00',
+        "12.50%",
+        "2024-03-05",
+        "2024-03-05 14:07",
+        "09:30",
+        '"1,234,567"',
+    ]
+
+
+def test_general_cells_keep_raw_values():
+    text = _csv(x.row()[1.5, date(2024, 3, 5), timedelta(hours=25, seconds=3), False])
+    assert text == "1.5,2024-03-05,25:00:03,FALSE\n"
+
+
+def test_record_tables_get_column_formats_and_footer_values():
+    table = x.table(
+        header=["n", "amount"],
+        footer={"amount": "sum"},
+        footer_label="Total",
+        footer_formulas=True,
+    )
+    text = _csv(
+        table.from_records([(1, 2.5), (2, 1.25)]),
+        x.row()["after"],
+    )
+    assert text == "n,amount\n1,2.5\n2,1.25\nTotal,3.75\nafter\n"
+
+
+def test_tsv_dialect_and_save_csv_paths(tmp_path):
+    book = x.workbook()[
+        x.sheet("Data")[x.row()["a", "b c"]],
+        x.sheet("Data")[x.row()["d"]],
+    ]
+    paths = book.save_csv(tmp_path / "out", dialect="tsv")
+
+    assert [path.name for path in paths] == ["Data.tsv", "Data1.tsv"]
+    assert paths[0].read_text() == "a\tb c\n"
+    with pytest.raises(ValueError, match="Unknown CSV dialect"):
+        book.save_csv(tmp_path, dialect="xls")
+
+
+def test_record_fast_path_matches_wrapped_rows():
+    records = [(i, f"r{i}", i * 0.5, date(2024, 1, 1 + i)) for i in range(20)]
+    header = ["n", "name", "half", "day"]
+    bulk = x.table(header=header).from_records(records)
+    wrapped = x.table(header=header)[[list(record) for record in records]]
+
+    assert _csv(bulk) == _csv(wrapped)
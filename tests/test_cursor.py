@@ -0,0 +1,91 @@
+import sqlite3
+
+import openpyxl
+import pytest
+
+import xpyxl as x
+import xpyxl._layout as layout
+from xpyxl._cursor import CURSOR_BATCH_ROWS
+
+
+class RecordingCursor(sqlite3.Cursor):
+    """Counts fetchmany calls and forbids loading the whole result at once."""
+
+    def __init__(self, connection):
+        super().__init__(connection)
+        self.fetched = []
+
+    def fetchmany(self, size=None):
+        rows = super().fetchmany(size)
+        self.fetched.append((size, len(rows)))
+        return rows
+
+    def fetchall(self):
+        raise AssertionError("fetchall() must not be used")
+
+
+def _cursor(rows, *, arraysize=None):
+    connection = sqlite3.connect(":memory:")
+    connection.execute("create table sales (region text, units integer)")
+    connection.executemany(
+        "insert into sales values (?, ?)",
+        [(f"region {i % 7}", i) for i in range(rows)],
+    )
+    cursor = connection.cursor(RecordingCursor)
+    if arraysize is not None:
+        cursor.arraysize = arraysize
+    return cursor.execute("select region, units from sales order by units")
+
+
+def _book(cursor, **options):
+    return x.workbook()[x.sheet("Sales")[x.table().from_cursor(cursor, **options)]]
+
+
+def test_rows_are_fetched_in_batches(tmp_path):
+    cursor = _cursor(2500)
+    path = tmp_path / "sales.xlsx"
+
+    stats = _book(cursor, batch_size=1000).save(path)
+
+    assert cursor.fetched == [(1000, 1000), (1000, 1000), (1000, 500), (1000, 0)]
+    assert stats.sheets[0].rows == 2501
+    ws = openpyxl.load_workbook(path).active
+    assert [cell.value for cell in ws[1]] == ["region", "units"]
+    assert [cell.value for cell in ws[2501]] == ["region 0", 2499]
+
+
+@pytest.mark.parametrize(
+    ("arraysize", "expected"), [(None, CURSOR_BATCH_ROWS), (250, 250)]
+)
+def test_batch_size_defaults_to_arraysize(arraysize, expected):
+    cursor = _cursor(10, arraysize=arraysize)
+
+    _book(cursor).digest()
+
+    assert cursor.fetched[0] == (expected, 10)
+
+
+def test_cursor_renders_once(tmp_path):
+    book = _book(_cursor(10))
+    book.save(tmp_path / "first.xlsx")
+
+    with pytest.raises(ValueError, match="already rendered"):
+        book.save(tmp_path / "second.xlsx")
+    assert not (tmp_path / "second.xlsx").exists()
+
+
+def test_cursor_needs_a_result_set():
+    connection = sqlite3.connect(":memory:")
+
+    with pytest.raises(ValueError, match="no result set"):
+        x.table().from_cursor(connection.cursor())
+
+
+def test_streamed_rows_stop_at_the_row_limit(monkeypatch, tmp_path):
+    monkeypatch.setattr(layout, "MAX_ROWS", 100)
+
+    # One header row leaves room for 99 body rows.
+    _book(_cursor(99)).save(tmp_path / "fits.xlsx")
+    with pytest.raises(ValueError, match="run past Excel's last row"):
+        _book(_cursor(100)).save(tmp_path / "over.xlsx")
+    assert not (tmp_path / "over.xlsx").exists()
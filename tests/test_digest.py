@@ -0,0 +1,52 @@
+import hashlib
+import zipfile
+from datetime import date
+
+import xpyxl as x
+
+
+def _book():
+    return x.workbook()[
+        x.sheet("Data")[
+            x.row(style=[x.bold])["Report", date(2024, 1, 2)],
+            x.table(header=["a", "b"]).from_records([(1, "x"), (2, "y")]),
+        ],
+        x.sheet("Notes")[x.row()["hello"]],
+    ]
+
+
+def test_digest_is_the_sha256_of_a_deterministic_save(tmp_path):
+    path = tmp_path / "book.xlsx"
+    stats = _book().save(path, deterministic=True)
+
+    expected = hashlib.sha256(path.read_bytes()).hexdigest()
+    assert stats.digest == expected
+    assert _book().digest() == expected
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_deterministic_saves_are_byte_identical(tmp_path, monkeypatch):
+    first, second = tmp_path / "first.xlsx", tmp_path / "second.xlsx"
+    _book().save(first, deterministic=True)
+    # A later wall clock must not leak into the package.
+    monkeypatch.setattr("time.time", lambda: 2_000_000_000.0)
+    _book().save(second, deterministic=True)
+
+    assert first.read_bytes() == second.read_bytes()
+    with zipfile.ZipFile(first) as archive:
+        assert {info.date_time for info in archive.infolist()} == {
+            (1980, 1, 1, 0, 0, 0)
+        }
+
+
+def test_digest_follows_content_and_options():
+    book = _book()
+    changed = x.workbook()[x.sheet("Data")[x.row()["Report"]]]
+
+    assert book.digest() == book.digest(workers=2, pool="thread")
+    assert book.digest() != changed.digest()
+    assert book.digest(strings="shared") != book.digest(strings="inline")
+
+
+def test_regular_saves_report_no_digest(tmp_path):
+    assert _book().save(tmp_path / "book.xlsx").digest is None
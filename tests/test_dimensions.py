@@ -0,0 +1,50 @@
+import zipfile
+
+import xpyxl as x
+from xpyxl._layout import DEFAULT_ROW_HEIGHT, MIN_COLUMN_WIDTH, _column_ranges
+
+
+def _book():
+    return x.workbook()[
+        x.sheet("Data")[
+            x.row()["a", "b", "c", "a much longer value"],
+            x.space(height=30),
+            x.row()["d", "e", "f", "g"],
+        ]
+    ]
+
+
+def test_column_ranges_group_adjacent_equal_widths():
+    widths = {1: 3.0, 2: 5.0, 3: 12.0, 4: 12.0, 6: 12.0}
+    assert _column_ranges(widths) == [
+        (1, 2, MIN_COLUMN_WIDTH),
+        (3, 4, 12.0),
+        (6, 6, 12.0),
+    ]
+
+
+def test_to_openpyxl_groups_columns_and_sets_default_row_height():
+    ws = _book().to_openpyxl()["Data"]
+
+    assert ws.sheet_format.defaultRowHeight == DEFAULT_ROW_HEIGHT
+    spans = {(dim.min, dim.max) for dim in ws.column_dimensions.values() if dim.width}
+    assert spans == {(1, 3), (4, 4)}
+    # Only the spacer row departs from the default height.
+    heights = {
+        index: dim.height
+        for index, dim in ws.row_dimensions.items()
+        if dim.height is not None
+    }
+    assert heights == {2: 30}
+
+
+def test_save_writes_grouped_cols_and_default_row_height(tmp_path):
+    path = tmp_path / "book.xlsx"
+    _book().save(path)
+    with zipfile.ZipFile(path) as archive:
+        sheet = archive.read("xl/worksheets/sheet1.xml").decode()
+
+    assert f'defaultRowHeight="{DEFAULT_ROW_HEIGHT:g}" customHeight="1"' in sheet
+    assert sheet.count("<col ") == 2
+    assert '<col min="1" max="3" width="8" customWidth="1"/>' in sheet
+    assert sheet.count(" ht=") == 1
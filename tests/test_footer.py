@@ -0,0 +1,92 @@
+import sqlite3
+import zipfile
+from decimal import Decimal
+
+import openpyxl
+import pytest
+
+import xpyxl as x
+
+HEADER = ["Region", "Units", "Rate", "Note"]
+RECORDS = [
+    ("north", 3, 1.5, "a"),
+    ("south", None, -0.5, True),
+    ("east", 7, Decimal("0.25"), 4),
+]
+FOOTER = {"Units": "sum", "Rate": "mean", "Note": "count"}
+
+
+def _table(**options):
+    return x.table(header=HEADER, footer=FOOTER, footer_label="Total", **options)
+
+
+def _saved(tmp_path, node):
+    path = tmp_path / "book.xlsx"
+    x.workbook()[x.sheet("Data")[node]].save(path)
+    return path
+
+
+def test_aggregates_skip_text_booleans_and_blanks(tmp_path):
+    path = _saved(tmp_path, _table().from_records(RECORDS))
+    ws = openpyxl.load_workbook(path)["Data"]
+
+    assert [cell.value for cell in ws[5]] == ["Total", 10, 0.4166666666666667, 1]
+    assert ws["A5"].font.b
+
+
+def test_wrapped_rows_and_records_get_the_same_footer():
+    bulk = x.workbook()[x.sheet("Data")[_table().from_records(RECORDS)]]
+    wrapped = x.workbook()[x.sheet("Data")[_table()[[list(r) for r in RECORDS]]]]
+    assert bulk.digest() == wrapped.digest()
+
+
+def test_formulas_cache_the_computed_values(tmp_path):
+    path = _saved(tmp_path, _table(footer_formulas=True).from_records(RECORDS))
+    with zipfile.ZipFile(path) as archive:
+        sheet = archive.read("xl/worksheets/sheet1.xml")
+
+    assert b"<f>SUM(B2:B4)</f><v>10</v>" in sheet
+    assert b"<f>COUNT(D2:D4)</f><v>1</v>" in sheet
+    ws = openpyxl.load_workbook(path)["Data"]
+    assert [cell.value for cell in ws[5]] == [
+        "Total",
+        "=SUM(B2:B4)",
+        "=AVERAGE(C2:C4)",
+        "=COUNT(D2:D4)",
+    ]
+    values = openpyxl.load_workbook(path, data_only=True)["Data"]
+    assert values["B5"].value == 10
+
+
+def test_to_openpyxl_writes_values_or_formulas():
+    values = x.workbook()[x.sheet("Data")[_table().from_records(RECORDS)]]
+    formulas = x.workbook()[
+        x.sheet("Data")[_table(footer_formulas=True).from_records(RECORDS)]
+    ]
+
+    assert values.to_openpyxl()["Data"]["B5"].value == 10
+    assert formulas.to_openpyxl()["Data"]["B5"].value == "=SUM(B2:B4)"
+
+
+def test_streamed_bodies_get_footers(tmp_path):
+    connection = sqlite3.connect(":memory:")
+    connection.execute("create table t (units integer)")
+    connection.executemany("insert into t values (?)", [(i,) for i in range(1, 11)])
+    cursor = connection.execute("select units from t")
+    node = x.table(footer=["sum"]).from_cursor(cursor, batch_size=3)
+
+    ws = openpyxl.load_workbook(_saved(tmp_path, node))["Data"]
+    assert ws["A12"].value == 55
+
+
+def test_footer_arguments_are_validated():
+    with pytest.raises(ValueError, match="Unknown aggregate"):
+        x.table(header=HEADER, footer={"Units": "median"}).from_records(RECORDS)
+    with pytest.raises(ValueError, match="not in the table header"):
+        x.table(header=HEADER, footer={"Missing": "sum"}).from_records(RECORDS)
+    with pytest.raises(ValueError, match="label takes the first column"):
+        x.table(footer=["sum"], footer_label="Total").from_records(RECORDS)
+    with pytest.raises(TypeError, match="mapping of columns"):
+        x.table(footer="sum").from_records(RECORDS)
+    with pytest.raises(ValueError, match="cannot spill"):
+        x.table(footer=["sum"], overflow="spill")
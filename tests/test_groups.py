@@ -0,0 +1,92 @@
+import io
+import zipfile
+
+import openpyxl
+import pytest
+
+import xpyxl as x
+
+HEADER = ["region", "team", "units"]
+RECORDS = [("n", "a", 1), ("s", "b", 2), ("n", "a", 3), ("n", "b", 4)]
+EXPECTED = [
+    (HEADER, 0),
+    (["n", "a", 1], 3),
+    (["n", "a", 3], 3),
+    ([None, "a Total", 4], 2),
+    (["n", "b", 4], 3),
+    ([None, "b Total", 4], 2),
+    (["n Total", None, 8], 1),
+    (["s", "b", 2], 3),
+    ([None, "b Total", 2], 2),
+    (["s Total", None, 2], 1),
+    (["Grand Total", None, 10], 0),
+]
+
+
+def _book(**options):
+    table = x.table(header=HEADER).grouped(
+        RECORDS, by=["region", "team"], aggregates={"units": "sum"}, **options
+    )
+    return x.workbook()[x.sheet("Data")[table]]
+
+
+def _rows(ws):
+    return [
+        ([cell.value for cell in row], ws.row_dimensions[row[0].row].outline_level)
+        for row in ws.iter_rows()
+    ]
+
+
+def test_groups_keep_first_seen_order_with_outline_levels(tmp_path):
+    path = tmp_path / "book.xlsx"
+    _book().save(path)
+
+    ws = openpyxl.load_workbook(path)["Data"]
+    assert _rows(ws) == EXPECTED
+    assert ws["B4"].font.b
+    assert not ws["B2"].font.b
+    with zipfile.ZipFile(path) as archive:
+        sheet = archive.read("xl/worksheets/sheet1.xml")
+    assert b'outlineLevelRow="3"' in sheet
+
+
+def test_to_openpyxl_matches_save():
+    assert _rows(_book().to_openpyxl()["Data"]) == EXPECTED
+
+
+def test_mapping_records_label_and_no_grand_total():
+    columns = {name: [record[i] for record in RECORDS] for i, name in enumerate(HEADER)}
+    table = x.table().grouped(
+        columns,
+        by=["region"],
+        aggregates={"units": "max"},
+        label="{}:",
+        grand_total=None,
+    )
+    ws = x.workbook()[x.sheet("Data")[table]].to_openpyxl()["Data"]
+
+    assert [values for values, _ in _rows(ws)][-1] == ["s:", None, 2]
+    assert [level for _, level in _rows(ws)] == [0, 2, 2, 2, 1, 2, 1]
+
+
+def test_csv_export_writes_subtotal_values():
+    stream = io.StringIO()
+    _book().write_csv(stream)
+    assert stream.getvalue().splitlines()[3:7] == [
+        ",a Total,4",
+        "n,b,4",
+        ",b Total,4",
+        "n Total,,8",
+    ]
+
+
+def test_grouping_arguments_are_validated():
+    table = x.table(header=HEADER)
+    with pytest.raises(ValueError, match="at least one"):
+        table.grouped(RECORDS, by=[], aggregates={"units": "sum"})
+    with pytest.raises(ValueError, match="at most 6"):
+        table.grouped(RECORDS, by=[0] * 7, aggregates={"units": "sum"})
+    with pytest.raises(ValueError, match="cannot be aggregated"):
+        table.grouped(RECORDS, by=["units"], aggregates={"units": "sum"})
+    with pytest.raises(ValueError, match="not a footer"):
+        x.table(footer=["sum"]).grouped(RECORDS, by=[0], aggregates=[None, "sum"])
@@ -0,0 +1,50 @@
+import os
+import subprocess
+import sys
+
+RUNS = 7
+
+# Modules that `import xpyxl` must leave for first use.
+_DEFERRED = ("openpyxl", "decimal", "pickle", "zipfile", "multiprocessing")
+_PROBE = "import sys, {module}; print(sorted(set({deferred!r}) & set(sys.modules)))"
+
+
+def _import(module):
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            _PROBE.format(module=module, deferred=_DEFERRED),
+        ],
+        capture_output=True,
+        check=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+    )
+    cumulative_us = 0
+    for line in result.stderr.splitlines():
+        fields = line.split("|")
+        if len(fields) == 3 and fields[2].strip() == module:
+            cumulative_us = int(fields[1])
+    return cumulative_us / 1000, result.stdout.strip()
+
+
+def test_import_defers_heavy_modules():
+    _, loaded = _import("xpyxl")
+    assert loaded == "[]"
+
+
+def test_import_costs_less_than_openpyxl():
+    # benchmarks/import_time.py holds the absolute 150 ms budget. Wall times
+    # swing with the machine, so the test budget is relative: importing
+    # xpyxl must stay cheaper than the openpyxl import it defers. Runs
+    # alternate so that load changes hit both sides, and the best of each
+    # is compared.
+    xpyxl_ms = []
+    openpyxl_ms = []
+    for _ in range(RUNS):
+        xpyxl_ms.append(_import("xpyxl")[0])
+        openpyxl_ms.append(_import("openpyxl")[0])
+    assert 0 < min(xpyxl_ms) < min(openpyxl_ms)
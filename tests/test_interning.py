@@ -0,0 +1,57 @@
+import pytest
+
+import xpyxl as x
+
+
+def test_equal_values_share_one_cell():
+    with x.interning():
+        first = x.row()["north", 3, None]
+        second = x.row()["north", 3, None]
+
+    assert all(a is b for a, b in zip(first.cells, second.cells))
+
+
+def test_numeric_kinds_stay_distinct():
+    with x.interning():
+        cells = x.row()[1, 1.0, True, 0.0, -0.0, 1].cells
+
+    assert [type(cell.value) for cell in cells[:3]] == [int, float, bool]
+    assert len({id(cell) for cell in cells[:5]}) == 5
+    assert cells[5] is cells[0]
+    assert str(cells[4].value) == "-0.0"
+
+
+def test_equal_style_lists_share_one_tuple():
+    with x.interning():
+        first = x.row(style=[x.bold, x.text_blue])["a"]
+        second = x.row(style=[x.bold, x.text_blue])["b"]
+
+    assert first.styles == (x.bold, x.text_blue)
+    assert first.styles is second.styles
+
+
+def test_tables_stop_growing_at_max_size():
+    with x.interning(max_size=2):
+        first = x.row()["a", "b", "c"].cells
+        second = x.row()["a", "b", "c"].cells
+
+    assert first[0] is second[0]
+    assert first[1] is second[1]
+    # The table was full, so "c" is built fresh each time.
+    assert first[2] is not second[2]
+    assert first[2] == second[2]
+
+
+def test_nothing_is_shared_outside_the_block():
+    with x.interning():
+        inside = x.row()["a"].cells[0]
+    outside = x.row()["a"].cells
+
+    assert outside[0] is not inside
+    assert x.row()["a"].cells[0] is not outside[0]
+
+
+def test_max_size_must_be_positive():
+    with pytest.raises(ValueError, match=">= 1"):
+        with x.interning(max_size=0):
+            pass
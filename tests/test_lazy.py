@@ -0,0 +1,67 @@
+import openpyxl
+import pytest
+
+import xpyxl as x
+import xpyxl._layout as layout
+
+
+def _region(name):
+    return x.sheet(name)[
+        x.row(style=[x.bold])[name],
+        x.table(header=["n", "v"]).from_records([(i, i * 1.5) for i in range(5)]),
+    ]
+
+
+def _lazy_book(calls):
+    def factory(name):
+        def build():
+            calls.append(name)
+            return _region(name)
+
+        return build
+
+    return x.workbook()[[x.sheet(name).lazy(factory(name)) for name in "ABC"]]
+
+
+def test_factories_run_once_per_render_in_sheet_order(tmp_path):
+    calls = []
+    book = _lazy_book(calls)
+    assert calls == []
+
+    book.save(tmp_path / "book.xlsx")
+    assert calls == ["A", "B", "C"]
+    book.to_openpyxl()
+    assert calls == ["A", "B", "C"] * 2
+
+
+def test_lazy_sheets_match_eager_ones():
+    eager = x.workbook()[[_region(name) for name in "ABC"]]
+    assert _lazy_book([]).digest() == eager.digest()
+
+
+def test_sheet_keeps_the_lazy_name(tmp_path):
+    path = tmp_path / "book.xlsx"
+    x.workbook()[x.sheet("Kept").lazy(lambda: _region("Other"))].save(path)
+
+    ws = openpyxl.load_workbook(path)["Kept"]
+    assert ws["A1"].value == "Other"
+
+
+def test_factories_must_build_sheets(tmp_path):
+    with pytest.raises(TypeError, match="callables"):
+        x.sheet("A").lazy(_region("A"))
+    book = x.workbook()[x.sheet("A").lazy(lambda: x.row()["a"])]
+    with pytest.raises(TypeError, match="must return a SheetNode"):
+        book.save(tmp_path / "book.xlsx")
+
+
+def test_lazy_sheets_cannot_spill(monkeypatch, tmp_path):
+    monkeypatch.setattr(layout, "MAX_ROWS", 10)
+    records = [(i,) for i in range(25)]
+    book = x.workbook()[
+        x.sheet("A").lazy(
+            lambda: x.sheet("A")[x.table(overflow="spill").from_records(records)]
+        )
+    ]
+    with pytest.raises(ValueError, match="build that sheet eagerly"):
+        book.save(tmp_path / "book.xlsx")
@@ -0,0 +1,80 @@
+import sqlite3
+import zipfile
+
+import pytest
+
+import xpyxl as x
+import xpyxl._layout as layout
+
+
+def _book(rows=2000):
+    records = [(i, f"region {i % 12}", i * 1.25, f"id-{i}") for i in range(rows)]
+    return x.workbook()[
+        x.sheet("Data")[
+            x.row(style=[x.bold])["Report"],
+            x.table(header=["n", "region", "amount", "key"]).from_records(records),
+        ],
+        x.sheet("Notes")[x.row()["a", "b"], x.row(style=[x.text_blue])["a"]],
+    ]
+
+
+def test_counts_match_a_real_save(tmp_path):
+    book = _book()
+    path = tmp_path / "book.xlsx"
+
+    plan = book.dry_run(strings="shared")
+    stats = book.save(path, strings="shared")
+
+    assert [sheet.name for sheet in plan.sheets] == ["Data", "Notes"]
+    assert [(s.rows, s.cells) for s in plan.sheets] == [
+        (s.rows, s.cells) for s in stats.sheets
+    ]
+    assert plan.cells == sum(sheet.cells for sheet in stats.sheets)
+    assert sum(sheet.shared_strings for sheet in plan.sheets) == stats.shared_strings
+    assert plan.violations == ()
+
+
+def test_size_estimate_is_close_to_the_saved_parts(tmp_path):
+    book = _book()
+    path = tmp_path / "book.xlsx"
+    book.save(path, strings="inline")
+    with zipfile.ZipFile(path) as archive:
+        actual = archive.getinfo("xl/worksheets/sheet1.xml").compress_size
+
+    estimate = book.dry_run(strings="inline").sheets[0].compressed_bytes
+    assert actual / 2 < estimate < actual * 2
+
+
+def test_memory_estimates_cover_each_render_mode():
+    plan = _book().dry_run(workers=4)
+    data = plan.sheets[0].peak_memory
+
+    assert set(plan.peak_memory) == {"save", "save_parallel", "to_openpyxl"}
+    assert data["save_parallel"] > data["save"]
+    assert plan.peak_memory["to_openpyxl"] == sum(
+        sheet.peak_memory["to_openpyxl"] for sheet in plan.sheets
+    )
+
+
+def test_violations_are_listed_not_raised(monkeypatch, tmp_path):
+    monkeypatch.setattr(layout, "MAX_ROWS", 10)
+    book = _book(rows=20)
+
+    plan = book.dry_run()
+    assert len(plan.violations) == 1
+    assert "Data" in plan.violations[0]
+    with pytest.raises(ValueError):
+        book.save(tmp_path / "book.xlsx")
+
+
+def test_streamed_tables_are_not_consumed():
+    connection = sqlite3.connect(":memory:")
+    connection.execute("create table t (n integer)")
+    connection.executemany("insert into t values (?)", [(i,) for i in range(5)])
+    cursor = connection.execute("select n from t")
+    book = x.workbook()[x.sheet("Data")[x.table().from_cursor(cursor)]]
+
+    plan = book.dry_run()
+
+    assert plan.sheets[0].streamed_tables == 1
+    assert len(cursor.fetchall()) == 5
@@ -0,0 +1,97 @@
+import os
+import time
+
+import pytest
+
+import xpyxl as x
+from xpyxl._xlsx import _atomic_output
+
+ROWS = 3000
+
+
+def _book():
+    records = [(i, f"region {i % 12}", i * 1.25) for i in range(ROWS)]
+    return x.workbook()[
+        x.sheet("Data")[
+            x.table(header=["n", "region", "amount"]).from_records(records)
+        ],
+        x.sheet("Notes")[x.row()["a"], x.row()["b"]],
+    ]
+
+
+def _render(book, target, **options):
+    if target is None:
+        return book.to_openpyxl(**options)
+    return book.save(target, **options)
+
+
+@pytest.fixture(params=["save", "to_openpyxl"])
+def target(request, tmp_path):
+    return tmp_path / "book.xlsx" if request.param == "save" else None
+
+
+def test_progress_reports_every_sheet_and_all_rows(target):
+    seen = []
+    _render(_book(), target, progress=seen.append)
+
+    assert [p.sheet_index for p in seen] == sorted(p.sheet_index for p in seen)
+    assert {(p.sheet_index, p.sheet) for p in seen} == {(0, "Data"), (1, "Notes")}
+    assert all(p.sheet_count == 2 for p in seen)
+    totals = [p.total_rows for p in seen]
+    assert totals == sorted(totals)
+    assert totals[-1] == ROWS + 3
+    assert max(p.rows for p in seen if p.sheet == "Data") == ROWS + 1
+    if target is not None:
+        assert seen[-1].bytes_out > 0
+
+
+def test_cancel_from_a_callback_stops_the_render(target):
+    token = x.CancelToken()
+    seen = []
+
+    def progress(snapshot):
+        seen.append(snapshot)
+        token.cancel()
+
+    with pytest.raises(x.RenderCancelled):
+        _render(_book(), target, progress=progress, cancel=token)
+    assert len(seen) == 1
+    assert seen[0].total_rows < ROWS
+
+
+def test_missed_deadline_raises_timeout(target):
+    with pytest.raises(TimeoutError):
+        _render(_book(), target, deadline=time.monotonic() - 1)
+
+
+def test_aborted_save_leaves_the_target_untouched(tmp_path):
+    path = tmp_path / "book.xlsx"
+    path.write_bytes(b"previous")
+    token = x.CancelToken()
+    token.cancel()
+
+    with pytest.raises(x.RenderCancelled):
+        _book().save(path, cancel=token)
+
+    assert path.read_bytes() == b"previous"
+    assert os.listdir(tmp_path) == ["book.xlsx"]
+
+
+def test_atomic_output_replaces_only_on_success(tmp_path):
+    path = tmp_path / "out.xlsx"
+    path.write_bytes(b"old")
+
+    with pytest.raises(RuntimeError):
+        with _atomic_output(path) as temp:
+            with open(temp, "wb") as handle:
+                handle.write(b"partial")
+            raise RuntimeError
+    assert path.read_bytes() == b"old"
+    assert os.listdir(tmp_path) == ["out.xlsx"]
+
+    with _atomic_output(path) as temp:
+        assert os.path.dirname(temp) == str(tmp_path)
+        with open(temp, "wb") as handle:
+            handle.write(b"new")
+    assert path.read_bytes() == b"new"
+    assert os.listdir(tmp_path) == ["out.xlsx"]
@@ -0,0 +1,74 @@
+from dataclasses import dataclass
+from typing import Annotated, NamedTuple
+
+import pytest
+
+import xpyxl as x
+from xpyxl._records import record_adapter
+
+
+@dataclass
+class Deal:
+    region: str
+    units: int
+    amount: Annotated[float, x.bold, x.column_hint(width=14, header="Amount")]
+
+
+class Point(NamedTuple):
+    x: int
+    y: int
+
+
+class Slotted:
+    __slots__ = ("name", "score")
+
+    def __init__(self, name, score):
+        self.name = name
+        self.score = score
+
+
+def _sheet(node):
+    return x.workbook()[x.sheet("Data")[node]].to_openpyxl()["Data"]
+
+
+def _values(ws):
+    return [[cell.value for cell in row] for row in ws.iter_rows()]
+
+
+def test_dataclass_fields_become_header_and_columns():
+    ws = _sheet(x.table().from_objects([Deal("north", 3, 1.5), Deal("south", 4, 2.0)]))
+
+    assert _values(ws) == [
+        ["region", "units", "Amount"],
+        ["north", 3, 1.5],
+        ["south", 4, 2.0],
+    ]
+    assert ws["C2"].font.b
+    assert not ws["B2"].font.b
+    assert ws.column_dimensions["C"].width == 14
+
+
+def test_named_tuples_and_slots_classes():
+    points = _sheet(x.table().from_objects([Point(1, 2), Point(3, 4)]))
+    slotted = _sheet(x.table().from_objects(iter([Slotted("a", 1)])))
+
+    assert _values(points) == [["x", "y"], [1, 2], [3, 4]]
+    assert _values(slotted) == [["name", "score"], ["a", 1]]
+
+
+def test_explicit_header_and_record_type():
+    ws = _sheet(x.table(header=["R", "U", "A"]).from_objects([], record_type=Deal))
+    assert _values(ws) == [["R", "U", "A"]]
+
+
+def test_adapter_is_compiled_once_per_type():
+    assert record_adapter(Deal) is record_adapter(Deal)
+    assert record_adapter(Point).extract is None
+
+
+def test_plain_classes_are_rejected():
+    class Plain:
+        pass
+
+    with pytest.raises(TypeError, match="from_records"):
+        x.table().from_objects([Plain()])
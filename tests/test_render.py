@@ -0,0 +1,88 @@
+from datetime import date, datetime
+from decimal import Decimal
+
+import openpyxl
+
+import xpyxl as x
+from xpyxl.render import render_sheet
+
+
+class _PublicOnly:
+    """A worksheet without the openpyxl internals `render_sheet` prefers."""
+
+    def __init__(self, ws):
+        self._ws = ws
+
+    def __getattr__(self, name):
+        if name in ("_cells", "_current_row"):
+            raise AttributeError(name)
+        return getattr(self._ws, name)
+
+
+def _sheet():
+    records = [
+        ("north", 3, 1.5, date(2024, 1, 2), Decimal("2.25"), True),
+        ("south", None, -0.5, datetime(2024, 3, 4, 5, 6), Decimal("1"), False),
+        ("east", 7, 1e-9, date(2025, 12, 31), Decimal("-3.5"), None),
+    ]
+    return x.sheet("Data")[
+        x.row(style=[x.text_2xl, x.bold, x.text_blue])["Report"],
+        x.space(height=30),
+        x.hstack(
+            x.table(
+                header=["Region", "Units", "Rate", "Day", "Amount", "Flag"],
+                footer={"Units": "sum", "Rate": "mean"},
+                footer_label="Total",
+            ).from_records(records),
+            x.col(style=[x.bg_primary])["side", "=1+1", 2],
+            gap=1,
+        ),
+    ]
+
+
+def _cells(ws):
+    return {
+        cell.coordinate: (
+            cell.value,
+            cell.data_type,
+            cell.number_format,
+            cell.font.b,
+            cell.font.sz,
+            cell.font.color.rgb if cell.font.color is not None else None,
+            cell.fill.fgColor.rgb,
+            cell.border.bottom.style,
+            cell.alignment.horizontal,
+        )
+        for row in ws.iter_rows()
+        for cell in row
+    }
+
+
+def _dimensions(ws):
+    return (
+        ws.max_row,
+        ws.max_column,
+        {key: dim.width for key, dim in ws.column_dimensions.items()},
+        {key: dim.height for key, dim in ws.row_dimensions.items()},
+    )
+
+
+def test_row_inserts_match_per_cell_writes():
+    batched = openpyxl.Workbook().active
+    per_cell = openpyxl.Workbook().active
+    render_sheet(batched, _sheet())
+    render_sheet(_PublicOnly(per_cell), _sheet())
+
+    assert _cells(batched) == _cells(per_cell)
+    assert _dimensions(batched) == _dimensions(per_cell)
+    assert batched["B4"].value == 3
+    assert batched["D4"].is_date
+
+
+def test_to_openpyxl_matches_render_sheet():
+    rendered = openpyxl.Workbook().active
+    render_sheet(rendered, _sheet())
+    ws = x.workbook()[_sheet()].to_openpyxl()["Data"]
+
+    assert _cells(ws) == _cells(rendered)
+    assert _dimensions(ws) == _dimensions(rendered)
@@ -0,0 +1,65 @@
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+
+import xpyxl as x
+from xpyxl._workbook import Workbook
+
+
+def _sheet():
+    return x.sheet("Data")[
+        x.row(style=[x.bold, x.text_blue])["Report", None, True],
+        x.space(height=20),
+        x.hstack(
+            x.table(header=["a", "b", "c"], footer={"b": "sum"}).from_records(
+                [(date(2024, 1, 2), 3, Decimal("2.25")), ("x", 4, 1.5)]
+            ),
+            x.col(style=[x.bg_primary])["side", datetime(2024, 3, 4, 5, 6), -7],
+            gap=1,
+        ),
+        x.table().grouped(
+            [("n", 1), ("n", 2), ("s", 3)], by=[0], aggregates={1: "sum"}
+        ),
+    ]
+
+
+def test_workbook_round_trip_rebuilds_an_equal_tree():
+    book = x.workbook()[_sheet(), x.sheet("Other")[x.row()["x"]]]
+    restored = Workbook.from_bytes(book.to_bytes())
+
+    assert restored._node == book._node
+    assert restored.digest() == book.digest()
+
+
+def test_sheet_round_trip():
+    sheet = _sheet()
+    assert x.loads(x.dumps(sheet)) == sheet
+
+
+def test_repeated_styles_are_shared_after_loading():
+    sheet = x.sheet("Data")[x.row(style=[x.bold])["a"], x.row(style=[x.bold])["b"]]
+    first, second = x.loads(x.dumps(sheet)).items
+
+    assert first.styles is second.styles
+
+
+def test_factories_are_stored_as_the_sheets_they_build():
+    calls = []
+
+    def build():
+        calls.append(1)
+        return _sheet()
+
+    book = x.workbook()[x.sheet("Data").lazy(build)]
+    restored = Workbook.from_bytes(book.to_bytes())
+
+    assert calls == [1]
+    assert restored._node.sheets == (_sheet(),)
+
+
+def test_bad_data_is_rejected():
+    with pytest.raises(ValueError, match="bad header"):
+        x.loads(b"not a tree")
+    with pytest.raises(ValueError, match="holds a sheet"):
+        Workbook.from_bytes(x.dumps(_sheet()))
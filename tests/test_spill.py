@@ -0,0 +1,69 @@
+import openpyxl
+import pytest
+
+import xpyxl as x
+import xpyxl._layout as layout
+
+HEADER = ["n", "label"]
+
+
+@pytest.fixture
+def ten_rows(monkeypatch):
+    monkeypatch.setattr(layout, "MAX_ROWS", 10)
+
+
+def _book():
+    records = [(i, f"item {i}") for i in range(25)]
+    return x.workbook()[
+        x.sheet("Data")[
+            x.row()["Report"],
+            x.table(header=HEADER, overflow="spill").from_records(records),
+            x.row()["End"],
+        ]
+    ]
+
+
+def _values(ws):
+    return [[cell.value for cell in row] for row in ws.iter_rows()]
+
+
+def _fill(ws, row):
+    return ws.cell(row=row, column=1).fill.fgColor.rgb
+
+
+def test_spill_repeats_header_and_moves_trailing_items(ten_rows, tmp_path):
+    path = tmp_path / "book.xlsx"
+    _book().save(path)
+    workbook = openpyxl.load_workbook(path)
+
+    assert workbook.sheetnames == ["Data", "Data (2)", "Data (3)", "Data (4)"]
+    first, *continuations = workbook.worksheets
+    # An even number of body rows fits under the title and header.
+    assert _values(first)[:3] == [["Report", None], HEADER, [0, "item 0"]]
+    assert first.max_row == 10
+    for ws in continuations:
+        assert _values(ws)[0] == HEADER
+        assert ws.cell(row=1, column=1).font.b
+    assert [row[0] for row in _values(continuations[0])[1:]] == list(range(8, 16))
+    last = _values(continuations[-1])
+    assert last == [HEADER, [24, "item 24"], ["End", None]]
+    assert all(["End", None] not in _values(ws) for ws in workbook.worksheets[:-1])
+
+
+def test_spill_restarts_banding_on_each_continuation(ten_rows, tmp_path):
+    path = tmp_path / "book.xlsx"
+    _book().save(path)
+    workbook = openpyxl.load_workbook(path)
+
+    first = workbook.worksheets[0]
+    plain, striped = _fill(first, 3), _fill(first, 4)
+    assert plain != striped
+    for ws in workbook.worksheets[1:3]:
+        assert [_fill(ws, row) for row in range(2, 10)] == [plain, striped] * 4
+
+
+def test_spill_thread_pool_matches_serial(ten_rows):
+    # Continuations are separate sheets, so the thread pool renders them
+    # concurrently like any other sheet.
+    book = _book()
+    assert book.digest(workers=3, pool="thread") == book.digest()
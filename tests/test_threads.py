@@ -0,0 +1,112 @@
+import asyncio
+import sqlite3
+
+import pytest
+
+import xpyxl as x
+
+
+def _connection(rows: int = 2000) -> sqlite3.Connection:
+    connection = sqlite3.connect(":memory:")
+    connection.execute("create table sales (region text, amount real)")
+    connection.executemany(
+        "insert into sales values (?, ?)",
+        [(f"region {i % 7}", i * 1.5) for i in range(rows)],
+    )
+    return connection
+
+
+def _static_sheets(count: int) -> list[x.SheetNode]:
+    return [
+        x.sheet(f"Static {i}")[
+            x.table(header=["key", "value"]).from_records(
+                [(f"k{j}", j * i) for j in range(200)]
+            )
+        ]
+        for i in range(count)
+    ]
+
+
+def _cursor_book(connection: sqlite3.Connection) -> x.Workbook:
+    cursor = connection.execute("select region, amount from sales")
+    return x.workbook()[
+        [
+            *_static_sheets(3),
+            x.sheet("Sales")[x.table().from_cursor(cursor, batch_size=300)],
+            *_static_sheets(2),
+        ]
+    ]
+
+
+def test_thread_pool_save_matches_serial():
+    book = x.workbook()[_static_sheets(6)]
+    assert book.digest(workers=3, pool="thread") == book.digest()
+
+
+def test_thread_pool_save_renders_cursor_sheets_on_calling_thread():
+    connection = _connection()
+    serial = _cursor_book(connection).digest()
+    threaded = _cursor_book(connection).digest(workers=2, pool="thread")
+    assert threaded == serial
+
+
+def test_thread_pool_to_openpyxl_renders_cursor_sheets():
+    workbook = _cursor_book(_connection()).to_openpyxl(workers=2)
+    sales = workbook["Sales"]
+    assert sales.max_row == 2001
+    assert sales["A2001"].value == "region 4"
+
+
+def test_thread_pool_to_openpyxl_builds_factories_in_a_window():
+    workers = 2
+    built = []
+    collected = []
+    in_flight = []
+
+    def factory(i):
+        def build():
+            built.append(i)
+            in_flight.append(len(built) - len(collected))
+            return _static_sheets(i + 1)[i]
+
+        return build
+
+    sheets = [x.sheet(f"Static {i}").lazy(factory(i)) for i in range(8)]
+    x.workbook()[sheets].to_openpyxl(
+        workers=workers, progress=lambda update: collected.append(update.sheet_index)
+    )
+
+    assert built == list(range(8))
+    assert collected == list(range(8))
+    assert max(in_flight) == workers
+
+
+def test_thread_pool_save_async_feeds_async_tables(tmp_path):
+    async def deals():
+        for i in range(2500):
+            if not i % 500:
+                await asyncio.sleep(0)
+            yield (f"deal {i}", i)
+
+    async def main():
+        book = x.workbook()[
+            [
+                *_static_sheets(2),
+                x.sheet("Deals")[
+                    x.table(header=["name", "amount"]).from_async(
+                        deals(), batch_size=200
+                    )
+                ],
+                *_static_sheets(2),
+            ]
+        ]
+        return await book.save_async(tmp_path / "deals.xlsx", workers=2, pool="thread")
+
+    stats = asyncio.run(main())
+    deals_stats = next(sheet for sheet in stats.sheets if sheet.name == "Deals")
+    assert deals_stats.rows == 2501
+
+
+def test_unknown_pool_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match="Unknown pool"):
+        x.workbook()[_static_sheets(1)].save(tmp_path / "out.xlsx", pool="fiber")
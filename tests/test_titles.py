@@ -0,0 +1,86 @@
+from datetime import date
+
+import openpyxl
+import pytest
+
+import xpyxl as x
+import xpyxl._layout as layout
+
+# Exactly Excel's 31-character limit.
+LONG = "Revenue by region and quarter 2"
+
+
+def test_spill_titles_stay_within_31_characters(monkeypatch, tmp_path):
+    monkeypatch.setattr(layout, "MAX_ROWS", 10)
+    table = x.table(header=["n"], overflow="spill").from_records(
+        [(i,) for i in range(30)]
+    )
+    path = tmp_path / "book.xlsx"
+
+    x.workbook()[x.sheet(LONG)[table]].save(path)
+
+    titles = openpyxl.load_workbook(path).sheetnames
+    assert titles[0] == LONG
+    assert titles[1:] == [LONG[:27] + f" ({n})" for n in range(2, len(titles) + 1)]
+    assert all(len(title) <= 31 for title in titles)
+
+
+def test_duplicate_titles_keep_their_counter(tmp_path):
+    book = x.workbook()[
+        x.sheet(LONG)[x.table(header=["n"]).from_records([(1,)])],
+        x.sheet(LONG)[x.table(header=["n"]).from_records([(2,)])],
+    ]
+    path = tmp_path / "book.xlsx"
+    book.save(path)
+
+    assert openpyxl.load_workbook(path).sheetnames == [LONG, LONG[:30] + "1"]
+    assert book.to_openpyxl().sheetnames == [LONG, LONG[:30] + "1"]
+
+
+def test_titles_longer_than_31_characters_are_rejected(tmp_path):
+    table = x.table(header=["n"]).from_records([(1,)])
+    book = x.workbook()[x.sheet(LONG + "!")[table]]
+
+    with pytest.raises(ValueError, match="longer than Excel's 31 characters"):
+        book.save(tmp_path / "book.xlsx")
+    with pytest.raises(ValueError, match="longer than Excel's 31 characters"):
+        book.to_openpyxl()
+    assert not (tmp_path / "book.xlsx").exists()
+
+
+def _entity_book(names):
+    return x.workbook()[
+        [
+            x.sheet(name)[
+                x.row(style=[x.bold, x.bg_primary])["Entity", index],
+                x.row(style=[x.date_short])[date(2024, 1, 1 + index % 28), index],
+            ]
+            for index, name in enumerate(names)
+        ]
+    ]
+
+
+def test_many_sheets_get_the_same_titles_from_both_backends(tmp_path):
+    names = ["Data", "data", "", "DATA", "Notes"] * 60
+    book = _entity_book(names)
+    path = tmp_path / "book.xlsx"
+    book.save(path)
+
+    saved = openpyxl.load_workbook(path).sheetnames
+    assert book.to_openpyxl().sheetnames == saved
+    assert len({title.lower() for title in saved}) == len(names)
+    assert saved[:6] == ["Data", "data1", "Sheet", "DATA2", "Notes", "Data3"]
+
+
+def test_styles_are_shared_across_many_sheets():
+    workbook = _entity_book([f"S{i}" for i in range(200)]).to_openpyxl()
+    first, last = workbook.worksheets[0], workbook.worksheets[-1]
+
+    assert last["A1"].font.b
+    assert last["A1"]._style == first["A1"]._style
+    # A cached style keeps the date format the value set on assignment.
+    assert last["A2"].number_format == "yyyy-mm-dd"
+    assert last["B2"].number_format == "yyyy-mm-dd"
+    assert last["B1"].number_format == "General"
+    # Style tables stay as small as for a single sheet.
+    assert len(workbook._fonts) <= 3
@@ -0,0 +1,37 @@
+import zipfile
+
+import pytest
+from openpyxl.utils.exceptions import IllegalCharacterError
+
+import xpyxl as x
+
+
+@pytest.mark.parametrize("strings", ["shared", "inline"])
+@pytest.mark.parametrize("text", ["bad\x01value", "\x1f", "tab\x0bbed", "end\ufffe"])
+def test_save_rejects_illegal_xml_characters(tmp_path, strings, text):
+    book = x.workbook()[
+        x.sheet("Data")[x.table(header=["Text"]).from_records([(text,)])]
+    ]
+
+    with pytest.raises(IllegalCharacterError):
+        book.save(tmp_path / "book.xlsx", strings=strings)
+    assert not (tmp_path / "book.xlsx").exists()
+
+
+def test_openpyxl_rejects_the_same_characters():
+    book = x.workbook()[
+        x.sheet("Data")[x.table(header=["Text"]).from_records([("\x01",)])]
+    ]
+
+    with pytest.raises(IllegalCharacterError):
+        book.to_openpyxl()
+
+
+def test_save_keeps_tabs_and_newlines(tmp_path):
+    path = tmp_path / "book.xlsx"
+    x.workbook()[
+        x.sheet("Data")[x.table(header=["Text"]).from_records([("a\tb\r\nc",)])]
+    ].save(path, strings="inline")
+
+    with zipfile.ZipFile(path) as archive:
+        assert "a\tb\r\nc" in archive.read("xl/worksheets/sheet1.xml").decode()